@@ -0,0 +1,103 @@
+"""
+Background Image Cache for Ultimate Movie Trivia Game
+
+- Keeps pre-scaled copies of the background image on disk, keyed by the source image's hash
+  and the screen resolution, so the image is only resized once per screen size.
+- Copies are stored as binary PPM, which Tkinter's PhotoImage reads natively and quickly.
+- When a copy has to be made, JPEG draft mode lets the decoder scale down during decoding
+  (1/2, 1/4 or 1/8 size), before the final resize.
+- BackgroundLoader does the decoding on a worker thread; the game shows a plain placeholder
+  background straight away and swaps in the image when it is ready.
+"""
+
+import glob
+import hashlib
+import os
+import threading
+
+import Instrumentation
+
+CACHE_DIR = ".background_cache"
+PLACEHOLDER_COLOR = "#1a1a1a"  # shown until the background image is ready
+POLL_MS = 30  # how often the UI thread checks whether the worker thread is done
+
+
+def cache_path(image_path, size, cache_dir=CACHE_DIR):
+    """
+    Returns where the scaled copy of `image_path` at `size` (width, height) is stored.
+    """
+    with open(image_path, "rb") as image_file:
+        digest = hashlib.sha256(image_file.read()).hexdigest()[:16]
+    stem = os.path.splitext(os.path.basename(image_path))[0]
+    return os.path.join(cache_dir, f"{stem}-{digest}-{size[0]}x{size[1]}.ppm")
+
+
+def scale_image(image_path, size, output_path):
+    """
+    Decodes `image_path`, resizes it to exactly `size` and writes it as PPM to `output_path`.
+    """
+    from PIL import Image
+
+    with Image.open(image_path) as image:
+        # For JPEGs, let the decoder skip detail we would throw away anyway.
+        # draft() never goes below the requested size, so quality is kept.
+        image.draft("RGB", size)
+        image = image.convert("RGB").resize(size, Image.LANCZOS, reducing_gap=2.0)
+
+    temp_path = output_path + ".tmp"
+    image.save(temp_path, "PPM")
+    os.replace(temp_path, output_path)
+
+
+def cached_background(image_path, size, cache_dir=CACHE_DIR):
+    """
+    Returns the path of a PPM copy of the image scaled to `size`, creating it if needed.
+    Older copies of the same image at the same size (from before it changed) are removed.
+    """
+    path = cache_path(image_path, size, cache_dir)
+    if os.path.exists(path):
+        Instrumentation.count("background.cache_hit")
+        return path
+
+    Instrumentation.count("background.cache_miss")
+    os.makedirs(cache_dir, exist_ok=True)
+    with Instrumentation.span("background.scale"):
+        scale_image(image_path, size, path)
+
+    stem = os.path.splitext(os.path.basename(image_path))[0]
+    for old_path in glob.glob(os.path.join(cache_dir, f"{stem}-*-{size[0]}x{size[1]}.ppm")):
+        if old_path != path:
+            os.remove(old_path)
+    return path
+
+
+class BackgroundLoader:
+    """
+    Prepares the scaled background on a worker thread and hands the cached file
+    to `on_ready(path)` on the Tkinter thread (Tk objects must only be touched there).
+    """
+
+    def __init__(self, master, image_path, size, on_ready, cache_dir=CACHE_DIR):
+        self.master = master
+        self.on_ready = on_ready
+        self.path = None
+        self.error = None
+        self._thread = threading.Thread(
+            target=self._work, args=(image_path, size, cache_dir), name="background-loader", daemon=True
+        )
+
+    def start(self):
+        self._thread.start()
+        self.master.after(POLL_MS, self._poll)
+
+    def _work(self, image_path, size, cache_dir):
+        try:
+            self.path = cached_background(image_path, size, cache_dir)
+        except (OSError, ValueError) as error:
+            self.error = error  # keep the placeholder background
+
+    def _poll(self):
+        if self._thread.is_alive():
+            self.master.after(POLL_MS, self._poll)
+        elif self.path is not None:
+            self.on_ready(self.path)
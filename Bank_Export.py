@@ -0,0 +1,329 @@
+"""
+Columnar Bank Export for Ultimate Movie Trivia Game
+
+- Exports questions as flat columns plus a string table, so tools outside the game (analytics,
+  selection experiments) can read them without parsing the '#Q' text format again.
+- Columns per question: prompt, correct answer, year (see Question_Index.extract_year),
+  correct-answer index among the choices, choice ids (letter and text) and category.
+  Every text is a number in the shard's string table (UTF-8 in one buffer, see Question_Store).
+- The export is a directory with a manifest.json and one shard file per category, or per hash
+  bucket of the question fingerprint. Shards are self-contained and can be loaded on their own;
+  with hash sharding, a question copied into two files always lands in the same shard and is kept once.
+- ColumnarBank reads shards through memory maps: columns are memory views of the file, and
+  slice() returns a sub-bank over the same memory without copying anything. The game accepts an
+  export directory as its question source.
+
+Usage:
+    python Bank_Export.py movies --out movies.columns                       # one shard per category
+    python Bank_Export.py categories/ --out all.columns --shard-by hash --shards 8
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_right
+
+from Question_Index import extract_year
+from Question_Store import QuestionStore, question_key
+from Reading_Trivia_File import parse_trivia
+
+EXPORT_MAGIC = b"TRIVCOL1"
+EXPORT_VERSION = 1
+MANIFEST = "manifest.json"
+SHARD_SUFFIX = ".cols"
+NO_ANSWER = 255  # answer index when the correct answer is not among the choices
+
+# magic, version, questions, choices, strings, string bytes
+HEADER = struct.Struct("<8sHxxIIII")
+
+# (column, array type code, length as a function of (questions, choices, strings)), in file order
+COLUMNS = (
+    ("prompt_ids", "I", lambda questions, choices, strings: questions),
+    ("answer_ids", "I", lambda questions, choices, strings: questions),
+    ("choice_starts", "I", lambda questions, choices, strings: questions + 1),
+    ("choice_letters", "I", lambda questions, choices, strings: choices),
+    ("choice_texts", "I", lambda questions, choices, strings: choices),
+    ("string_offsets", "I", lambda questions, choices, strings: strings + 1),
+    ("years", "H", lambda questions, choices, strings: questions),
+    ("categories", "H", lambda questions, choices, strings: questions),
+    ("answer_index", "B", lambda questions, choices, strings: questions),
+)
+ALIGN = 8  # every column starts on an 8 byte boundary
+
+
+def padding(position):
+    return -position % ALIGN
+
+
+class ShardBuilder:
+    """
+    Collects the questions of one shard: a QuestionStore for the texts and choices,
+    plus the year, category and answer index columns.
+    """
+
+    def __init__(self):
+        self.store = QuestionStore()
+        self.years = array("H")
+        self.categories = array("H")
+        self.answer_index = array("B")
+
+    def add(self, question, category_id, source="", number=0):
+        if self.store.add(question, source, number) is None:
+            return False  # duplicate
+        self.years.append(extract_year(question["prompt"]))
+        self.categories.append(category_id)
+        answers = list(question["choices"].values())
+        self.answer_index.append(answers.index(question["correct_answer"])
+                                 if question["correct_answer"] in answers[:NO_ANSWER] else NO_ANSWER)
+        return True
+
+    def write(self, path):
+        """
+        Writes the shard file (via a temporary file, so it is never half written).
+        """
+        store = self.store
+        string_offsets, string_data = store.strings.buffers()
+        columns = {
+            "prompt_ids": store.prompt_ids, "answer_ids": store.answer_ids,
+            "choice_starts": store.choice_starts, "choice_letters": store.choice_letters,
+            "choice_texts": store.choice_texts, "string_offsets": string_offsets,
+            "years": self.years, "categories": self.categories, "answer_index": self.answer_index,
+        }
+        temp_path = path + ".tmp"
+        with open(temp_path, "wb") as shard:
+            shard.write(HEADER.pack(EXPORT_MAGIC, EXPORT_VERSION, len(store), len(store.choice_texts),
+                                    len(store.strings), len(string_data)))
+            position = HEADER.size
+            for name, _, _ in COLUMNS:
+                shard.write(b"\0" * padding(position))
+                position += padding(position)
+                data = columns[name].tobytes()
+                shard.write(data)
+                position += len(data)
+            shard.write(string_data)
+        os.replace(temp_path, path)
+
+
+def iter_sources(source):
+    """
+    Yields (category, question number, question) from a question file (one category named after
+    the file) or a directory of category files.
+    """
+    from Trivia_Categories import CategoryLibrary
+
+    if os.path.isdir(source):
+        library = CategoryLibrary(source)
+        for category in library.categories():
+            for number, question in enumerate(library.iter_questions(category), start=1):
+                yield category, number, question
+    else:
+        with open(source, "r") as file:
+            for number, question in enumerate(parse_trivia(file), start=1):
+                yield os.path.basename(source), number, question
+
+
+def export_bank(sources, out_dir, shard_by="category", shards=8):
+    """
+    Exports the questions of `sources` (question files or category directories) to `out_dir`.
+    Returns the manifest.
+    """
+    if shard_by not in ("category", "hash"):
+        raise ValueError("shard_by must be 'category' or 'hash'")
+    categories = []
+    category_ids = {}
+    builders = {}
+    duplicates = 0
+    for source in sources:
+        for category, number, question in iter_sources(source):
+            if category not in category_ids:
+                category_ids[category] = len(categories)
+                categories.append(category)
+            if shard_by == "category":
+                shard_name = category
+            else:
+                shard_name = f"hash-{int.from_bytes(question_key(question)[:4], 'little') % shards:02d}"
+            builder = builders.setdefault(shard_name, ShardBuilder())
+            duplicates += not builder.add(question, category_ids[category], category, number)
+
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = {"version": EXPORT_VERSION, "shard_by": shard_by, "categories": categories,
+                "duplicates": duplicates, "shards": []}
+    for shard_name in sorted(builders):
+        file_name = shard_name.replace(os.sep, "_") + SHARD_SUFFIX
+        builders[shard_name].write(os.path.join(out_dir, file_name))
+        manifest["shards"].append({"name": shard_name, "file": file_name, "count": len(builders[shard_name].store)})
+
+    temp_path = os.path.join(out_dir, MANIFEST + ".tmp")
+    with open(temp_path, "w") as file:
+        json.dump(manifest, file, indent=1)
+    os.replace(temp_path, os.path.join(out_dir, MANIFEST))
+    return manifest
+
+
+def is_export(path):
+    return os.path.isfile(os.path.join(path, MANIFEST))
+
+
+class ColumnarShard:
+    """
+    The questions of one shard, read from memory views of its columns.
+    Indexing returns the same question dictionary as load_trivia(); the other columns
+    (years, categories, answer_index, ...) can be read directly.
+    """
+
+    def __init__(self, columns, strings, start=0, stop=None, owner=None):
+        self.columns = columns
+        self._strings = strings
+        self._start = start
+        self._stop = len(columns["prompt_ids"]) if stop is None else stop
+        self._owner = owner  # the mapped file, kept open while any slice is in use
+        for name in ("prompt_ids", "answer_ids", "years", "categories", "answer_index"):
+            setattr(self, name, columns[name][self._start:self._stop])
+        self.choice_starts = columns["choice_starts"][self._start:self._stop + 1]
+
+    @classmethod
+    def open(cls, path):
+        with open(path, "rb") as file:
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, questions, choices, strings, string_bytes = HEADER.unpack_from(data, 0)
+        if magic != EXPORT_MAGIC or version != EXPORT_VERSION:
+            data.close()
+            raise ValueError(f"{path} is not a version {EXPORT_VERSION} question export")
+
+        view = memoryview(data)
+        columns = {}
+        position = HEADER.size
+        for name, code, length in COLUMNS:
+            position += padding(position)
+            size = length(questions, choices, strings) * array(code).itemsize
+            columns[name] = view[position:position + size].cast(code)
+            position += size
+        columns["string_data"] = view[position:position + string_bytes]
+        return cls(columns, columns["string_data"], owner=data)
+
+    def string(self, string_id):
+        offsets = self.columns["string_offsets"]
+        return str(self._strings[offsets[string_id]:offsets[string_id + 1]], "utf-8")
+
+    def __len__(self):
+        return self._stop - self._start
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("question index out of range")
+        start, end = self.choice_starts[index], self.choice_starts[index + 1]
+        letters, texts = self.columns["choice_letters"], self.columns["choice_texts"]
+        return {
+            "prompt": self.string(self.prompt_ids[index]),
+            "correct_answer": self.string(self.answer_ids[index]),
+            "choices": {self.string(letters[position]): self.string(texts[position])
+                        for position in range(start, end)},
+        }
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def release(self):
+        """
+        Releases this shard's column slices (not those of other slices of the same file).
+        """
+        for name in ("prompt_ids", "answer_ids", "years", "categories", "answer_index", "choice_starts"):
+            getattr(self, name).release()
+
+    def slice(self, start, stop):
+        """
+        Returns questions start..stop-1 as a shard over the same memory (nothing is copied).
+        """
+        start, stop, _ = slice(start, stop).indices(len(self))
+        return ColumnarShard(self.columns, self._strings, self._start + start, self._start + max(start, stop),
+                             self._owner)
+
+
+class ColumnarBank:
+    """
+    An exported bank (or the chosen `shards` of it), indexed like one list of questions.
+    """
+
+    def __init__(self, directory, shards=None):
+        self.path = directory
+        with open(os.path.join(directory, MANIFEST), "r") as file:
+            self.manifest = json.load(file)
+        if self.manifest.get("version") != EXPORT_VERSION:
+            raise ValueError(f"{directory} is not a version {EXPORT_VERSION} question export")
+        self.categories = self.manifest["categories"]
+        entries = [entry for entry in self.manifest["shards"] if shards is None or entry["name"] in shards]
+        if not entries:
+            raise ValueError(f"no shards named {', '.join(shards)} in {directory}")
+        self.shard_names = [entry["name"] for entry in entries]
+        self.shards = [ColumnarShard.open(os.path.join(directory, entry["file"])) for entry in entries]
+        self._ends = []
+        total = 0
+        for shard in self.shards:
+            total += len(shard)
+            self._ends.append(total)
+
+    def __len__(self):
+        return self._ends[-1] if self._ends else 0
+
+    def locate(self, index):
+        """
+        Returns (shard, index within the shard) of a question index.
+        """
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("question index out of range")
+        number = bisect_right(self._ends, index)
+        return self.shards[number], index - (self._ends[number - 1] if number else 0)
+
+    def __getitem__(self, index):
+        shard, position = self.locate(index)
+        return shard[position]
+
+    def __iter__(self):
+        for shard in self.shards:
+            yield from shard
+
+    def shard(self, name):
+        return self.shards[self.shard_names.index(name)]
+
+    def close(self):
+        """
+        Releases the column views and unmaps the shard files. Slices taken with
+        ColumnarShard.slice() must be released first.
+        """
+        for shard in self.shards:
+            shard.release()
+            for column in shard.columns.values():
+                column.release()
+            shard._owner.close()
+        self.shards = []
+        self._ends = []
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Export questions to sharded columnar files.")
+    parser.add_argument("sources", nargs="+", help="question files or directories of category files")
+    parser.add_argument("--out", required=True, help="export directory")
+    parser.add_argument("--shard-by", choices=("category", "hash"), default="category")
+    parser.add_argument("--shards", type=int, default=8, help="number of hash shards")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    written = export_bank(args.sources, args.out, args.shard_by, args.shards)
+    exported_ms = (time.perf_counter() - started) * 1000
+    started = time.perf_counter()
+    bank = ColumnarBank(args.out)
+    opened_ms = (time.perf_counter() - started) * 1000
+    print(f"{len(bank)} questions in {len(written['shards'])} shards ({written['duplicates']} duplicates left out), "
+          f"exported in {exported_ms:.0f} ms, opened in {opened_ms:.2f} ms", file=sys.stderr)
+    bank.close()
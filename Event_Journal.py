@@ -0,0 +1,375 @@
+"""
+Event Journal for Ultimate Movie Trivia Game
+
+- An append-only journal (events.jsonl) of what happens in the game: every answer, every final
+  score and the question order to resume from. The Tkinter thread only puts events on a queue;
+  a writer thread writes them in batches, so the game never waits for the disk.
+- Each line is "<crc32> <json>". A line cut short by a crash fails its checksum and is skipped.
+- The journal is fsynced at least every FSYNC_SECONDS, and right away after events that change
+  the scoreboard.
+- Event types with an applier (for example "score" -> save it to the scoreboard) are applied by
+  the writer thread after they are written, and an "applied" marker is written for each. On startup,
+  events written but never applied (the game crashed or lost power in between) are applied again.
+  A crash between applying an event and syncing its marker applies it twice; the marker is synced
+  straight away to keep that window small.
+- Event types with a batch applier (for example "answer" -> the question statistics) get all their
+  events of one batch at once and one marker for the batch. Batch appliers must skip events they
+  have seen (by "journal" and "seq"), so their markers are synced with everything else.
+- Every journal starts with a header line holding a random journal id. Sequence numbers are only
+  unique within one id: a journal that was deleted, moved away or couldn't be read starts over
+  with a new id, so its numbers never clash with events that were applied before. Events handed
+  to appliers, and events from read_journal(), carry their id in "journal" (it isn't written on
+  every line). Journals from before headers have the id "".
+- When the journal can't be opened or written, the writer reports it once (on stderr and in
+  `error`) and keeps applying events without journaling them, so scores are still saved.
+- The queue is bounded: when the disk can't keep up, events without an applier, and events with a
+  batch applier, are dropped (and counted) rather than blocking the game. Events that have an
+  applier are never dropped. Events are written in the order they were appended.
+- On startup, a journal over ROTATE_BYTES is archived as the next numbered segment (events.jsonl.1,
+  .2, ...); every segment is kept. read_journal() reads them all, oldest first. The new file's header
+  keeps the journal id, and sequence numbers carry on across segments.
+
+Run `python Event_Journal.py [events.jsonl]` to summarize a journal.
+"""
+
+import atexit
+import collections
+import json
+import os
+import queue
+import sys
+import threading
+import time
+import uuid
+import zlib
+
+JOURNAL_PATH = "events.jsonl"
+QUEUE_SIZE = 4096  # events waiting for the writer at most
+BATCH_SIZE = 256  # events written per write() at most
+FSYNC_SECONDS = 1.0
+ROTATE_BYTES = 64 * 1024 * 1024  # on startup, a journal this large is archived as the next segment
+
+
+def encode_line(event):
+    data = json.dumps(event, separators=(",", ":"))
+    return f"{zlib.crc32(data.encode('utf-8')):08x} {data}\n".encode("utf-8")
+
+
+def read_events(path):
+    """
+    Yields the events of a journal in order, skipping lines that fail their checksum.
+    """
+    try:
+        journal = open(path, "rb")
+    except FileNotFoundError:
+        return
+    with journal:
+        for line in journal:
+            checksum, _, data = line.rstrip(b"\n").partition(b" ")
+            try:
+                if int(checksum, 16) != zlib.crc32(data):
+                    continue
+                yield json.loads(data)
+            except ValueError:
+                continue
+
+
+def with_journal_ids(events):
+    """
+    Sets "journal" on each event to the id of the header line before it ("" before any header),
+    unless the event names its journal itself (a marker for an event from before the last header).
+    """
+    journal_id = ""
+    for event in events:
+        if event.get("type") == "journal":
+            journal_id = event["id"]
+        yield event if "journal" in event else dict(event, journal=journal_id)
+
+
+def segment_paths(path):
+    """
+    Returns the archived segments of the journal at `path` (path.1, path.2, ...), oldest first.
+    """
+    directory, name = os.path.split(os.path.abspath(path))
+    numbers = []
+    for entry in os.listdir(directory):
+        number = entry[len(name) + 1:]
+        if entry.startswith(name + ".") and number.isdigit():
+            numbers.append(int(number))
+    return [f"{path}.{number}" for number in sorted(numbers)]
+
+
+def read_journal(path):
+    """
+    Yields the events of every segment of the journal, oldest first, then of the journal itself,
+    each with its journal id in "journal".
+    """
+    for segment in segment_paths(path):
+        yield from with_journal_ids(read_events(segment))
+    yield from with_journal_ids(read_events(path))
+
+
+def pending_events(path, event_types):
+    """
+    Returns (events of `event_types` written but never marked applied, highest sequence number in the
+    journal, id of the journal or None when it has no events yet).
+    """
+    written = {}
+    last_seq = 0
+    journal_id = None
+    for event in with_journal_ids(read_events(path)):
+        if event.get("type") == "journal":
+            journal_id = event["id"]
+        elif journal_id is None:
+            journal_id = ""  # events from before journals had headers
+        last_seq = max(last_seq, event.get("seq", 0))
+        if event.get("type") == "applied":
+            applied = event["of"]
+            for seq in applied if isinstance(applied, list) else [applied]:
+                written.pop((event["journal"], seq), None)
+        elif event.get("type") in event_types:
+            written[event["journal"], event["seq"]] = event
+    return list(written.values()), last_seq, journal_id
+
+
+class EventJournal:
+    """
+    Writes events to the journal at `path` on a background thread.
+
+    `appliers` maps an event type to a function called (on the writer thread) with each event of
+    that type once it is written; whatever it returns can be picked up with take_result(seq).
+    `batch_appliers` maps an event type to a function called with a list of events of that type.
+    """
+
+    def __init__(self, path=JOURNAL_PATH, appliers=None, queue_size=QUEUE_SIZE, fsync_seconds=FSYNC_SECONDS,
+                 batch_appliers=None):
+        self.path = path
+        self.appliers = appliers or {}
+        self.batch_appliers = batch_appliers or {}
+        self.fsync_seconds = fsync_seconds
+        self.dropped = 0  # events dropped because the queue was full
+        self.replayed = 0  # events applied again on startup
+        self.error = None  # last write or apply error
+        self._journal = None  # the open journal file, None while events are applied without it
+        self._reported = False  # whether a journal failure was reported on stderr yet
+        self.journal_id = None  # random id from the journal's header, known once started
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._overflow = collections.deque()  # events with an applier that found the queue full, in order
+        self._results = {}
+        self._lock = threading.Lock()
+        self._next_seq = None
+        self._started = threading.Event()  # set once the journal was replayed and seq is known
+        self._thread = threading.Thread(target=self._work, name="journal-writer", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        atexit.register(self.close)
+        return self
+
+    def append(self, event_type, **fields):
+        """
+        Queues an event and returns its sequence number. Never blocks on the disk.
+        """
+        self._started.wait()  # only until the startup replay has read the journal
+        with self._lock:
+            seq = self._next_seq
+            self._next_seq += 1
+        event = dict(fields, type=event_type, seq=seq, at=time.time())
+        try:
+            if self._overflow:
+                raise queue.Full  # behind an event waiting in the overflow: keep the order
+            self._queue.put_nowait(event)
+        except queue.Full:
+            if event_type in self.appliers:
+                self._overflow.append(event)
+            else:
+                self.dropped += 1
+        return seq
+
+    def take_result(self, seq):
+        """
+        Returns (True, result) once the event `seq` was applied (the result is the exception
+        if applying failed), or (False, None) while it is still on its way.
+        """
+        with self._lock:
+            if seq in self._results:
+                return True, self._results.pop(seq)
+        return False, None
+
+    def close(self):
+        """
+        Writes everything queued so far, syncs the journal and stops the writer.
+        """
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+
+    # WRITER THREAD
+
+    def _work(self):
+        rotated = None
+        header = None
+        try:
+            pending, last_seq, self.journal_id = pending_events(self.path,
+                                                                list(self.appliers) + list(self.batch_appliers))
+            if not pending and os.path.exists(self.path) and os.path.getsize(self.path) >= ROTATE_BYTES:
+                segments = segment_paths(self.path)
+                rotated = f"{self.path}.{int(segments[-1].rsplit('.', 1)[1]) + 1 if segments else 1}"
+                os.rename(self.path, rotated)
+                # The new segment keeps the id and starts with the last sequence number, so numbering carries on
+                header = {"type": "journal", "id": self.journal_id, "seq": last_seq,
+                          "previous": os.path.basename(rotated)}
+        except OSError as error:
+            # What the journal holds is unknown: a new id keeps the numbers below from clashing with it
+            pending, last_seq, self.journal_id = [], 0, None
+            self.error = error
+        if self.journal_id is None:  # a new journal, or one that couldn't be read
+            self.journal_id = uuid.uuid4().hex
+            header = {"type": "journal", "id": self.journal_id, "seq": last_seq}
+        self._next_seq = last_seq + 1
+        self._started.set()
+
+        self._last_sync = time.monotonic()
+        self._dirty = False
+        try:
+            self._journal = open(self.path, "ab")
+            if self._journal.tell() and not self._ends_with_newline():
+                self._journal.write(b"\n")  # end a line cut short by a crash, so it can't swallow the next one
+            if header is not None:
+                self._journal.write(encode_line(header))
+                self._dirty = True
+        except OSError as error:
+            self._journal_failed(error)
+        try:
+            if pending:
+                self.replayed = self._apply(pending, keep_results=False)
+            while self._write_batch():
+                pass
+            self._sync()
+        finally:
+            if self._journal is not None:
+                self._journal.close()
+
+    def _journal_failed(self, error):
+        """
+        Stops journaling after the journal couldn't be opened or written: events are still
+        applied, just not written down. Reported on stderr the first time.
+        """
+        self.error = error
+        if self._journal is not None:
+            try:
+                self._journal.close()
+            except OSError:
+                pass
+            self._journal = None
+        self._dirty = False
+        if not self._reported:
+            self._reported = True
+            print(f"Event journal {self.path} failed ({error}); saving scores without it", file=sys.stderr)
+
+    def _ends_with_newline(self):
+        with open(self.path, "rb") as journal:
+            journal.seek(-1, os.SEEK_END)
+            return journal.read(1) == b"\n"
+
+    def _write_batch(self):
+        """
+        Waits for events, writes one batch and applies what needs applying.
+        Returns False once close() was called.
+        """
+        try:
+            first = self._queue.get(timeout=self.fsync_seconds if self._dirty else None)
+        except queue.Empty:
+            self._sync()  # nothing new for a while: make what was written durable
+            return True
+        batch = [first]
+        while len(batch) < BATCH_SIZE or self._overflow:  # everything queued goes before the overflow
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        while self._overflow:
+            batch.append(self._overflow.popleft())
+        running = None not in batch
+        batch = [event for event in batch if event is not None]
+
+        if self._journal is not None:
+            try:
+                self._journal.write(b"".join(encode_line(event) for event in batch))
+                self._journal.flush()
+                self._dirty = True
+            except (OSError, TypeError, ValueError) as error:  # the scoreboard still gets the scores
+                self._journal_failed(error)
+        self._apply([event for event in batch if event["type"] in self.appliers or event["type"] in self.batch_appliers])
+        if time.monotonic() - self._last_sync >= self.fsync_seconds:
+            self._sync()
+        return running
+
+    def _apply(self, events, keep_results=True):
+        """
+        Applies events and writes their "applied" markers (synced straight away, unless only
+        batch appliers ran). Returns how many were applied.
+        """
+        markers = []
+        batches = collections.defaultdict(list)
+        for event in events:
+            event.setdefault("journal", self.journal_id)
+            if event["type"] in self.batch_appliers:
+                batches[event["type"], event["journal"]].append(event)
+                continue
+            try:
+                result = self.appliers[event["type"]](event)
+                markers.append(self._marker(event["journal"], event["seq"]))
+            except Exception as error:  # left unapplied, so the next start tries again
+                result = error
+                self.error = error
+            if keep_results:
+                with self._lock:
+                    self._results[event["seq"]] = result
+        sync_now = bool(markers)
+        applied = len(markers)
+        for (event_type, journal_id), batch in batches.items():
+            try:
+                self.batch_appliers[event_type](batch)
+                markers.append(self._marker(journal_id, [event["seq"] for event in batch]))
+                applied += len(batch)
+            except Exception as error:  # left unapplied, so the next start tries again
+                self.error = error
+        if markers and self._journal is not None:
+            try:
+                self._journal.write(b"".join(encode_line(marker) for marker in markers))
+                self._journal.flush()
+                self._dirty = True
+                if sync_now:
+                    self._sync()
+            except OSError as error:
+                self._journal_failed(error)
+        return applied
+
+    def _marker(self, journal_id, of):
+        """
+        The "applied" marker for the event(s) `of`, naming their journal if it isn't the current one.
+        """
+        marker = {"type": "applied", "of": of}
+        if journal_id != self.journal_id:
+            marker["journal"] = journal_id
+        return marker
+
+    def _sync(self):
+        if self._dirty:
+            try:
+                os.fsync(self._journal.fileno())
+            except OSError as error:
+                self.error = error
+            self._dirty = False
+        self._last_sync = time.monotonic()
+
+
+if __name__ == "__main__":
+    journal_path = sys.argv[1] if len(sys.argv) > 1 else JOURNAL_PATH
+    counts = collections.Counter(event.get("type") for event in read_events(journal_path))
+    unapplied, highest_seq, id_of_journal = pending_events(journal_path, ("score", "scheduler", "answer"))
+    print(f"{journal_path}: journal {id_of_journal!r}, {len(segment_paths(journal_path))} older segments")
+    print(f"{journal_path}: {sum(counts.values())} events up to #{highest_seq}: "
+          + ", ".join(f"{count} {event_type}" for event_type, count in counts.most_common()))
+    print(f"{len(unapplied)} not applied yet")
@@ -0,0 +1,172 @@
+"""
+Game Engine for Ultimate Movie Trivia Game
+
+- Holds the rules of a round without any Tkinter code: name validation, scoring, timing and question flow.
+- A round moves through four states: instructions -> playing -> times_up (scoreboard countdown) -> scoreboard.
+- Time comes from an injectable clock (time.monotonic by default) through Deadline objects, so rounds
+  can run headless with a ManualClock and be simulated far faster than real time.
+- TriviaGame is a view on top of this engine; Simulate_Rounds.py drives it without a display.
+"""
+
+import time
+
+from Game_Timer import Deadline
+
+# STATES
+INSTRUCTIONS = "instructions"
+PLAYING = "playing"
+TIMES_UP = "times_up"
+SCOREBOARD = "scoreboard"
+
+# RULES
+ROUND_SECONDS = 60
+COUNTDOWN_SECONDS = 3
+CORRECT_POINTS = 5
+WRONG_PENALTY = 1
+MIN_NAME_LENGTH = 5
+MAX_NAME_LENGTH = 15
+
+
+class ManualClock:
+    """
+    A clock that only moves when told to. Call it like time.monotonic().
+    """
+
+    def __init__(self, start=0.0):
+        self.now = start
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+def name_problem(name, name_taken=False):
+    """
+    Returns the warning to show for a player name, or "" if the name can be used.
+    `name_taken` says whether the name is already on the scoreboard.
+    """
+    if len(name) < MIN_NAME_LENGTH:
+        return f"Name must be at least {MIN_NAME_LENGTH} characters."
+    if len(name) > MAX_NAME_LENGTH:
+        return f"Name cannot exceed {MAX_NAME_LENGTH} characters."
+    if name_taken:
+        return "This name already exists. Choose another."
+    return ""
+
+
+class TriviaEngine:
+    """
+    State machine for one player's rounds.
+
+    - draw_question: callable returning the next question dictionary.
+    - clock: callable returning seconds from a monotonic source.
+    """
+
+    def __init__(self, draw_question, clock=time.monotonic,
+                 round_seconds=ROUND_SECONDS, countdown_seconds=COUNTDOWN_SECONDS):
+        self.draw_question = draw_question
+        self.clock = clock
+        self.round_seconds = round_seconds
+        self.countdown_seconds = countdown_seconds
+        self.reset()
+
+    def reset(self):
+        """
+        Goes back to the instructions screen with a fresh score.
+        """
+        self.state = INSTRUCTIONS
+        self.player_name = ""
+        self.score = 0
+        self.questions_asked = 0
+        self.correct_answers = 0
+        self.current_question = None
+        self.answered = False
+        self.round_deadline = None
+        self.countdown_deadline = None
+
+    def start(self, player_name):
+        """
+        Starts a round for the given player. Call next_question() for the first question.
+        """
+        if self.state != INSTRUCTIONS:
+            raise RuntimeError(f"cannot start a round from the {self.state} state")
+        # If for some reason validation doesn't work, username will be "Unknown Player"
+        self.player_name = player_name.strip() or "Unknown Player"
+        self.state = PLAYING
+        self.round_deadline = Deadline(self.round_seconds, self.clock)
+
+    def next_question(self):
+        """
+        Draws the next question of the round.
+        """
+        if self.tick() != PLAYING:
+            raise RuntimeError("the round is over")
+        self.current_question = self.draw_question()
+        self.answered = False
+        self.questions_asked += 1
+        return self.current_question
+
+    def answer(self, selected_answer):
+        """
+        Scores an answer to the current question: +5 when correct, -1 when wrong
+        (the score never drops below 0). Returns True if the answer was correct.
+        """
+        if self.tick() != PLAYING:
+            raise RuntimeError("the round is over")
+        if self.answered:
+            raise RuntimeError("the current question was already answered")
+        self.answered = True
+
+        correct = selected_answer == self.current_question["correct_answer"]
+        if correct:
+            self.score += CORRECT_POINTS
+            self.correct_answers += 1
+        else:
+            self.score = max(0, self.score - WRONG_PENALTY)
+        return correct
+
+    def time_left(self):
+        """
+        Whole seconds left in the round (rounded up, so 59.2 s shows as 60).
+        """
+        if self.round_deadline is None:
+            return self.round_seconds
+        return self.round_deadline.whole_seconds_left()
+
+    def countdown_left(self):
+        """
+        Whole seconds left before the scoreboard is shown after time runs out.
+        """
+        if self.countdown_deadline is None:
+            return self.countdown_seconds
+        return self.countdown_deadline.whole_seconds_left()
+
+    def pause(self):
+        """
+        Stops the clock of the round (or of the scoreboard countdown).
+        """
+        for deadline in (self.round_deadline, self.countdown_deadline):
+            if deadline is not None:
+                deadline.pause()
+
+    def resume(self):
+        """
+        Restarts a paused clock where it stopped.
+        """
+        for deadline in (self.round_deadline, self.countdown_deadline):
+            if deadline is not None:
+                deadline.resume()
+
+    def tick(self):
+        """
+        Moves the state along according to the clock and returns the current state.
+        The scoreboard countdown starts when the end of the round is noticed.
+        """
+        if self.state == PLAYING and self.round_deadline.expired():
+            self.state = TIMES_UP
+            self.countdown_deadline = Deadline(self.countdown_seconds, self.clock)
+        if self.state == TIMES_UP and self.countdown_deadline.expired():
+            self.state = SCOREBOARD
+        return self.state
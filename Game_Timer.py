@@ -0,0 +1,138 @@
+"""
+Game Timer for Ultimate Movie Trivia Game
+
+- Deadline: remaining time computed from a monotonic clock against a fixed end time, with pause/resume.
+  Because time is never counted down tick by tick, a busy UI thread can delay a label update but
+  can never make the round run long.
+- GameTimer: schedules Tkinter ticks so each one lands just after the displayed whole second changes,
+  and records how late the event loop ran each tick (scheduler lag).
+- Used for both the 60 second round timer and the 3 second scoreboard countdown.
+"""
+
+import math
+import time
+
+import Instrumentation
+
+
+class Deadline:
+    """
+    A point in time `seconds` from now on `clock` (time.monotonic by default).
+    """
+
+    def __init__(self, seconds, clock=time.monotonic):
+        self.clock = clock
+        self.end = clock() + seconds
+        self._paused_left = None  # seconds left when paused
+
+    @property
+    def paused(self):
+        return self._paused_left is not None
+
+    def remaining(self):
+        """
+        Seconds left (never negative). Frozen while paused.
+        """
+        if self._paused_left is not None:
+            return self._paused_left
+        return max(0.0, self.end - self.clock())
+
+    def whole_seconds_left(self):
+        """
+        Seconds left rounded up, which is what the player sees (59.2 s shows as 60).
+        """
+        return math.ceil(self.remaining())
+
+    def expired(self):
+        return self.remaining() <= 0
+
+    def pause(self):
+        if self._paused_left is None:
+            self._paused_left = self.remaining()
+
+    def resume(self):
+        if self._paused_left is not None:
+            self.end = self.clock() + self._paused_left
+            self._paused_left = None
+
+
+class GameTimer:
+    """
+    Calls on_tick(whole_seconds_left) each time the displayed second changes and
+    on_expire() once when the deadline passes, using master.after().
+
+    Every tick is scheduled for the exact moment the next whole second is reached,
+    measured from the deadline, so late ticks don't add up. `lags` holds how many
+    seconds after its target time each tick actually ran. `name` labels the
+    timer's spans when instrumentation is on.
+    """
+
+    def __init__(self, master, deadline, on_tick, on_expire, name="timer"):
+        self.master = master
+        self.name = name
+        self.deadline = deadline
+        self.on_tick = on_tick
+        self.on_expire = on_expire
+        self.lags = []
+        self._after_id = None
+        self._target = None  # clock time the pending tick should run at
+
+    def start(self):
+        """
+        Shows the current time immediately and schedules the following ticks.
+        """
+        self._tick()
+
+    def _schedule(self):
+        remaining = self.deadline.remaining()
+        # Time until remaining reaches the next whole second (a full second if it is on one now)
+        delay = remaining % 1 or 1.0
+        delay = min(delay, remaining)
+        self._target = self.deadline.clock() + delay
+        # Round up so the tick never runs just before the second changes
+        self._after_id = self.master.after(max(1, math.ceil(delay * 1000)), self._tick)
+
+    def _tick(self):
+        self._after_id = None
+        if self._target is not None:
+            self.lags.append(max(0.0, self.deadline.clock() - self._target))
+            Instrumentation.record(f"{self.name}.lag", self.lags[-1] * 1000)
+            self._target = None
+
+        if self.deadline.expired():
+            with Instrumentation.span(f"{self.name}.expire"):
+                self.on_expire()
+            return
+        with Instrumentation.span(f"{self.name}.tick"):
+            self.on_tick(self.deadline.whole_seconds_left())
+        self._schedule()
+
+    def cancel(self):
+        """
+        Stops ticking without calling on_expire.
+        """
+        if self._after_id is not None:
+            self.master.after_cancel(self._after_id)
+            self._after_id = None
+        self._target = None
+
+    def pause(self):
+        """
+        Freezes the deadline and stops ticking.
+        """
+        self.deadline.pause()
+        self.cancel()
+
+    def resume(self):
+        """
+        Unfreezes the deadline and picks the ticks back up.
+        """
+        if self.deadline.paused:
+            self.deadline.resume()
+            self._tick()
+
+    def max_lag(self):
+        """
+        Worst scheduler lag seen so far, in seconds.
+        """
+        return max(self.lags, default=0.0)
@@ -0,0 +1,216 @@
+"""
+Question File Ingestion for Ultimate Movie Trivia Game
+
+- Splits a large question file into chunks at '#Q' boundaries and parses the chunks in a process pool.
+- Validates every record (missing '^' line, answer not among the choices, wrapped prompts, ...).
+- Writes a clean, normalized question file in the same '#Q' format plus an error report.
+- Reports throughput in records per second.
+
+Usage:
+    python Ingest_Trivia.py movies
+    python Ingest_Trivia.py movies --output movies.clean --report movies.errors.txt --workers 4 --compile
+"""
+
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+from Reading_Trivia_File import parse_trivia
+
+CHUNK_SIZE = 1 << 20  # bytes of question text per worker task
+
+
+def is_choice_line(line):
+    """
+    Same rule as parse_trivia: a letter, a space, then some answer text.
+    """
+    return line[0].isalpha() and len(line) > 2 and line[1] == " "
+
+
+def validate_record(lines):
+    """
+    Parses one raw record (its non-blank, stripped lines, starting with '#Q') and checks it.
+
+    Returns (question, errors, warnings). A record with errors should not be used;
+    warnings describe problems that were fixed by normalizing the record.
+    """
+    errors = []
+    warnings = []
+
+    # In this format the '^' line comes straight after the prompt, so anything before it is prompt text,
+    # even a wrapped line that happens to look like a choice ("A soldier of fortune ...")
+    first_answer = next((i for i, line in enumerate(lines) if line.startswith("^")), None)
+    if first_answer is None:
+        prompt_lines = [line for line in lines[1:] if not is_choice_line(line)]
+        answer_part = [line for line in lines[1:] if is_choice_line(line)]
+    else:
+        prompt_lines = lines[1:first_answer]
+        answer_part = lines[first_answer:]
+
+    answer_lines = [line for line in answer_part if line.startswith("^")]
+    letters = [line[0] for line in answer_part if not line.startswith("^") and is_choice_line(line)]
+    stray_lines = len(answer_part) - len(answer_lines) - len(letters)
+    question = next(parse_trivia([" ".join([lines[0]] + prompt_lines)] + answer_part))
+
+    if not question["prompt"]:
+        errors.append("empty prompt")
+    if not answer_lines:
+        errors.append("missing '^' correct answer line")
+    elif len(answer_lines) > 1:
+        errors.append("more than one '^' correct answer line")
+
+    if len(set(letters)) != len(letters):
+        errors.append("duplicate choice letter")
+    if len(question["choices"]) < 2:
+        errors.append("fewer than two choices")
+    elif answer_lines and question["correct_answer"] not in question["choices"].values():
+        errors.append(f"correct answer '{question['correct_answer']}' is not among the choices")
+
+    if stray_lines:
+        errors.append("stray text after the answer lines")
+    elif prompt_lines:
+        warnings.append(f"prompt wrapped across {len(prompt_lines) + 1} lines (joined)")
+
+    if len(set(question["choices"].values())) != len(question["choices"]):
+        warnings.append("two choices have the same text")
+
+    return question, errors, warnings
+
+
+def parse_chunk(path, start, end, first_line):
+    """
+    Worker task: parses and validates the records in bytes [start, end) of a question file.
+    `first_line` is the file line number of the chunk's first line, for the error report.
+
+    Returns a list of (line_number, question, errors, warnings) tuples.
+    """
+    with open(path, "rb") as file:
+        file.seek(start)
+        text = file.read(end - start).decode("utf-8", "replace")
+
+    results = []
+    record = []
+    record_line = first_line
+
+    def finish():
+        if record:
+            question, errors, warnings = validate_record(record)
+            results.append((record_line, question, errors, warnings))
+
+    for line_number, line in enumerate(text.splitlines(), first_line):
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith("#Q"):
+            finish()
+            record = [line]
+            record_line = line_number
+        elif record:
+            record.append(line)
+        else:
+            results.append((line_number, None, ["text outside of a question: " + line[:40]], []))
+    finish()
+    return results
+
+
+def split_chunks(path, chunk_size=CHUNK_SIZE):
+    """
+    Returns (start, end, first_line) byte ranges of roughly chunk_size that always begin at a '#Q' line,
+    so no record is split between two workers.
+    """
+    with open(path, "rb") as file:
+        data = file.read()
+
+    chunks = []
+    start = 0
+    line = 1
+    while start < len(data):
+        end = data.find(b"\n#Q", start + chunk_size)
+        end = len(data) if end == -1 else end + 1
+        chunks.append((start, end, line))
+        line += data.count(b"\n", start, end)
+        start = end
+    return chunks
+
+
+def format_question(question):
+    """
+    Writes a question back out in the normalized '#Q' text format.
+    """
+    lines = [f"#Q {question['prompt']}", f"^ {question['correct_answer']}"]
+    lines += [f"{letter} {text}" for letter, text in question["choices"].items()]
+    return "\n".join(lines) + "\n\n"
+
+
+def ingest(path, output_path, report_path, workers=None, chunk_size=CHUNK_SIZE):
+    """
+    Runs the whole pipeline on one question file and returns a summary dictionary
+    with record counts, error counts and throughput.
+    """
+    started = time.perf_counter()
+    chunks = split_chunks(path, chunk_size)
+
+    clean = 0
+    rejected = 0
+    fixed = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool, \
+            open(output_path, "w", encoding="utf-8") as output, \
+            open(report_path, "w", encoding="utf-8") as report:
+        # map() keeps chunk order, so the clean file keeps the source order
+        starts, ends, first_lines = zip(*chunks) if chunks else ((), (), ())
+        for results in pool.map(parse_chunk, repeat(path), starts, ends, first_lines):
+            for line_number, question, errors, warnings in results:
+                for problem in errors:
+                    report.write(f"{path}:{line_number}: error: {problem}\n")
+                for problem in warnings:
+                    report.write(f"{path}:{line_number}: warning: {problem}\n")
+
+                if errors:
+                    rejected += 1
+                    continue
+                fixed += bool(warnings)
+                clean += 1
+                output.write(format_question(question))
+
+    elapsed = time.perf_counter() - started
+    records = clean + rejected
+    return {
+        "records": records,
+        "clean": clean,
+        "rejected": rejected,
+        "normalized": fixed,
+        "chunks": len(chunks),
+        "seconds": elapsed,
+        "records_per_second": records / elapsed if elapsed else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate and normalize a trivia question file.")
+    parser.add_argument("source", help="question file in the '#Q' format")
+    parser.add_argument("--output", help="clean question file (default: <source>.clean)")
+    parser.add_argument("--report", help="error report (default: <source>.errors.txt)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="bytes per worker task")
+    parser.add_argument("--compile", action="store_true", help="also compile the clean file into a question bank")
+    args = parser.parse_args()
+
+    output_path = args.output or args.source + ".clean"
+    report_path = args.report or args.source + ".errors.txt"
+    summary = ingest(args.source, output_path, report_path, args.workers, args.chunk_size)
+
+    print(f"{summary['records']} records in {summary['chunks']} chunks: "
+          f"{summary['clean']} clean ({summary['normalized']} normalized), {summary['rejected']} rejected")
+    print(f"{summary['seconds']:.3f} s, {summary['records_per_second']:,.0f} records/s")
+    print(f"Clean questions: {output_path}")
+    print(f"Error report: {report_path}")
+
+    if args.compile:
+        from Question_Bank import compile_bank
+        count = compile_bank(output_path)
+        print(f"Compiled {count} questions into {output_path}.bank")
+
+
+if __name__ == "__main__":
+    main()
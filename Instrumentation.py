@@ -0,0 +1,218 @@
+"""
+Instrumentation for Ultimate Movie Trivia Game
+
+- Opt-in: nothing is measured unless the TRIVIA_TRACE environment variable names a trace file
+  (or enable() is called). When off, span() and traced() cost a single check.
+- Spans time a block of code, counters count events, and record() stores a duration that was
+  measured elsewhere (answer latency, timer lag).
+- Each round is written as one compact JSON line: the durations of every span in milliseconds
+  and the counter totals. Anything measured outside a round (startup) goes into a "startup" line.
+- `python Instrumentation.py trace.jsonl` prints p50/p95/p99 latencies per span.
+
+Usage:
+    TRIVIA_TRACE=trace.jsonl python TriviaGame.py
+    python Instrumentation.py trace.jsonl
+"""
+
+import atexit
+import functools
+import json
+import math
+import os
+import sys
+import threading
+import time
+from contextlib import nullcontext
+
+_NO_SPAN = nullcontext()
+
+
+class Tracer:
+    """
+    Collects spans and counters for the current round and appends each finished round to a JSONL file.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._round = None  # None until the first round starts: "startup"
+        self._round_fields = {}
+        self._spans = {}
+        self._counters = {}
+
+    def record(self, name, ms):
+        with self._lock:
+            self._spans.setdefault(name, []).append(round(ms, 3))
+
+    def count(self, name, amount=1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def begin_round(self, **fields):
+        """
+        Writes out whatever was collected so far and starts collecting a new round.
+        """
+        self.flush()
+        with self._lock:
+            self._round = (self._round or 0) + 1
+            self._round_fields = dict(fields, started=time.time())
+
+    def end_round(self, **fields):
+        with self._lock:
+            self._round_fields.update(fields)
+        self.flush()
+
+    def flush(self):
+        """
+        Appends the collected spans and counters as one JSON line and clears them.
+        """
+        with self._lock:
+            if not self._spans and not self._counters:
+                return
+            line = {"round": self._round if self._round is not None else "startup", **self._round_fields,
+                    "spans": self._spans, "counters": self._counters}
+            self._spans = {}
+            self._counters = {}
+            self._round_fields = {}
+            with open(self.path, "a") as trace_file:
+                trace_file.write(json.dumps(line, separators=(",", ":")) + "\n")
+
+
+_tracer = None
+
+
+def enable(path):
+    """
+    Turns instrumentation on, appending rounds to `path`.
+    """
+    global _tracer
+    _tracer = Tracer(path)
+    atexit.register(_tracer.flush)
+    return _tracer
+
+
+def enabled():
+    return _tracer is not None
+
+
+class _Span:
+    __slots__ = ("name", "started")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        if _tracer is not None:
+            _tracer.record(self.name, (time.perf_counter() - self.started) * 1000)
+        return False
+
+
+def span(name):
+    """
+    Context manager timing the enclosed block under `name`.
+    """
+    return _Span(name) if _tracer is not None else _NO_SPAN
+
+
+def traced(name):
+    """
+    Decorator timing every call of the function under `name`.
+    """
+    def decorate(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if _tracer is None:
+                return function(*args, **kwargs)
+            with _Span(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def record(name, ms):
+    """
+    Stores a duration (in milliseconds) measured by the caller.
+    """
+    if _tracer is not None:
+        _tracer.record(name, ms)
+
+
+def count(name, amount=1):
+    if _tracer is not None:
+        _tracer.count(name, amount)
+
+
+def begin_round(**fields):
+    if _tracer is not None:
+        _tracer.begin_round(**fields)
+
+
+def end_round(**fields):
+    if _tracer is not None:
+        _tracer.end_round(**fields)
+
+
+# REPORT
+
+def percentile(sorted_values, fraction):
+    """
+    Nearest-rank percentile of an already sorted list.
+    """
+    index = max(0, math.ceil(fraction * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+def summarize(path):
+    """
+    Reads a trace file and returns ({span: stats}, {counter: total}, rounds).
+    """
+    durations = {}
+    counters = {}
+    rounds = 0
+    with open(path, "r") as trace_file:
+        for line in trace_file:
+            entry = json.loads(line)
+            rounds += entry["round"] != "startup"
+            for name, values in entry["spans"].items():
+                durations.setdefault(name, []).extend(values)
+            for name, value in entry["counters"].items():
+                counters[name] = counters.get(name, 0) + value
+
+    stats = {}
+    for name, values in durations.items():
+        values.sort()
+        stats[name] = {
+            "count": len(values),
+            "p50": percentile(values, 0.50),
+            "p95": percentile(values, 0.95),
+            "p99": percentile(values, 0.99),
+            "max": values[-1],
+        }
+    return stats, counters, rounds
+
+
+def print_report(path):
+    stats, counters, rounds = summarize(path)
+    print(f"{rounds} rounds in {path}")
+    print(f"{'span (ms)':<28}{'count':>8}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}")
+    for name in sorted(stats):
+        row = stats[name]
+        print(f"{name:<28}{row['count']:>8}{row['p50']:>10.2f}{row['p95']:>10.2f}{row['p99']:>10.2f}{row['max']:>10.2f}")
+    if counters:
+        print()
+        for name in sorted(counters):
+            print(f"{name:<28}{counters[name]:>8}")
+
+
+if os.environ.get("TRIVIA_TRACE"):
+    enable(os.environ["TRIVIA_TRACE"])
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        sys.exit("usage: python Instrumentation.py trace.jsonl")
+    print_report(sys.argv[1])
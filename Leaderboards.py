@@ -0,0 +1,188 @@
+"""
+Leaderboards for Ultimate Movie Trivia Game
+
+- Keeps several leaderboards up to date as scores come in: all time, per day, per week and per
+  question category. Each one answers "who is on top" and "what rank is this score" at once.
+- Every board counts its scores in one bucket per score value (scores are whole points, so a board
+  has a few hundred buckets even with millions of scores). The buckets sit in a Fenwick tree, so
+  adding a score and looking up a rank both take O(log of the highest score), never a rescan.
+- Each board also keeps its best TOP_KEEP scores in order, so showing a Top 5 costs nothing.
+- Buckets stop at MAX_SCORE: higher scores (which Score_Store refuses, but an old database may hold)
+  share one overflow bucket and rank as equal, so one bogus score can't blow up a board's memory.
+- Days and weeks (starting on Monday) follow this machine's time zone. Only the days and weeks
+  since `since` are tracked; older scores still count for the all time and category boards.
+
+Score_Store builds the boards from the scoreboard database and tops them up with new rows.
+"""
+
+import time
+from array import array
+from bisect import insort
+
+TOP_KEEP = 10  # best scores kept per board
+MAX_SCORE = 10_000  # highest valid score, far above what a 60 second round can reach
+SECONDS_PER_DAY = 86400
+VIEWS = ("day", "week", "category", "all")  # in the order they are shown
+
+
+def local_day(timestamp):
+    """
+    Day number (days since the epoch, in this machine's time zone) of a timestamp.
+    """
+    return int((timestamp + time.localtime(timestamp).tm_gmtoff) // SECONDS_PER_DAY)
+
+
+def week_of(day):
+    """
+    Week number of a day number. The epoch was a Thursday; weeks start on Monday.
+    """
+    return (day + 3) // 7
+
+
+def week_start(timestamp):
+    """
+    Timestamp of local midnight at the start of the Monday of the week of `timestamp`.
+    """
+    first_day = week_of(local_day(timestamp)) * 7 - 3
+    midnight = first_day * SECONDS_PER_DAY
+    return midnight - time.localtime(midnight).tm_gmtoff
+
+
+class RankedScores:
+    """
+    One leaderboard: how many scores of each value it holds (in a Fenwick tree) and its best scores.
+    """
+
+    def __init__(self, top_keep=TOP_KEEP, max_score=MAX_SCORE):
+        self.top_keep = top_keep
+        self.max_score = max_score  # scores above it all count in bucket max_score + 1
+        self.total = 0
+        self._tree = array("q", [0, 0])  # tree[i] holds the counts of scores i - lowbit(i) .. i - 1
+        self._best = []  # (-score, score id, name), best first
+
+    def _grow(self, score):
+        """
+        Makes room for `score`. The tree size stays a power of two, so doubling it keeps every
+        existing entry; only the new last entry (covering everything) needs filling in.
+        """
+        size = len(self._tree) - 1
+        while score >= size:
+            self._tree.extend(array("q", bytes(8 * size)))
+            self._tree[2 * size] = self._tree[size]
+            size *= 2
+
+    def add_count(self, score, count=1):
+        """
+        Counts `count` more scores of value `score` (the best scores list is not touched).
+        """
+        score = min(max(0, score), self.max_score + 1)
+        self._grow(score)
+        position = score + 1
+        size = len(self._tree) - 1
+        while position <= size:
+            self._tree[position] += count
+            position += position & -position
+        self.total += count
+
+    def offer(self, score_id, name, score):
+        """
+        Puts a score on the best scores list if it is good enough.
+        """
+        entry = (-score, score_id, name)
+        if len(self._best) < self.top_keep or entry < self._best[-1]:
+            insort(self._best, entry)
+            del self._best[self.top_keep:]
+
+    def add(self, score_id, name, score):
+        self.add_count(score)
+        self.offer(score_id, name, score)
+
+    def count_below(self, score):
+        """
+        How many scores on this board are lower than `score`. Scores above max_score all count as
+        equal: asked about one of them, the whole overflow bucket counts as lower too, so rank() ties them.
+        """
+        position = min(max(0, score), self.max_score + 2, len(self._tree) - 1)
+        count = 0
+        while position > 0:
+            count += self._tree[position]
+            position -= position & -position
+        return count
+
+    def rank(self, score):
+        """
+        Rank `score` has (or would have) on this board: 1 + the number of higher scores.
+        Equal scores share a rank.
+        """
+        return self.total - self.count_below(score + 1) + 1
+
+    def top(self, n=5):
+        return [{"name": name, "score": -negative} for negative, _, name in self._best[:n]]
+
+
+class Leaderboards:
+    """
+    The all time, daily, weekly and per-category boards of one scoreboard.
+    Day and week boards only hold scores played at or after `since`.
+    """
+
+    def __init__(self, since, top_keep=TOP_KEEP):
+        self.since = since
+        self.top_keep = top_keep
+        self.all = RankedScores(top_keep)
+        self.categories = {}
+        self.days = {}
+        self.weeks = {}
+
+    def category(self, name):
+        if name not in self.categories:
+            self.categories[name] = RankedScores(self.top_keep)
+        return self.categories[name]
+
+    def periods(self, played_at):
+        """
+        Returns the (day, week) boards a score played at `played_at` belongs to, or None when
+        it was played before `since`. Day and week boards older than last week are dropped.
+        """
+        if played_at < self.since:
+            return None
+        day = local_day(played_at)
+        week = week_of(day)
+        if week not in self.weeks:
+            for old in [old for old in self.weeks if old < week - 1]:
+                del self.weeks[old]
+            for old in [old for old in self.days if week_of(old) < week - 1]:
+                del self.days[old]
+            self.weeks[week] = RankedScores(self.top_keep)
+        if day not in self.days:
+            self.days[day] = RankedScores(self.top_keep)
+        return self.days[day], self.weeks[week]
+
+    def add(self, score_id, name, score, played_at, category=""):
+        """
+        Adds one new score to every board it belongs on.
+        """
+        self.all.add(score_id, name, score)
+        self.category(category).add(score_id, name, score)
+        boards = self.periods(played_at)
+        if boards is not None:
+            for board in boards:
+                board.add(score_id, name, score)
+
+    def standings(self, score, category="", played_at=None, n=5):
+        """
+        Returns {view: {"top": [...], "rank": rank of `score`, "total": scores on the board}}
+        for the boards of a score played at `played_at` (now by default) in `category`.
+        The score itself is expected to be on the boards already.
+        """
+        played_at = time.time() if played_at is None else played_at
+        day = local_day(played_at)
+        empty = RankedScores(self.top_keep)
+        boards = {
+            "day": self.days.get(day, empty),
+            "week": self.weeks.get(week_of(day), empty),
+            "category": self.categories.get(category, empty),
+            "all": self.all,
+        }
+        return {view: {"top": board.top(n), "rank": board.rank(score), "total": board.total}
+                for view, board in boards.items()}
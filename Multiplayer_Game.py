@@ -0,0 +1,412 @@
+"""
+Head-to-Head Mode for Ultimate Movie Trivia Game
+
+- Two to four players share one screen and answer the same questions at the same time,
+  each with their own four keys (see PLAYER_KEYS); the mouse answers for the first player.
+- The fastest correct answer wins the question (+5), every wrong answer costs -1, and the next
+  question comes up by itself NEXT_QUESTION_SECONDS after the result.
+- The round is run by a RoundCoordinator on the game's monotonic clock, so the TriviaGame flow
+  (get_question / handle_click / times_up / display_score_board) stays the same, with the
+  coordinator in place of the single player engine.
+- Every player's score is saved to the scoreboard at the end of the round.
+
+Run `python Multiplayer_Game.py Alice Bobby [--source movies]`.
+"""
+
+import time
+import tkinter as tk
+
+from Game_Engine import PLAYING, name_problem
+from Game_Timer import GameTimer
+from Round_Coordinator import NEXT_QUESTION_SECONDS, RoundCoordinator
+from TriviaGame import TriviaGame
+import Instrumentation
+from Instrumentation import traced
+
+# Keys for the four answers, one row per player
+PLAYER_KEYS = ("1234", "7890", "qwer", "uiop")
+CORRECT_COLOR = "#4CAF50"  # green
+
+
+class MultiplayerGame(TriviaGame):
+    """
+    TriviaGame for several players on one screen. `players` is the list of player names.
+    """
+
+    def __init__(self, master, players, question_source="movies", **options):
+        if not 2 <= len(players) <= len(PLAYER_KEYS):
+            raise ValueError(f"a head-to-head round needs 2 to {len(PLAYER_KEYS)} players")
+        self.player_names = list(players)
+        self.coordinator = RoundCoordinator(lambda: self.pipeline.take(), self.player_names)
+        self.coordinator.subscribe(self.on_round_event)
+        self.next_question_id = None
+        super().__init__(master, question_source, **options)
+
+    def show_instructions(self):
+        """
+        Shows the rules and every player's answer keys. The names come from the command line,
+        so the Start button is enabled as soon as the questions are loaded.
+        """
+        for widget in self.ui_frame.winfo_children():
+            widget.destroy()
+        self.coordinator.reset()
+
+        # TITLE LABEL
+        title_label = tk.Label(
+            self.ui_frame,
+            text="Head-to-Head Movie Trivia!",
+            font=("Helvetica", 24, "bold"),
+            fg="red",
+            bg=self.ui_frame["bg"],
+            pady=20
+        )
+        title_label.pack(padx=20)
+
+        # INSTRUCTIONS LABEL
+        key_lines = "\n".join(f"{name}: keys {' '.join(keys.upper())}"
+                              for name, keys in zip(self.player_names, PLAYER_KEYS))
+        instructions_label = tk.Label(
+            self.ui_frame,
+            text=(
+                "Everyone gets the same question at the same time.\n"
+                "The fastest correct answer earns 5 points,\n"
+                "every wrong answer loses 1 point.\n"
+                "You have 60 seconds. Press your key for answer A, B, C or D:\n\n"
+                f"{key_lines}"
+            ),
+            font=("Helvetica", 18),
+            fg="black",
+            justify="center",
+            wraplength=700,
+            pady=20,
+            bg=self.ui_frame["bg"]
+        )
+        instructions_label.pack(padx=50)
+
+        # WARNING LABEL FOR VALIDATION PURPOSES
+        self.name_warning = tk.Label(
+            self.ui_frame,
+            text="",
+            font=("Helvetica", 12, "italic"),
+            fg="red",
+            bg=self.ui_frame["bg"]
+        )
+        self.name_warning.pack(pady=(0, 20))
+
+        # LOADING LABEL (SHOWN WHERE THE START BUTTON GOES UNTIL THE QUESTIONS ARE READY)
+        self.loading_label = tk.Label(
+            self.ui_frame,
+            text="Loading questions...",
+            font=("Helvetica", 14, "italic"),
+            fg="gray",
+            bg=self.ui_frame["bg"]
+        )
+        self.start_button = None
+        self.name_check_id = None
+        if self.questions_ready:
+            self.add_start_button()
+            self.check_name_entry()
+        else:
+            self.loading_label.pack(pady=40)
+
+    def revalidate_start(self):
+        self.check_name_entry()
+
+    def check_name_entry(self, event=None):
+        """
+        Checks every player's name (length only: the same players may play again and again).
+        """
+        warning = next((f"{name}: {problem}" for name in self.player_names
+                        for problem in [name_problem(name)] if problem), "")
+        self.name_warning.config(text=warning)
+        if self.start_button is None:
+            return False
+        self.start_button.config(state="disabled" if warning else "normal")
+        return not warning
+
+    def start_game(self):
+        """
+        Sets up the head-to-head screen: every player's score, the shared timer and the first question.
+        """
+        if not self.check_name_entry():
+            return
+        self.coordinator.start()
+        Instrumentation.begin_round(player=", ".join(self.player_names))
+
+        for widget in self.ui_frame.winfo_children():
+            widget.destroy()
+
+        # SCORES LABEL (ALL PLAYERS)
+        self.score_label = tk.Label(self.ui_frame,
+                                    text=self.scores_text(),
+                                    font=("Helvetica", 16, "bold"),
+                                    fg="green", bg=self.ui_frame["bg"])
+        self.score_label.pack(pady=10)
+
+        # TIMER LABEL
+        self.timer_label = tk.Label(
+            self.ui_frame,
+            text=f"Time Left: {self.coordinator.time_left()} s",
+            font=("Helvetica", 16, "bold"),
+            fg="red", bg=self.ui_frame["bg"]
+        )
+        self.timer_label.pack(pady=10)
+
+        def update_timer(seconds_left):
+            """
+            Updates the timer label every second, and lets the coordinator resolve a question
+            whose answer time ran out (nobody got it right and someone never answered).
+            """
+            self.timer_label.config(text=f"Time Left: {seconds_left} s")
+            self.coordinator.tick()
+
+        def end_round():
+            """
+            Called once the round deadline passes: the coordinator scores the open question,
+            the answer keys stop working and the countdown to the scoreboard starts.
+            """
+            self.coordinator.tick()
+            self.master.unbind("<KeyPress>")
+            if self.next_question_id is not None:
+                self.master.after_cancel(self.next_question_id)
+                self.next_question_id = None
+            self.question_view.disable_answers()
+            self.times_up()
+
+        self.question_view = None
+        self.get_question()
+        self.master.bind("<KeyPress>", self.handle_key)
+        self.round_timer = GameTimer(self.master, self.coordinator.round_deadline, update_timer, end_round,
+                                     name="round_timer")
+        self.round_timer.start()
+
+    def scores_text(self):
+        return "   ".join(f"{player.name}: {player.score}" for player in self.coordinator.players.values())
+
+    @traced("get_question")
+    def get_question(self):
+        """
+        Shows the next question to every player at once.
+        """
+        self.next_question_id = None
+        if self.coordinator.tick() != PLAYING or not self.coordinator.resolved:
+            return
+        question = self.coordinator.next_question()
+
+        # QUESTION VIEW (built on the first question of the round, reused afterwards)
+        if self.question_view is None:
+            from Question_View import QuestionView
+            from tkinter import font as tkfont
+
+            self.question_view = QuestionView(self.ui_frame, self.handle_click, self.get_question)
+            self.pipeline.measure = tkfont.Font(font=self.question_view.question_label.cget("font")).measure
+        self.question_view.show(question)
+        self.question_shown_at = time.perf_counter()
+
+    def handle_key(self, event):
+        """
+        Turns a key press into an answer from the player that key belongs to.
+        """
+        key = event.char.lower()
+        for name, keys in zip(self.player_names, PLAYER_KEYS):
+            if key and key in keys:
+                choice = keys.index(key)
+                if self.question_view is not None and choice < len(self.question_view.answers):
+                    self.player_answer(name, self.question_view.answers[choice])
+                return
+
+    def handle_click(self, selected_answer, button):
+        """
+        A mouse click answers for the first player.
+        """
+        self.player_answer(self.player_names[0], selected_answer)
+
+    def player_answer(self, name, selected_answer):
+        correct = self.coordinator.answer(name, selected_answer)
+        if correct is None:  # second answer, or the question is already decided
+            return
+        Instrumentation.count("answers.correct" if correct else "answers.wrong")
+        if not correct and not self.coordinator.resolved:
+            self.question_view.result_label.config(text=f"{name} is wrong! (-1)", fg="#F44336")
+
+    def on_round_event(self, event):
+        """
+        Shows a question's result: the correct answer in green, who won it, and who lost points.
+        The next question follows by itself.
+        """
+        if event["type"] != "result":
+            return
+        from Question_Stats import answer_event
+
+        question = self.coordinator.current_question
+        for name, (answered_at, correct) in self.coordinator.answers.items():
+            self.journal.append("answer", **answer_event(question, correct, answered_at - self.coordinator.asked_at,
+                                                         name))
+
+        self.score_label.config(text=self.scores_text())
+        self.question_view.disable_answers()
+        for btn, text in zip(self.question_view.buttons, self.question_view.answers):
+            if text == event["correct_answer"]:
+                btn.config(bg=CORRECT_COLOR)
+        if event["winner"] is not None:
+            text = f"{event['winner']} was fastest! (+5 in {event['winning_seconds']:.1f} s)"
+        else:
+            text = f"Nobody got it! The answer was {event['correct_answer']}"
+        losers = [name for name, change in event["changes"].items() if change < 0]
+        if losers:
+            text += f"\nWrong: {', '.join(losers)}"
+        self.question_view.result_label.config(text=text, fg="blue")
+
+        self.master.after_idle(self.pipeline.wrap_ready)
+        if self.coordinator.state == PLAYING:
+            self.next_question_id = self.master.after(int(NEXT_QUESTION_SECONDS * 1000), self.get_question)
+
+    def times_up(self):
+        """
+        Clears the question and counts down to the scoreboard.
+        """
+        for widget in self.ui_frame.winfo_children():
+            widget.destroy()
+        self.question_view = None
+
+        # COUNTDOWN LABEL
+        countdown_label = tk.Label(
+            self.ui_frame,
+            text="",
+            font=("Helvetica", 36, "bold"),
+            fg="#E53935",  # bright red
+            bg=self.ui_frame["bg"],
+            pady=20
+        )
+        countdown_label.pack(pady=(20, 10))
+
+        def countdown(seconds_left):
+            countdown_label.config(text=f"Time's Up! Showing scoreboard in {seconds_left}...")
+
+        self.countdown_timer = GameTimer(self.master, self.coordinator.countdown_deadline, countdown,
+                                         self.display_score_board, name="countdown_timer")
+        self.countdown_timer.start()
+
+    def display_score_board(self):
+        """
+        Shows the round's winner and standings, saves every player's score and shows the Top 5.
+        """
+        for widget in self.ui_frame.winfo_children():
+            widget.destroy()
+        self.coordinator.tick()
+
+        # Saved by the journal's writer thread; the Top 5 comes with the last player's score
+        standings = self.coordinator.standings()
+        for player in standings:
+            score_seq = self.journal.append("score", name=player.name, score=player.score, category=self.category)
+        if self.scheduler is not None:
+            self.journal.append("scheduler", state=self.scheduler_state())
+        Instrumentation.end_round(score=standings[0].score, questions=self.coordinator.questions_asked,
+                                  players=len(standings),
+                                  max_timer_lag_ms=round(self.round_timer.max_lag() * 1000, 3))
+
+        first, second = standings[0], standings[1]
+        tied = (first.score, first.wins) == (second.score, second.wins)
+
+        # WINNER LABEL
+        winner_label = tk.Label(
+            self.ui_frame,
+            text="🏆 It's a tie! 🏆" if tied else f"🏆 {first.name} wins! 🏆",
+            font=("Helvetica", 28, "bold"),
+            fg="#212121",  # dark gray
+            bg=self.ui_frame["bg"],
+            pady=20
+        )
+        winner_label.pack(pady=(10, 20))
+
+        # STANDINGS LABELS
+        for place, player in enumerate(standings, start=1):
+            standing_label = tk.Label(
+                self.ui_frame,
+                text=f"{place}. {player.name} - {player.score} ({player.wins} won, {player.wrong} wrong)",
+                font=("Helvetica", 20, "bold"),
+                fg="#1976D2",  # nice blue
+                bg=self.ui_frame["bg"],
+                pady=5
+            )
+            standing_label.pack()
+
+        # TOP 5 TITLE LABEL
+        top_title = tk.Label(
+            self.ui_frame,
+            text="Top 5",
+            font=("Helvetica", 20, "italic"),
+            fg="#E65100",  # deep orange
+            bg=self.ui_frame["bg"],
+            pady=10
+        )
+        top_title.pack(pady=(30, 10))
+
+        # TOP SCORES FRAME (FILLED IN ONCE THE SCORES ARE SAVED)
+        scores_frame = tk.Frame(self.ui_frame, bg=self.ui_frame["bg"])
+        scores_frame.pack()
+
+        def show_top_scores(boards):
+            if not scores_frame.winfo_exists():
+                return
+            if isinstance(boards, Exception):
+                top_title.config(text="The scoreboard can't be reached right now.")
+                return
+            for entry in boards["all"]["top"]:
+                # MAKE A LABEL FOR EACH TOP SCORE
+                score_label = tk.Label(
+                    scores_frame,
+                    text=f"{entry['name']} - {entry['score']}",
+                    font=("Helvetica", 18),
+                    fg="#424242",
+                    bg=self.ui_frame["bg"],
+                    pady=5
+                )
+                score_label.pack()
+
+        self.when_applied(score_seq, show_top_scores)
+
+        # BACK BUTTON
+        back_btn = tk.Button(
+            self.ui_frame,
+            text="PLAY AGAIN",
+            font=("Helvetica", 18, "bold"),
+            bg="black",
+            fg="black",
+            width=20,
+            height=2,
+            bd=3,
+            command=self.show_instructions
+        )
+        back_btn.pack(pady=(30, 20), padx=80)
+
+        # EXIT BUTTON
+        exit_btn = tk.Button(
+            self.ui_frame,
+            text="EXIT",
+            font=("Helvetica", 18, "bold"),
+            bg="black",
+            fg="black",
+            width=20,
+            height=2,
+            bd=3,
+            command=self.master.destroy
+        )
+        exit_btn.pack(pady=(30, 20), padx=80)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Head-to-head Ultimate Movie Trivia on one screen")
+    parser.add_argument("players", nargs="+", help=f"2 to {len(PLAYER_KEYS)} player names")
+    parser.add_argument("--source", default="movies", help="question file or directory of category files")
+    parser.add_argument("--no-fast-start", dest="fast_start", action="store_false",
+                        help="load everything before showing the instructions")
+    args = parser.parse_args()
+    if not 2 <= len(args.players) <= len(PLAYER_KEYS) or len(set(args.players)) != len(args.players):
+        parser.error(f"give 2 to {len(PLAYER_KEYS)} different player names")
+
+    window = tk.Tk()
+    game = MultiplayerGame(window, args.players, args.source, fast_start=args.fast_start)
+    window.mainloop()
@@ -0,0 +1,314 @@
+"""
+Compiled Question Bank for Ultimate Movie Trivia Game
+
+- Compiles a '#Q' / '^' / 'A ' trivia text file into a compact binary bank.
+- The bank starts with a header (source mtime and SHA-256), then an offset index, then the records.
+- QuestionBank memory-maps the bank and only decodes a question when it is asked for.
+- load_bank() rebuilds the bank automatically when the source file's mtime or hash changes.
+- splice_bank() and patch_bank() update a bank after an edit of a few records (see Question_Reload):
+  the first writes a new bank from bulk copies of the unchanged records, the second overwrites
+  records of the same length in place.
+
+Run `python Question_Bank.py [source]` to compile a bank (and its search index, see Question_Index) ahead of time.
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from Instrumentation import traced
+from Reading_Trivia_File import parse_trivia
+
+BANK_MAGIC = b"TRIVBANK"
+BANK_VERSION = 1
+
+# magic, version, source mtime (ns), source sha256, question count
+HEADER = struct.Struct("<8sHxxQ32sI")
+OFFSET = struct.Struct("<Q")
+LENGTH = struct.Struct("<I")
+MTIME_AT = 12  # header position of the source mtime: magic (8) + version (2) + padding (2)
+DIGEST_AT = 20  # and of the source SHA-256, after the mtime
+
+
+def bank_path_for(source):
+    """
+    Returns the default path of the compiled bank for a question file ('movies' -> 'movies.bank').
+    """
+    return source + ".bank"
+
+
+def file_sha256(path):
+    """
+    Returns the SHA-256 digest of a file, read in 1 MB blocks.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            digest.update(block)
+    return digest.digest()
+
+
+def encode_question(question):
+    """
+    Encodes one question dictionary as a bank record.
+
+    Layout: prompt, correct answer, choice count, then a letter and text per choice.
+    Every string is stored as a 4 byte length followed by UTF-8 bytes.
+    """
+    parts = []
+
+    def add(text):
+        data = text.encode("utf-8")
+        parts.append(LENGTH.pack(len(data)))
+        parts.append(data)
+
+    add(question["prompt"])
+    add(question["correct_answer"])
+    parts.append(LENGTH.pack(len(question["choices"])))
+    for letter, answer_text in question["choices"].items():
+        add(letter)
+        add(answer_text)
+    return b"".join(parts)
+
+
+def decode_question(buffer, offset):
+    """
+    Decodes the bank record starting at `offset` back into a question dictionary.
+    """
+
+    def read(position):
+        (size,) = LENGTH.unpack_from(buffer, position)
+        start = position + LENGTH.size
+        return str(buffer[start:start + size], "utf-8"), start + size
+
+    prompt, offset = read(offset)
+    correct_answer, offset = read(offset)
+    (num_choices,) = LENGTH.unpack_from(buffer, offset)
+    offset += LENGTH.size
+
+    choices = {}
+    for _ in range(num_choices):
+        letter, offset = read(offset)
+        choices[letter], offset = read(offset)
+
+    return {"prompt": prompt, "correct_answer": correct_answer, "choices": choices}
+
+
+def compile_bank(source="movies", bank_path=None):
+    """
+    Parses the question file and writes the compiled bank next to it.
+    The bank is written to a temporary file first and then moved into place,
+    so a reader never sees a half written bank. Returns the number of questions.
+    """
+    bank_path = bank_path or bank_path_for(source)
+    stat = os.stat(source)
+    digest = file_sha256(source)
+
+    with open(source, "r") as file:
+        records = [encode_question(question) for question in parse_trivia(file)]
+    write_bank(bank_path, stat.st_mtime_ns, digest, records)
+    return len(records)
+
+
+def write_bank(bank_path, mtime_ns, digest, records):
+    """
+    Writes encoded question records as a bank for a source file with the given mtime and SHA-256.
+    The bank is written to a temporary file first and then moved into place.
+    """
+    # Offsets are relative to the start of the record section
+    offsets = []
+    position = 0
+    for record in records:
+        offsets.append(position)
+        position += len(record)
+    offsets.append(position)  # end of the last record
+
+    temp_path = bank_path + ".tmp"
+    with open(temp_path, "wb") as bank:
+        bank.write(HEADER.pack(BANK_MAGIC, BANK_VERSION, mtime_ns, digest, len(records)))
+        bank.write(struct.pack(f"<{len(offsets)}Q", *offsets))
+        bank.writelines(records)
+    os.replace(temp_path, bank_path)
+
+
+def read_header(bank_path):
+    """
+    Returns (mtime_ns, sha256, count) from a bank header, or None if the
+    bank is missing, truncated or from another version.
+    """
+    try:
+        with open(bank_path, "rb") as bank:
+            data = bank.read(HEADER.size)
+    except FileNotFoundError:
+        return None
+    if len(data) < HEADER.size:
+        return None
+    magic, version, mtime_ns, digest, count = HEADER.unpack(data)
+    if magic != BANK_MAGIC or version != BANK_VERSION:
+        return None
+    return mtime_ns, digest, count
+
+
+def bank_is_current(source="movies", bank_path=None):
+    """
+    Checks whether the compiled bank still matches its source file.
+
+    - Same mtime as recorded: current, without reading the source.
+    - Different mtime but same SHA-256 (file was touched or copied): current,
+      and the new mtime is written into the header so the hash isn't redone.
+    - Otherwise the bank is stale.
+    """
+    bank_path = bank_path or bank_path_for(source)
+    header = read_header(bank_path)
+    if header is None:
+        return False
+
+    mtime_ns, digest, _ = header
+    source_mtime_ns = os.stat(source).st_mtime_ns
+    if mtime_ns == source_mtime_ns:
+        return True
+    if file_sha256(source) != digest:
+        return False
+
+    # Contents unchanged, only remember the new mtime
+    with open(bank_path, "r+b") as bank:
+        bank.seek(MTIME_AT)
+        bank.write(OFFSET.pack(source_mtime_ns))
+    return True
+
+
+def splice_bank(bank, first, stop, records, mtime_ns, digest):
+    """
+    Writes a new bank over bank.path: `bank` with records first .. stop - 1 replaced by `records`
+    (encoded, any number of them), for a source file with the given mtime and SHA-256.
+
+    The unchanged records before and after are copied from `bank` in two bulk copies and their
+    offsets are copied or shifted as arrays, so only the replaced records are handled one by one.
+    Like write_bank(), the new bank goes to a temporary file first; `bank` keeps its own file.
+    """
+    old = bank._offsets
+    window = array("Q")
+    position = old[first]
+    for record in records:
+        window.append(position)
+        position += len(record)
+    shift = position - old[stop]
+    tail = array("Q", map(shift.__add__, old[stop:]))  # ends with the end of the last record
+    count = len(bank) - (stop - first) + len(records)
+    start = bank._records_start
+
+    temp_path = bank.path + ".tmp"
+    with open(temp_path, "wb") as new_bank:
+        new_bank.write(HEADER.pack(BANK_MAGIC, BANK_VERSION, mtime_ns, digest, count))
+        new_bank.write(bank._map[HEADER.size:HEADER.size + first * OFFSET.size])
+        new_bank.write(window.tobytes())
+        new_bank.write(tail.tobytes())
+        new_bank.write(bank._map[start:start + old[first]])
+        new_bank.writelines(records)
+        new_bank.write(bank._map[start + old[stop]:start + old[len(bank)]])
+    os.replace(temp_path, bank.path)
+
+
+def patch_bank(bank, records, mtime_ns, digest):
+    """
+    Overwrites records of `bank` in place with new ones of the same length ({index: encoded record})
+    and records the source file's new mtime and SHA-256.
+
+    Everyone with the bank mapped sees the new records at once, so the caller must make sure
+    nobody reads it meanwhile. The header is marked stale until the records are synced, so a
+    crash in between makes load_bank() compile the bank again.
+    """
+    for index, record in records.items():
+        if len(record) != bank._offsets[index + 1] - bank._offsets[index]:
+            raise ValueError(f"record {index} can't be patched with a record of another length")
+    with open(bank.path, "r+b") as file:
+        file.seek(MTIME_AT)
+        file.write(OFFSET.pack(0))
+        for index, record in records.items():
+            file.seek(bank._records_start + bank._offsets[index])
+            file.write(record)
+        file.flush()
+        os.fsync(file.fileno())
+        file.seek(DIGEST_AT)
+        file.write(digest)
+        file.seek(MTIME_AT)
+        file.write(OFFSET.pack(mtime_ns))
+
+
+class QuestionBank:
+    """
+    Read-only, memory-mapped view of a compiled question bank.
+
+    Behaves like a list of question dictionaries (len(), indexing, iteration),
+    so it can be passed to random.choice(), but a question is only decoded
+    from the mapped file when it is indexed.
+    """
+
+    def __init__(self, bank_path):
+        self.path = bank_path
+        with open(bank_path, "rb") as bank:
+            self._map = mmap.mmap(bank.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, self.source_mtime_ns, self.source_sha256, self._count = HEADER.unpack_from(self._map, 0)
+        if magic != BANK_MAGIC or version != BANK_VERSION:
+            self._map.close()
+            raise ValueError(f"{bank_path} is not a version {BANK_VERSION} question bank")
+
+        # The offset index is used straight from the mapping, without copying it
+        index_end = HEADER.size + (self._count + 1) * OFFSET.size
+        self._offsets = memoryview(self._map)[HEADER.size:index_end].cast("Q")
+        self._records_start = index_end
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("question index out of range")
+        return decode_question(self._map, self._records_start + self._offsets[index])
+
+    def record_bytes(self, index):
+        """
+        Returns the encoded record of question `index`, without decoding it.
+        """
+        start = self._records_start + self._offsets[index]
+        end = self._records_start + self._offsets[index + 1]
+        return self._map[start:end]
+
+    def __iter__(self):
+        for index in range(self._count):
+            yield self[index]
+
+    def close(self):
+        """
+        Releases the offset view and unmaps the bank file.
+        """
+        self._offsets.release()
+        self._map.close()
+
+
+@traced("load_bank")
+def load_bank(source="movies", bank_path=None):
+    """
+    Returns a QuestionBank for the given question file, compiling it first
+    if the bank is missing or out of date.
+    """
+    bank_path = bank_path or bank_path_for(source)
+    if not bank_is_current(source, bank_path):
+        compile_bank(source, bank_path)
+    return QuestionBank(bank_path)
+
+
+if __name__ == "__main__":
+    source_file = sys.argv[1] if len(sys.argv) > 1 else "movies"
+    from Question_Index import index_path_for, load_index
+
+    count = compile_bank(source_file)
+    print(f"Compiled {count} questions into {bank_path_for(source_file)}")
+    load_index(QuestionBank(bank_path_for(source_file)))
+    print(f"Indexed them into {index_path_for(bank_path_for(source_file))}")
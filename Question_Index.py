@@ -0,0 +1,223 @@
+"""
+Question Index for Ultimate Movie Trivia Game
+
+- An inverted index over a compiled question bank, for themed rounds: questions from one year
+  or decade, questions mentioning a keyword, or questions whose answer is a given title.
+- Indexes the words of each prompt, the year the prompt refers to ("(2001)", or else the first
+  year it mentions) and the correct answer. Each key maps to a sorted list of question indexes.
+- Saved next to the bank ('movies.bank.idx') and read back with memory views of the file, so it
+  is only rebuilt when the bank's source file changes.
+
+Run `python Question_Index.py [source] [--decade 1990] [--keyword love] [--answer Titanic]`
+to count the matching questions.
+"""
+
+import os
+import re
+import struct
+import sys
+from array import array
+
+from Instrumentation import traced
+
+INDEX_MAGIC = b"TRIVIDX1"
+INDEX_VERSION = 1
+
+# magic, version, source sha256 of the bank, question count, token keys, answer keys
+HEADER = struct.Struct("<8sHxx32sIII")
+KEY = struct.Struct("<HI")  # key length in bytes, number of question indexes
+
+WORD = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+PAREN_YEAR = re.compile(r"\((18[89]\d|19\d\d|20\d\d)\)")
+ANY_YEAR = re.compile(r"\b(18[89]\d|19\d\d|20\d\d)\b")
+STOP_WORDS = frozenset(
+    "a an and are as at be by did do does for from has he her his in is it its of on or she that the "
+    "this to was what which who with".split()
+)
+
+
+def tokenize(text):
+    """
+    Returns the distinct search words of a text: lowercase, without very common words.
+    """
+    return {word for word in WORD.findall(text.casefold()) if word not in STOP_WORDS}
+
+
+def normalize_answer(text):
+    return " ".join(text.casefold().split())
+
+
+def extract_year(prompt):
+    """
+    Returns the year a prompt is about: the year in parentheses if there is one,
+    otherwise the first year mentioned, otherwise 0.
+    """
+    match = PAREN_YEAR.search(prompt) or ANY_YEAR.search(prompt)
+    return int(match.group(1)) if match else 0
+
+
+def index_path_for(bank_path):
+    return bank_path + ".idx"
+
+
+class QuestionIndex:
+    """
+    Search keys -> sorted question indexes.
+
+    - tokens: word -> indexes of questions whose prompt contains it
+    - answers: normalized correct answer -> indexes
+    - years: year per question (0 when the prompt names none)
+    """
+
+    def __init__(self, count, tokens, answers, years, source_sha256=b""):
+        self.count = count
+        self.tokens = tokens
+        self.answers = answers
+        self.years = years
+        self.source_sha256 = source_sha256
+        self._by_year = None
+
+    def _questions_by_year(self):
+        """
+        Year -> question indexes, grouped from self.years on the first year or decade search.
+        """
+        if self._by_year is None:
+            self._by_year = {}
+            for index, year in enumerate(self.years):
+                if year:
+                    self._by_year.setdefault(year, []).append(index)
+        return self._by_year
+
+    @classmethod
+    def build(cls, questions, source_sha256=b""):
+        """
+        Indexes an iterable of question dictionaries (a QuestionBank, a list, ...).
+        """
+        tokens = {}
+        answers = {}
+        years = array("H")
+        for index, question in enumerate(questions):
+            for word in tokenize(question["prompt"]):
+                tokens.setdefault(word, array("I")).append(index)
+            answers.setdefault(normalize_answer(question["correct_answer"]), array("I")).append(index)
+            years.append(extract_year(question["prompt"]))
+        return cls(len(years), tokens, answers, years, source_sha256)
+
+    def search(self, keywords=(), year=None, decade=None, answer=None):
+        """
+        Returns the sorted indexes of questions matching every given filter:
+        all `keywords`, the `year` or `decade` (e.g. 1990 for 1990-1999), and the `answer`.
+        With no filters, every question matches.
+        """
+        candidates = []
+        for keyword in keywords:
+            for word in tokenize(keyword):  # very common words match everything, so they are skipped
+                candidates.append(self.tokens.get(word, ()))
+        if answer is not None:
+            candidates.append(self.answers.get(normalize_answer(answer), ()))
+
+        if year is not None or decade is not None:
+            first, last = (year, year) if year is not None else (decade, decade + 9)
+            by_year = self._questions_by_year()
+            candidates.append([index for value in range(first, last + 1) for index in by_year.get(value, ())])
+
+        if not candidates:
+            return list(range(self.count))
+
+        # Intersect starting from the shortest list
+        candidates.sort(key=len)
+        matches = set(candidates[0])
+        for postings in candidates[1:]:
+            if not matches:
+                break
+            matches.intersection_update(postings)
+        return sorted(matches)
+
+    def save(self, path):
+        """
+        Writes the index to `path` (via a temporary file, so it is never half written).
+        """
+        temp_path = path + ".tmp"
+        with open(temp_path, "wb") as file:
+            file.write(HEADER.pack(INDEX_MAGIC, INDEX_VERSION, self.source_sha256, self.count,
+                                   len(self.tokens), len(self.answers)))
+            file.write(self.years.tobytes())
+            for table in (self.tokens, self.answers):
+                for key, postings in table.items():
+                    data = key.encode("utf-8")
+                    file.write(KEY.pack(len(data), len(postings)))
+                    file.write(data)
+                    file.write(array("I", postings).tobytes())
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Reads an index written by save(). Question index lists are memory views into the
+        file's bytes, not copies. Returns None if the file is missing or from another version.
+        """
+        try:
+            with open(path, "rb") as file:
+                data = file.read()
+        except FileNotFoundError:
+            return None
+        if len(data) < HEADER.size:
+            return None
+        magic, version, source_sha256, count, token_count, answer_count = HEADER.unpack_from(data, 0)
+        if magic != INDEX_MAGIC or version != INDEX_VERSION:
+            return None
+
+        view = memoryview(data)
+        position = HEADER.size
+        years = view[position:position + 2 * count].cast("H")
+        position += 2 * count
+
+        tables = []
+        for key_count in (token_count, answer_count):
+            table = {}
+            for _ in range(key_count):
+                key_size, postings_count = KEY.unpack_from(data, position)
+                position += KEY.size
+                key = str(data[position:position + key_size], "utf-8")
+                position += key_size
+                table[key] = view[position:position + 4 * postings_count].cast("I")
+                position += 4 * postings_count
+            tables.append(table)
+        return cls(count, tables[0], tables[1], years, source_sha256)
+
+
+@traced("load_index")
+def load_index(bank):
+    """
+    Returns the index of a QuestionBank, reading it from next to the bank file when it was
+    built from the same source file, and building (and saving) it otherwise.
+    """
+    path = index_path_for(bank.path)
+    index = QuestionIndex.load(path)
+    if index is None or index.source_sha256 != bank.source_sha256 or index.count != len(bank):
+        index = QuestionIndex.build(bank, bank.source_sha256)
+        index.save(path)
+    return index
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from Question_Bank import load_bank
+
+    parser = argparse.ArgumentParser(description="Count the questions matching a themed round.")
+    parser.add_argument("source", nargs="?", default="movies")
+    parser.add_argument("--keyword", action="append", default=[], help="word the prompt must contain")
+    parser.add_argument("--year", type=int)
+    parser.add_argument("--decade", type=int, help="first year of the decade, e.g. 1990")
+    parser.add_argument("--answer", help="correct answer title")
+    args = parser.parse_args()
+
+    question_bank = load_bank(args.source)
+    question_index = load_index(question_bank)
+    found = question_index.search(args.keyword, args.year, args.decade, args.answer)
+    print(f"{len(found)} of {len(question_bank)} questions match")
+    for found_index in found[:5]:
+        print(" -", question_bank[found_index]["prompt"])
+    if not found:
+        sys.exit(1)
@@ -0,0 +1,229 @@
+"""
+Question Pipeline for Ultimate Movie Trivia Game
+
+- Prepares the next few questions before the player asks for them, so "Next Question" only has
+  to swap text into the existing widgets (see QuestionView) instead of picking and laying out a question.
+- A worker thread selects and decodes up to `depth` questions ahead and works out the button texts.
+  It only draws a question when there is room for it, so at most `depth` questions are drawn but
+  not shown yet. With depth 0 nothing is drawn ahead: take() draws the question itself (adaptive
+  rounds, where each pick depends on the answers so far).
+- Wrapping the prompt needs Tk's font metrics, which may only be used on the Tkinter thread, so the game
+  calls wrap_ready() when it is idle (while the player reads the answer feedback) to wrap the prompts
+  at the question label's wraplength.
+- Questions are drawn from the source in the order they will be shown, so no-repeat scheduling still holds.
+  Prepared questions that were not shown when a round ends are shown first in the next round;
+  unshown() lists them, so a saved question order can leave them out.
+
+Run `python Question_Pipeline.py [questions]` to compare the gap between questions with and without prefetching.
+"""
+
+import collections
+import queue
+import sys
+import threading
+import time
+import tkinter as tk
+
+PREFETCH_DEPTH = 3  # questions prepared ahead
+WRAP_LENGTH = 750  # pixels, same as the question label's wraplength
+
+
+def prepare_question(question):
+    """
+    Returns a copy of the question dictionary with what the question screen needs precomputed:
+    'letters', 'answers' (choice texts in button order) and 'button_texts'. 'display_prompt' is
+    the prompt as it will be shown; it is the plain prompt until wrap_text() has wrapped it.
+    """
+    letters = list(question["choices"])
+    answers = list(question["choices"].values())
+    return dict(
+        question,
+        letters=letters,
+        answers=answers,
+        button_texts=[f"{letter}: {answer}" for letter, answer in zip(letters, answers)],
+        display_prompt=question["prompt"],
+    )
+
+
+def wrap_text(text, measure, width=WRAP_LENGTH):
+    """
+    Breaks `text` into lines no wider than `width` pixels, the way a Tk label with that
+    wraplength would, and returns them joined with newlines. `measure(text)` returns the
+    width of a string in pixels (tkinter.font.Font.measure). Words wider than a whole
+    line are put on a line of their own.
+    """
+    widths = {}
+
+    def word_width(word):
+        if word not in widths:
+            widths[word] = measure(word)
+        return widths[word]
+
+    space = measure(" ")
+    lines = []
+    for paragraph in text.split("\n"):
+        line = []
+        line_width = 0
+        for word in paragraph.split():
+            added = word_width(word) + (space if line else 0)
+            if line and line_width + added > width:
+                lines.append(" ".join(line))
+                line = [word]
+                line_width = word_width(word)
+            else:
+                line.append(word)
+                line_width += added
+        lines.append(" ".join(line))
+    return "\n".join(lines)
+
+
+class QuestionPipeline:
+    """
+    Prepares questions from `draw_question()` ahead of time.
+
+    take() returns the next prepared question and is meant to be passed to the TriviaEngine as
+    its draw function. Anything else that changes the question source's state (for example saving
+    the scheduler) must hold `lock`, since the worker thread draws from the source too.
+    """
+
+    def __init__(self, draw_question, depth=PREFETCH_DEPTH):
+        self.draw_question = draw_question
+        self.lock = threading.Lock()
+        self.measure = None  # font.measure, set by the Tkinter thread once a font exists
+        self.error = None  # raised by take() if the worker thread failed
+        self._decoded = queue.Queue()  # filled by the worker thread
+        self._ready = collections.deque()  # wrapped on the Tkinter thread, shown next
+        self._depth = depth
+        self._slots = threading.Semaphore(depth)  # questions the worker may draw before one is taken
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._work, name="question-prefetch", daemon=True)
+
+    def start(self):
+        if self._depth > 0:
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        self._slots.release()  # let a worker waiting for room notice
+
+    def _work(self):
+        while True:
+            self._slots.acquire()
+            if self._stopped.is_set():
+                return
+            try:
+                with self.lock:
+                    self._decoded.put(prepare_question(self.draw_question()))
+            except Exception as error:  # handed to the Tkinter thread by take()
+                self.error = error
+                self._decoded.put(None)
+                return
+
+    def _wrap(self, question):
+        if self.measure is not None:
+            question["display_prompt"] = wrap_text(question["prompt"], self.measure)
+        return question
+
+    def wrap_ready(self):
+        """
+        Moves decoded questions to the ready queue, wrapping their prompts.
+        Call on the Tkinter thread, when it is idle. Returns how many were wrapped.
+        """
+        wrapped = 0
+        while True:
+            try:
+                question = self._decoded.get_nowait()
+            except queue.Empty:
+                break
+            if question is None:  # the worker failed; take() raises its error
+                self._decoded.put(None)
+                break
+            self._ready.append(self._wrap(question))
+            wrapped += 1
+        return wrapped
+
+    def take(self):
+        """
+        Returns the next prepared question. Falls back to waiting for the worker
+        (and wrapping right away) if nothing was prepared yet. With depth 0 the
+        question is drawn and prepared right here.
+        """
+        if self._depth == 0:
+            with self.lock:
+                return self._wrap(prepare_question(self.draw_question()))
+        if self._ready:
+            question = self._ready.popleft()
+        else:
+            question = self._decoded.get()
+            if question is None:
+                self._decoded.put(None)
+                raise self.error
+            question = self._wrap(question)
+        self._slots.release()  # room for the worker to draw one more
+        return question
+
+    def unshown(self):
+        """
+        Returns the questions drawn and prepared but not taken yet, in the order they will be shown.
+        Call on the Tkinter thread, holding `lock`.
+        """
+        return list(self._ready) + [question for question in list(self._decoded.queue) if question is not None]
+
+
+# GAP MEASUREMENT
+
+def measure_question_gaps(frame, draw_question, count, prefetch=True):
+    """
+    Shows `count` questions in a QuestionView and returns the time (in seconds) from each
+    "Next Question" press until the next question has been drawn on screen.
+    With prefetch=False every question is picked and prepared when Next is pressed.
+    """
+    from tkinter import font as tkfont
+    from Question_View import QuestionView
+
+    label_font = tkfont.Font(family="Helvetica", size=18, weight="bold")
+    view = QuestionView(frame, lambda answer, button: None, lambda: None)
+    pipeline = None
+    if prefetch:
+        pipeline = QuestionPipeline(draw_question).start()
+        pipeline.measure = label_font.measure
+
+    gaps = []
+    for _ in range(count):
+        if pipeline is not None:
+            frame.update()  # the player reads the feedback: the event loop is idle
+            pipeline.wrap_ready()
+        started = time.perf_counter()
+        if pipeline is not None:
+            question = pipeline.take()
+        else:
+            question = prepare_question(draw_question())
+            question["display_prompt"] = wrap_text(question["prompt"], label_font.measure)
+        view.show(question)
+        frame.update_idletasks()  # geometry and redraw
+        gaps.append(time.perf_counter() - started)
+
+    if pipeline is not None:
+        pipeline.stop()
+    view.destroy()
+    return gaps
+
+
+if __name__ == "__main__":
+    from Question_Bank import load_bank
+    from Question_Scheduler import QuestionScheduler
+    from Question_View import latency_summary
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    bank = load_bank("movies")
+
+    window = tk.Tk()
+    ui_frame = tk.Frame(window, bg="white", bd=5, relief="ridge")
+    ui_frame.pack()
+    for label, prefetch in (("prepare on Next", False), ("prefetched", True)):
+        scheduler = QuestionScheduler(len(bank), seed=1)
+        result = latency_summary(measure_question_gaps(ui_frame, lambda: bank[scheduler.draw()], count, prefetch))
+        print(f"{label:>16}: mean {result['mean_ms']:.2f} ms, p50 {result['p50_ms']:.2f} ms, "
+              f"p95 {result['p95_ms']:.2f} ms, max {result['max_ms']:.2f} ms")
+    window.destroy()
@@ -0,0 +1,287 @@
+"""
+Question Reload for Ultimate Movie Trivia Game
+
+- Watches a question file while the game runs and recompiles its bank when the file changes,
+  so questions can be fixed or added without restarting the kiosk.
+- The compiler keeps an index of the file: where each '#Q' record starts and a hash of it. After an
+  edit, the new file is compared with the previous one from both ends to find the edited window;
+  only the records in that window are scanned, hashed and (unless the same record was just moved)
+  parsed. Records before the window keep their index entries, records after it are shifted.
+- The bank is patched in place when the edit keeps every record's length (a fixed typo, say) and
+  the caller gave a lock that keeps readers out meanwhile. Otherwise a new bank is written from
+  bulk copies of the unchanged records (see Question_Bank.splice_bank).
+- So the work done record by record grows with the edit, not the file. Every reload still reads
+  the whole file, compares it with the previous one and takes its SHA-256 (for the bank header),
+  and a rewritten bank is copied in full; those are single passes in C, not per record.
+- The new bank is built on a background thread. The game swaps it in on the Tkinter thread
+  between two draws (see TriviaGame.poll_question_reload), so a question on screen is never touched.
+
+Run `python Question_Reload.py [source]` to time a reload after a small edit against a full compile.
+"""
+
+import hashlib
+import os
+import queue
+import re
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from array import array
+from bisect import bisect_right
+
+from Question_Bank import (QuestionBank, bank_path_for, compile_bank, encode_question, load_bank, patch_bank,
+                           splice_bank)
+from Reading_Trivia_File import parse_trivia
+
+WATCH_SECONDS = 1.0  # how often the question file's mtime and size are checked
+RECORD_START = re.compile(rb"\n[ \t]*#Q")  # anchored on the newline: much faster than a MULTILINE ^
+FIRST_RECORD = re.compile(rb"[ \t]*#Q")  # a record at the very start of the file has no newline before it
+COMPARE_BLOCK = 1 << 16  # bytes compared at once while looking for the edited window
+
+
+def record_spans(data):
+    """
+    Returns (start, end) byte offsets of each '#Q' record in the file contents `data`.
+    Anything before the first '#Q' is not part of a question and is left out.
+    """
+    starts = [0] if FIRST_RECORD.match(data) else []
+    starts.extend(match.start() + 1 for match in RECORD_START.finditer(data))
+    return list(zip(starts, starts[1:] + [len(data)]))
+
+
+def record_hashes(data, spans):
+    view = memoryview(data)
+    return [hashlib.blake2b(view[start:end], digest_size=16).digest() for start, end in spans]
+
+
+def common_prefix(old, new):
+    """
+    Length of the longest common prefix of two byte strings. Compares whole blocks first, so it
+    takes a few dozen comparisons (each a memcmp) rather than one step per byte.
+    """
+    view = memoryview(new)
+    limit = min(len(old), len(new))
+    length = 0
+    step = COMPARE_BLOCK
+    while step:
+        while length + step <= limit and old.startswith(view[length:length + step], length):
+            length += step
+        step //= 2
+    return length
+
+
+def common_suffix(old, new, limit):
+    """
+    Length of the longest common suffix of two byte strings, at most `limit`.
+    """
+    view = memoryview(new)
+    length = 0
+    step = COMPARE_BLOCK
+    while step:
+        while length + step <= limit and old.endswith(view[len(new) - length - step:len(new) - length],
+                                                      0, len(old) - length):
+            length += step
+        step //= 2
+    return length
+
+
+class IncrementalCompiler:
+    """
+    Keeps the compiled bank of `source` in step with the file, reparsing only changed records.
+    `bank` is the QuestionBank currently in use; it must have been compiled from the file as it is now.
+    `lock`, if given, keeps everyone from reading the bank while it is patched in place; without
+    it, every reload writes a new bank file.
+    """
+
+    def __init__(self, source, bank, lock=None):
+        self.source = source
+        self.bank_path = bank.path
+        self.lock = lock
+        self.signature = self._signature()
+        with open(source, "rb") as file:
+            data = file.read()
+        if hashlib.sha256(data).digest() != bank.source_sha256:
+            raise ValueError(f"{bank.path} was not compiled from the current {source}")
+        spans = record_spans(data)
+        self.data = data  # the file as the bank was last compiled from it
+        self.starts = array("Q", (start for start, _ in spans))  # where each record starts in self.data
+        self.hashes = record_hashes(data, spans)
+        self.bank = bank
+        self.last_write = None  # how the last reload updated the bank: "patched" or "rewritten"
+
+    def _signature(self):
+        stat = os.stat(self.source)
+        return stat.st_mtime_ns, stat.st_size
+
+    def refresh(self):
+        """
+        Recompiles the bank if the file changed since the last refresh.
+        Returns (new QuestionBank, records reparsed) or None when there is nothing new.
+        A rewritten bank leaves the previous one open (and valid) for whoever is still using it.
+        A patched bank is the same file, so the previous one already reads the new records; that
+        is why patching is done holding `lock` and only when every record keeps its place.
+        """
+        signature = self._signature()
+        if signature == self.signature:
+            return None
+        with open(self.source, "rb") as file:
+            data = file.read()
+        if self._signature() != signature:
+            return None  # still being written, try again on the next check
+        self.signature = signature
+        digest = hashlib.sha256(data).digest()
+        if digest == self.bank.source_sha256:
+            return None  # touched or saved without changes
+
+        first, stop, window_starts, window_end = self._edited_window(data)
+        window_spans = list(zip(window_starts, window_starts[1:] + [window_end]))
+        hashes = record_hashes(data, window_spans)
+        known = {self.hashes[index]: index for index in range(first, stop)}  # records the edit may have moved
+        records = []
+        reparsed = 0
+        for (start, end), record_hash in zip(window_spans, hashes):
+            index = known.get(record_hash)
+            if index is not None:
+                records.append(self.bank.record_bytes(index))
+            else:
+                question = next(parse_trivia(data[start:end].decode("utf-8").splitlines()))
+                records.append(encode_question(question))
+                reparsed += 1
+
+        same_layout = len(records) == stop - first and all(
+            len(record) == len(self.bank.record_bytes(first + offset)) for offset, record in enumerate(records))
+        if self.lock is not None and same_layout:
+            changed = {first + offset: record for offset, record in enumerate(records)
+                       if record != self.bank.record_bytes(first + offset)}
+            with self.lock:
+                patch_bank(self.bank, changed, signature[0], digest)
+            self.last_write = "patched"
+        else:
+            splice_bank(self.bank, first, stop, records, signature[0], digest)
+            self.last_write = "rewritten"
+        self.bank = QuestionBank(self.bank_path)
+
+        shift = len(data) - len(self.data)
+        self.starts = self.starts[:first] + array("Q", window_starts) + array("Q", map(shift.__add__,
+                                                                                        self.starts[stop:]))
+        self.hashes = self.hashes[:first] + hashes + self.hashes[stop:]
+        self.data = data
+        return self.bank, reparsed
+
+    def _edited_window(self, data):
+        """
+        Compares the new file contents with the previous ones from both ends. Returns (first, stop,
+        record starts, window end): old records first .. stop - 1 are replaced by the records starting
+        at those positions in `data`, the last one ending at window end. Records before `first` are
+        unchanged; records from `stop` on are unchanged, only shifted.
+        """
+        old, starts = self.data, self.starts
+        prefix = common_prefix(old, data)
+        suffix = common_suffix(old, data, min(len(old), len(data)) - prefix)
+        # One more record before the edit: the edit may have touched the '#Q' of the record it is in
+        first = max(0, bisect_right(starts, prefix) - 2)
+        # The record after the edit starts after the newline in front of it, both unchanged
+        stop = bisect_right(starts, len(old) - suffix)
+        window_start = starts[first] if first else 0  # from the top, text before the first '#Q' counts too
+        window_end = (starts[stop] if stop < len(starts) else len(old)) + len(data) - len(old)
+
+        window_starts = [window_start] if window_start or FIRST_RECORD.match(data) else []
+        window_starts.extend(match.start() + 1 for match in RECORD_START.finditer(data, window_start, window_end))
+        return first, stop, window_starts, window_end
+
+
+class QuestionWatcher:
+    """
+    Background thread checking the question file every `interval` seconds.
+    take() returns the newest reloaded (QuestionBank, records reparsed), or None.
+    """
+
+    def __init__(self, source, bank, interval=WATCH_SECONDS, lock=None):
+        self.compiler = IncrementalCompiler(source, bank, lock)
+        self.interval = interval
+        self.error = None  # last reload error; the game keeps the bank it has
+        self._reloaded = queue.Queue()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._watch, name="question-watcher", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _watch(self):
+        while not self._stop.wait(self.interval):
+            try:
+                reloaded = self.compiler.refresh()
+            except (OSError, UnicodeDecodeError, ValueError) as error:
+                self.error = error
+                continue
+            if reloaded is not None:
+                self._reloaded.put(reloaded)
+
+    def take(self):
+        """
+        Returns the newest reloaded (QuestionBank, records reparsed), or None. Banks replaced by a
+        newer reload before anyone took them are closed.
+        """
+        newest = None
+        while True:
+            try:
+                reloaded = self._reloaded.get_nowait()
+            except queue.Empty:
+                return newest
+            if newest is not None:
+                newest[0].close()  # the compiler has already moved on to `reloaded`
+            newest = reloaded
+
+
+if __name__ == "__main__":
+    def timed_refresh(compiler):
+        started = time.perf_counter()
+        new_bank, reparsed = compiler.refresh()
+        return new_bank, reparsed, (time.perf_counter() - started) * 1000
+
+    def touch(path, seconds):
+        stat = os.stat(path)  # a coarse clock could hide the edit from the change check
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + seconds * 1_000_000_000))
+
+    source_file = sys.argv[1] if len(sys.argv) > 1 else "movies"
+    with tempfile.TemporaryDirectory() as directory:
+        copy = os.path.join(directory, os.path.basename(source_file))
+        shutil.copyfile(source_file, copy)
+        compiler = IncrementalCompiler(copy, load_bank(copy), lock=threading.Lock())
+
+        # A new question at the end: the bank gets one more record, so it is rewritten
+        with open(copy, "a") as question_file:
+            question_file.write("\n#Q Which film was just added while the game was running?\n"
+                                "^ Hot Reload\nA Hot Reload\nB Cold Start\nC Restart\nD Reboot\n")
+        touch(copy, 1)
+        _, added_reparsed, added_ms = timed_refresh(compiler)
+        added_write = compiler.last_write
+
+        # A typo fixed in the middle: every record keeps its length, so the bank is patched in place
+        with open(copy, "rb") as question_file:
+            data = question_file.read()
+        at = data.index(b"#Q ", len(data) // 2) + 3
+        while not data[at:at + 1].isalpha():
+            at += 1
+        with open(copy, "wb") as question_file:
+            question_file.write(data[:at] + data[at:at + 1].swapcase() + data[at + 1:])
+        touch(copy, 2)
+        new_bank, fixed_reparsed, fixed_ms = timed_refresh(compiler)
+        fixed_write = compiler.last_write
+
+        started = time.perf_counter()
+        compile_bank(copy, bank_path_for(copy) + ".full")
+        full_ms = (time.perf_counter() - started) * 1000
+        full_bank = QuestionBank(bank_path_for(copy) + ".full")
+        same = all(new_bank.record_bytes(index) == full_bank.record_bytes(index) for index in range(len(full_bank)))
+        print(f"{len(new_bank)} questions: question added {added_ms:.1f} ms ({added_reparsed} reparsed, bank "
+              f"{added_write}), typo fixed {fixed_ms:.1f} ms ({fixed_reparsed} reparsed, bank {fixed_write}), "
+              f"full compile {full_ms:.1f} ms, identical banks: {same and len(new_bank) == len(full_bank)}")
+        full_bank.close()
+        new_bank.close()
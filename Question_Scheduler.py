@@ -0,0 +1,249 @@
+"""
+Question Scheduler for Ultimate Movie Trivia Game
+
+- Hands out question indexes without repeats until the whole bank has been shown once (an "epoch").
+- Uniform mode walks a keyed pseudo-random permutation, so a draw is O(1) and needs no shuffled list;
+  the position in the permutation (the cursor) can be saved and resumed across sessions.
+- Weighted mode (by difficulty, or favoring rarely shown questions) samples from a Fenwick tree of
+  weights in O(log n) per draw and zeroes a question's weight once it has been drawn.
+- Everything is driven by a seed, so a player's round can be reproduced exactly.
+"""
+
+import json
+import os
+import random
+from array import array
+
+MASK_64 = (1 << 64) - 1
+
+
+def mix64(value):
+    """
+    SplitMix64 finalizer: scrambles a 64 bit integer. Used as the Feistel round function.
+    """
+    value = (value ^ (value >> 30)) * 0xBF58476D1CE4E5B9 & MASK_64
+    value = (value ^ (value >> 27)) * 0x94D049BB133111EB & MASK_64
+    return value ^ (value >> 31)
+
+
+class Permutation:
+    """
+    A seeded bijection of range(size) computed one element at a time.
+
+    A 4 round Feistel network permutes the smallest even-bit domain that covers `size`
+    (at most 4x larger), and values that land outside range(size) are fed back in
+    ("cycle walking") until they land inside, which keeps it a bijection.
+    """
+
+    ROUNDS = 4
+
+    def __init__(self, size, key):
+        self.size = size
+        half_bits = max(1, ((size - 1).bit_length() + 1) // 2)
+        self.half_bits = half_bits
+        self.half_mask = (1 << half_bits) - 1
+        self.keys = [mix64(key + round_number) for round_number in range(self.ROUNDS)]
+
+    def _encrypt(self, value):
+        left = value >> self.half_bits
+        right = value & self.half_mask
+        for round_key in self.keys:
+            left, right = right, left ^ (mix64(right ^ round_key) & self.half_mask)
+        return (left << self.half_bits) | right
+
+    def __getitem__(self, index):
+        value = self._encrypt(index)
+        while value >= self.size:
+            value = self._encrypt(value)
+        return value
+
+
+class WeightTree:
+    """
+    Fenwick (binary indexed) tree over question weights.
+    Supports changing one weight and picking an index proportionally to weight in O(log n).
+    """
+
+    def __init__(self, weights):
+        self.size = len(weights)
+        self.tree = [0.0] * (self.size + 1)
+        self.weights = list(weights)
+        # O(n) build: push each node's sum into its parent
+        for position in range(1, self.size + 1):
+            self.tree[position] += self.weights[position - 1]
+            parent = position + (position & -position)
+            if parent <= self.size:
+                self.tree[parent] += self.tree[position]
+        self.top_bit = 1 << self.size.bit_length() if self.size else 0
+
+    def total(self):
+        total = 0.0
+        position = self.size
+        while position:
+            total += self.tree[position]
+            position -= position & -position
+        return total
+
+    def set(self, index, weight):
+        delta = weight - self.weights[index]
+        self.weights[index] = weight
+        position = index + 1
+        while position <= self.size:
+            self.tree[position] += delta
+            position += position & -position
+
+    def find(self, target):
+        """
+        Returns the index whose cumulative weight range contains `target`,
+        or -1 if no question has a positive weight left.
+        """
+        position = 0
+        step = self.top_bit
+        while step:
+            following = position + step
+            if following <= self.size and self.tree[following] <= target:
+                position = following
+                target -= self.tree[following]
+            step >>= 1
+        # Floating point rounding can push us past the last positive weight; step back to it
+        while position >= 0 and (position >= self.size or self.weights[position] <= 0):
+            position -= 1
+        return position
+
+
+def save_state(state, path):
+    """
+    Writes a QuestionScheduler.state() dictionary to a JSON file, via a temporary file.
+    """
+    temp_path = path + ".tmp"
+    with open(temp_path, "w") as file:
+        json.dump(state, file)
+    os.replace(temp_path, path)
+
+
+class QuestionScheduler:
+    """
+    Draws question indexes for a bank of `size` questions without repeats.
+
+    - weights: optional per-question weights (for example by difficulty); enables weighted mode.
+    - favor_unseen: divide each weight by (1 + times shown) so rarely shown questions come up first;
+      also enables weighted mode.
+    - seed: makes every draw reproducible. A random seed is picked (and saved) if none is given.
+    """
+
+    def __init__(self, size, seed=None, weights=None, favor_unseen=False):
+        if size <= 0:
+            raise ValueError("cannot schedule an empty question bank")
+        self.size = size
+        self.seed = seed if seed is not None else random.randrange(1 << 63)
+        self.epoch = 0
+        self.cursor = 0  # draws made in the current epoch
+        self.base_weights = list(weights) if weights is not None else None
+        self.favor_unseen = favor_unseen
+        self.shown = array("I", bytes(4 * size))
+        self.weighted = weights is not None or favor_unseen
+
+        self._rng = random.Random(self.seed)
+        self._drawn = set()  # weighted mode: indexes drawn this epoch
+        self._start_epoch()
+
+    def _weight(self, index):
+        weight = self.base_weights[index] if self.base_weights is not None else 1.0
+        if self.favor_unseen:
+            weight /= 1 + self.shown[index]
+        return weight
+
+    def _start_epoch(self):
+        if self.weighted:
+            self._tree = WeightTree(
+                [0.0 if index in self._drawn else self._weight(index) for index in range(self.size)]
+            )
+        else:
+            self._permutation = Permutation(self.size, self.seed + self.epoch)
+
+    def remaining(self):
+        """
+        Returns how many questions can still be drawn before the bank repeats.
+        """
+        return self.size - self.cursor
+
+    def draw(self):
+        """
+        Returns the index of the next question to show.
+        """
+        if self.cursor >= self.size:
+            self.epoch += 1
+            self.cursor = 0
+            self._drawn.clear()
+            self._start_epoch()
+
+        if self.weighted:
+            index = self._tree.find(self._rng.random() * self._tree.total())
+            if index < 0:
+                # Only zero-weight questions are left; take them in order
+                index = next(i for i in range(self.size) if i not in self._drawn)
+            self._tree.set(index, 0.0)
+            self._drawn.add(index)
+        else:
+            index = self._permutation[self.cursor]
+
+        self.cursor += 1
+        self.shown[index] += 1
+        return index
+
+    def state(self, rewind=0):
+        """
+        Returns the scheduler's position as a JSON-serializable dictionary.
+        `rewind` leaves out the last draws (questions drawn ahead but never shown), so a scheduler
+        resumed from the state draws them again. Only unweighted draws can be rewound.
+        """
+        if rewind and self.weighted:
+            raise ValueError("weighted draws can't be rewound")
+        epoch, cursor = self.epoch, self.cursor - rewind
+        while cursor < 0 and epoch > 0:
+            epoch -= 1
+            cursor += self.size
+        state = {"size": self.size, "seed": self.seed, "epoch": epoch, "cursor": max(0, cursor),
+                 "weighted": self.weighted}
+        if self.weighted:
+            state["shown"] = self.shown.tolist()
+            state["drawn"] = sorted(self._drawn)
+            state["rng"] = self._rng.getstate()
+        return state
+
+    @classmethod
+    def from_state(cls, state, weights=None, favor_unseen=False):
+        """
+        Rebuilds a scheduler from state(). Weights are not saved, so pass them again.
+        """
+        scheduler = cls(state["size"], state["seed"], weights, favor_unseen)
+        scheduler.epoch = state["epoch"]
+        scheduler.cursor = state["cursor"]
+        if scheduler.weighted and state.get("weighted"):
+            scheduler.shown = array("I", state["shown"])
+            scheduler._drawn = set(state["drawn"])
+            version, internal, gauss = state["rng"]
+            scheduler._rng.setstate((version, tuple(internal), gauss))
+        scheduler._start_epoch()
+        return scheduler
+
+    def save(self, path):
+        """
+        Writes the scheduler state to a JSON file (via a temporary file, so it is never half written).
+        """
+        save_state(self.state(), path)
+
+    @classmethod
+    def load(cls, path, size, seed=None, weights=None, favor_unseen=False):
+        """
+        Resumes the scheduler saved at `path`. Starts a fresh one if there is no saved
+        state, it is unreadable, or it was saved for a bank of a different size.
+        """
+        try:
+            with open(path, "r") as file:
+                state = json.load(file)
+            if state["size"] == size:
+                return cls.from_state(state, weights, favor_unseen)
+        except (FileNotFoundError, ValueError, KeyError, TypeError):
+            pass
+        return cls(size, seed, weights, favor_unseen)
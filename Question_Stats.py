@@ -0,0 +1,256 @@
+"""
+Question Statistics for Ultimate Movie Trivia Game
+
+- Records every answer (question, player, right or wrong, seconds taken) in a SQLite database
+  (question_stats.db), and keeps running totals per question: attempts, correct answers, total time.
+- Questions are identified by a stable hash of their text (see Question_Store.question_key), so the
+  statistics survive the question file being reordered, merged or recompiled.
+- Answers go through the event journal (see Event_Journal): the game journals an "answer" event and
+  StatsRecorder.apply() writes each batch of them in one transaction on the journal's writer thread,
+  so the game never waits for the disk. Each answer keeps its journal id and sequence number, so
+  applying an event twice (after a crash) stores it once, and rebuild_stats() can replay a whole journal.
+- AdaptiveSelector uses the correct rates to sort questions into difficulty buckets once, then picks
+  from the bucket that fits the player's accuracy so far in the round. A draw is O(1): a keyed
+  permutation per bucket, no re-sorting.
+"""
+
+import random
+import sqlite3
+import sys
+
+from Question_Scheduler import QuestionScheduler
+from Question_Store import question_key
+
+STATS_DB = "question_stats.db"
+BUSY_TIMEOUT = 10
+
+# A question nobody answered yet counts as PRIOR_ATTEMPTS attempts at PRIOR_RATE correct
+PRIOR_RATE = 0.6
+PRIOR_ATTEMPTS = 2
+DIFFICULTY_BUCKETS = 5  # bucket 0 holds the easiest questions, the last bucket the hardest
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS answers (
+    id INTEGER PRIMARY KEY,
+    question_id INTEGER NOT NULL,
+    player TEXT NOT NULL,
+    correct INTEGER NOT NULL,
+    seconds REAL NOT NULL,
+    answered_at REAL NOT NULL,
+    event_seq INTEGER,
+    journal_id TEXT NOT NULL DEFAULT ''
+);
+CREATE TABLE IF NOT EXISTS question_stats (
+    question_id INTEGER PRIMARY KEY,
+    attempts INTEGER NOT NULL,
+    correct INTEGER NOT NULL,
+    total_seconds REAL NOT NULL,
+    last_answered REAL NOT NULL
+);
+"""
+
+
+def question_id(question):
+    """
+    Returns the stable id of a question dictionary as a signed 64 bit integer (a SQLite INTEGER).
+    """
+    return int.from_bytes(question_key(question), "little", signed=True)
+
+
+def connect(path):
+    connection = sqlite3.connect(path, timeout=BUSY_TIMEOUT, isolation_level=None, check_same_thread=False)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    connection.executescript(SCHEMA)
+    columns = [row[1] for row in connection.execute("PRAGMA table_info(answers)")]
+    if "journal_id" not in columns:  # a database from before answers went through the journal
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            # Checked again with the write lock held: another process may have just done it
+            columns = [row[1] for row in connection.execute("PRAGMA table_info(answers)")]
+            if "event_seq" not in columns:
+                connection.execute("ALTER TABLE answers ADD COLUMN event_seq INTEGER")
+            if "journal_id" not in columns:
+                connection.execute("ALTER TABLE answers ADD COLUMN journal_id TEXT NOT NULL DEFAULT ''")
+            connection.execute("DROP INDEX IF EXISTS answers_by_event")  # was unique on event_seq alone
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+    connection.execute("CREATE UNIQUE INDEX IF NOT EXISTS answers_by_journal_event ON answers (journal_id, event_seq)")
+    return connection
+
+
+def answer_event(question, correct, seconds, player="", selected=None):
+    """
+    The fields of a journaled "answer" event (pass them to EventJournal.append("answer", ...)).
+    """
+    return {"question_id": question_id(question), "prompt": question["prompt"], "player": player,
+            "selected": selected, "correct": bool(correct), "seconds": round(float(seconds), 3)}
+
+
+class StatsRecorder:
+    """
+    Writes journaled "answer" events to the statistics database. Meant as the journal's batch
+    applier for "answer" events, so it runs on the journal's writer thread only.
+    """
+
+    def __init__(self, path=STATS_DB):
+        self.path = path
+        self._connection = None  # opened on the writer thread, on the first batch
+
+    def apply(self, events):
+        """
+        Adds a batch of answer events and updates the per-question totals in one transaction.
+        Events stored before (same journal id and sequence number), and answers journaled before
+        questions had ids, are skipped.
+        """
+        if self._connection is None:
+            self._connection = connect(self.path)
+        connection = self._connection
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            for event in events:
+                if "question_id" not in event:
+                    continue
+                inserted = connection.execute(
+                    """INSERT OR IGNORE INTO answers
+                           (question_id, player, correct, seconds, answered_at, event_seq, journal_id)
+                       VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                    (event["question_id"], event["player"], int(event["correct"]), event["seconds"], event["at"],
+                     event["seq"], event.get("journal", ""))
+                ).rowcount
+                if inserted:
+                    connection.execute(
+                        """INSERT INTO question_stats (question_id, attempts, correct, total_seconds, last_answered)
+                           VALUES (?, 1, ?, ?, ?)
+                           ON CONFLICT (question_id) DO UPDATE SET
+                               attempts = attempts + 1,
+                               correct = correct + excluded.correct,
+                               total_seconds = total_seconds + excluded.total_seconds,
+                               last_answered = excluded.last_answered""",
+                        (event["question_id"], int(event["correct"]), event["seconds"], event["at"])
+                    )
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+def rebuild_stats(journal_path, path=STATS_DB):
+    """
+    Applies every answer in the journal at `journal_path` (and its older segments) to the statistics
+    database at `path`; answers already there are skipped. Returns how many answer events were read.
+    """
+    from Event_Journal import read_journal
+
+    recorder = StatsRecorder(path)
+    batch = []
+    read = 0
+    try:
+        for event in read_journal(journal_path):
+            if event.get("type") == "answer" and "question_id" in event:
+                batch.append(event)
+                read += 1
+                if len(batch) >= 1000:
+                    recorder.apply(batch)
+                    batch = []
+        if batch:
+            recorder.apply(batch)
+    finally:
+        recorder.close()
+    return read
+
+
+def load_stats(path=STATS_DB):
+    """
+    Returns {question id: (attempts, correct, total seconds)} for every answered question.
+    """
+    connection = connect(path)
+    try:
+        rows = connection.execute("SELECT question_id, attempts, correct, total_seconds FROM question_stats")
+        return {qid: (attempts, correct, seconds) for qid, attempts, correct, seconds in rows}
+    finally:
+        connection.close()
+
+
+def correct_rate(attempts, correct):
+    """
+    Share of correct answers, pulled towards PRIOR_RATE while a question has few attempts.
+    """
+    return (correct + PRIOR_RATE * PRIOR_ATTEMPTS) / (attempts + PRIOR_ATTEMPTS)
+
+
+def running_accuracy(correct_answers, answered):
+    """
+    The player's accuracy so far in the round, starting at 50 % before the first answer.
+    """
+    return (correct_answers + 1) / (answered + 2)
+
+
+class AdaptiveSelector:
+    """
+    Draws question indexes whose difficulty matches the player's accuracy.
+
+    `rates` holds the correct rate of each question. Questions are split once into
+    DIFFICULTY_BUCKETS equal-sized buckets by rate, and each bucket is drawn without repeats
+    through its own QuestionScheduler, so draw() costs O(1) whatever the bank size.
+    """
+
+    def __init__(self, rates, seed=None, buckets=DIFFICULTY_BUCKETS):
+        if not rates:
+            raise ValueError("cannot select from an empty question bank")
+        # Easiest (highest correct rate) first; the sort happens once, here.
+        # Shuffling first spreads questions with equal rates (never answered) over the buckets.
+        order = list(range(len(rates)))
+        random.Random(seed).shuffle(order)
+        order.sort(key=lambda index: -rates[index])
+        size = -(-len(order) // buckets)
+        self.buckets = [order[start:start + size] for start in range(0, len(order), size)]
+        self.schedulers = [QuestionScheduler(len(bucket), None if seed is None else seed + number)
+                           for number, bucket in enumerate(self.buckets)]
+
+    def bucket_for(self, accuracy):
+        """
+        Returns the bucket for a player accuracy between 0 and 1: the better the
+        player is doing, the harder the bucket.
+        """
+        return min(len(self.buckets) - 1, int(accuracy * len(self.buckets)))
+
+    def draw(self, accuracy):
+        bucket = self.bucket_for(accuracy)
+        return self.buckets[bucket][self.schedulers[bucket].draw()]
+
+
+def adaptive_selector(questions, stats, seed=None):
+    """
+    Builds an AdaptiveSelector for a sequence of question dictionaries (for example a QuestionBank)
+    from load_stats() results.
+    """
+    rates = []
+    for question in questions:
+        attempts, correct, _ = stats.get(question_id(question), (0, 0, 0.0))
+        rates.append(correct_rate(attempts, correct))
+    return AdaptiveSelector(rates, seed)
+
+
+if __name__ == "__main__":
+    from Question_Bank import load_bank
+
+    if sys.argv[1:2] == ["--rebuild"]:
+        # python Question_Stats.py --rebuild [events.jsonl]: replay the journal's answers
+        answers_read = rebuild_stats(sys.argv[2] if len(sys.argv) > 2 else "events.jsonl")
+        print(f"{answers_read} answers replayed from the journal")
+        sys.exit()
+    bank = load_bank(sys.argv[1] if len(sys.argv) > 1 else "movies")
+    question_stats = load_stats()
+    total_attempts = sum(attempts for attempts, _, _ in question_stats.values())
+    print(f"{len(question_stats)} questions answered, {total_attempts} answers in total")
+    selector = adaptive_selector(bank, question_stats)
+    for number, bucket_indexes in enumerate(selector.buckets):
+        print(f"bucket {number}: {len(bucket_indexes)} questions")
@@ -0,0 +1,242 @@
+"""
+Compact Question Store for Ultimate Movie Trivia Game
+
+- Keeps questions in a few flat arrays of integers instead of a dictionary (plus a choices
+  dictionary) per question.
+- Every text (prompt, answer title, choice letter) is stored once in a shared string table and
+  referred to by its number, so a title like "Dracula" that appears in hundreds of questions
+  is kept in memory only once. The table keeps all strings as UTF-8 in a single buffer.
+- Questions repeated across merged question files (same prompt, answer and choices, ignoring
+  case and spacing) are detected and kept only once.
+- QuestionStore behaves like the list of question dictionaries from load_trivia(): len(),
+  indexing and iteration build the dictionary of a question when it is asked for.
+
+Run `python Question_Store.py [file ...]` to merge question files and compare memory use
+with the list of dictionaries from load_trivia().
+"""
+
+import hashlib
+import sys
+import tracemalloc
+from array import array
+
+from Reading_Trivia_File import load_trivia, parse_trivia
+
+
+class StringTable:
+    """
+    Numbered, deduplicated strings, kept as UTF-8 in one shared buffer (no object per string).
+    intern() returns the number of a string, adding it if needed.
+    """
+
+    def __init__(self):
+        self._data = bytearray()
+        self._offsets = array("I", [0])  # string i is _data[_offsets[i]:_offsets[i + 1]]
+        self._ids = {}  # text -> number, only while adding strings (see freeze())
+
+    def intern(self, text):
+        if self._ids is None:
+            self._ids = {self[string_id]: string_id for string_id in range(len(self))}
+        string_id = self._ids.get(text)
+        if string_id is None:
+            string_id = len(self)
+            self._data += text.encode("utf-8")
+            self._offsets.append(len(self._data))
+            self._ids[text] = string_id
+        return string_id
+
+    def freeze(self):
+        """
+        Drops the text -> number lookup, which is only needed to add strings.
+        It is rebuilt if intern() is called again.
+        """
+        self._ids = None
+
+    def buffers(self):
+        """
+        Returns (offsets array, UTF-8 bytes) of the whole table, for writing it out as is.
+        """
+        return self._offsets, bytes(self._data)
+
+    def __getitem__(self, string_id):
+        return self._data[self._offsets[string_id]:self._offsets[string_id + 1]].decode("utf-8")
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+
+def question_key(question):
+    """
+    Returns a short fingerprint of a question that ignores case, spacing and choice order,
+    so the same question copied into two files (possibly with other letters) is recognised.
+    """
+    def normal(text):
+        return " ".join(text.casefold().split())
+
+    parts = [normal(question["prompt"]), normal(question["correct_answer"])]
+    parts.extend(sorted(normal(text) for text in question["choices"].values()))
+    return hashlib.blake2b("\x00".join(parts).encode("utf-8"), digest_size=8).digest()
+
+
+class QuestionRecord:
+    """
+    One question of a QuestionStore, read straight from the store's arrays.
+    """
+
+    __slots__ = ("_store", "index")
+
+    def __init__(self, store, index):
+        self._store = store
+        self.index = index
+
+    @property
+    def prompt(self):
+        return self._store.strings[self._store.prompt_ids[self.index]]
+
+    @property
+    def correct_answer(self):
+        return self._store.strings[self._store.answer_ids[self.index]]
+
+    @property
+    def choices(self):
+        store = self._store
+        start, end = store.choice_starts[self.index], store.choice_starts[self.index + 1]
+        return {store.strings[letter]: store.strings[text]
+                for letter, text in zip(store.choice_letters[start:end], store.choice_texts[start:end])}
+
+    def as_dict(self):
+        return {"prompt": self.prompt, "correct_answer": self.correct_answer, "choices": self.choices}
+
+
+class QuestionStore:
+    """
+    Questions as columns of string numbers:
+
+    - prompt_ids[i], answer_ids[i]: the prompt and correct answer of question i
+    - choice_starts[i] .. choice_starts[i + 1]: where question i's choices are in
+      choice_letters / choice_texts
+    """
+
+    def __init__(self):
+        self.strings = StringTable()
+        self.prompt_ids = array("I")
+        self.answer_ids = array("I")
+        self.choice_starts = array("I", [0])
+        self.choice_letters = array("I")
+        self.choice_texts = array("I")
+        self.duplicates = []  # (source, question number in source, index of the question kept)
+        self._keys = {}  # question_key -> index
+
+    def add(self, question, source="", number=0):
+        """
+        Adds a question dictionary. Returns its index, or None if the same question
+        is already in the store (the duplicate is recorded in self.duplicates).
+        """
+        key = question_key(question)
+        if self._keys is None:
+            self._keys = {question_key(self[index]): index for index in range(len(self))}
+        if key in self._keys:
+            self.duplicates.append((source, number, self._keys[key]))
+            return None
+
+        index = len(self.prompt_ids)
+        self._keys[key] = index
+        self.prompt_ids.append(self.strings.intern(question["prompt"]))
+        self.answer_ids.append(self.strings.intern(question["correct_answer"]))
+        for letter, text in question["choices"].items():
+            self.choice_letters.append(self.strings.intern(letter))
+            self.choice_texts.append(self.strings.intern(text))
+        self.choice_starts.append(len(self.choice_texts))
+        return index
+
+    def add_file(self, path):
+        """
+        Adds every question of a '#Q' question file. Returns how many were new.
+        """
+        added = 0
+        with open(path, "r") as file:
+            for number, question in enumerate(parse_trivia(file), start=1):
+                added += self.add(question, path, number) is not None
+        return added
+
+    def freeze(self):
+        """
+        Drops the lookups that are only needed while questions are added (the string
+        numbers and question fingerprints). They are rebuilt if add() is called again.
+        """
+        self.strings.freeze()
+        self._keys = None
+
+    def record(self, index):
+        if not 0 <= index < len(self):
+            raise IndexError("question index out of range")
+        return QuestionRecord(self, index)
+
+    def __len__(self):
+        return len(self.prompt_ids)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        return self.record(index).as_dict()
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+
+def load_store(paths):
+    """
+    Merges the question files in `paths` into one QuestionStore.
+    """
+    store = QuestionStore()
+    for path in paths:
+        store.add_file(path)
+    store.freeze()
+    return store
+
+
+def retained_kb(build):
+    """
+    Returns (result of build(), KB of memory still allocated by it afterwards).
+    """
+    tracemalloc.start()
+    result = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current / 1024
+
+
+def memory_report(paths):
+    """
+    Compares the memory kept by load_trivia()'s lists of dictionaries with a QuestionStore
+    of the same files. Returns a dictionary of the numbers.
+    """
+    def build_lists():
+        return [load_trivia(path) for path in paths]
+
+    questions, list_kb = retained_kb(build_lists)
+    total = sum(len(file_questions) for file_questions in questions)
+    del questions
+
+    store, store_kb = retained_kb(lambda: load_store(paths))
+    return {
+        "questions": total,
+        "unique_questions": len(store),
+        "duplicates": len(store.duplicates),
+        "unique_strings": len(store.strings),
+        "list_of_dicts_kb": list_kb,
+        "store_kb": store_kb,
+        "saved_kb": list_kb - store_kb,
+    }
+
+
+if __name__ == "__main__":
+    files = sys.argv[1:] or ["movies"]
+    report = memory_report(files)
+    print(f"{report['questions']} questions in {len(files)} file(s): {report['unique_questions']} unique, "
+          f"{report['duplicates']} duplicates, {report['unique_strings']} unique strings")
+    print(f"list of dicts (load_trivia): {report['list_of_dicts_kb']:>10,.0f} KB")
+    print(f"QuestionStore:               {report['store_kb']:>10,.0f} KB")
+    print(f"saved:                       {report['saved_kb']:>10,.0f} KB "
+          f"({report['saved_kb'] / report['list_of_dicts_kb']:.0%})")
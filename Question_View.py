@@ -0,0 +1,204 @@
+"""
+Question Screen for Ultimate Movie Trivia Game
+
+- QuestionView builds the question label, answer buttons, result label and "Next Question"
+  button once, then only changes their text, colors and state for each new question.
+- This replaces destroying and recreating every widget per question, which stuttered on slow machines.
+- Each show() can record its render latency, and measure_render_latency() compares
+  widget reuse with rebuilding a fresh view for every question.
+
+Run `python Question_View.py [questions]` to print the render latency of both approaches.
+"""
+
+import statistics
+import sys
+import time
+import tkinter as tk
+from tkmacosx import Button
+
+from Question_Pipeline import prepare_question
+
+MAX_CHOICES = 4
+CORRECT_COLOR = "#4CAF50"  # green
+WRONG_COLOR = "#F44336"  # red
+
+
+class QuestionView:
+    """
+    The persistent widgets of the question screen, packed into `frame` below the
+    score and timer labels.
+
+    on_answer(answer_text, button) is called when an answer button is clicked and
+    on_next() when "Next Question" is clicked.
+    """
+
+    def __init__(self, frame, on_answer, on_next, measure=False):
+        self.frame = frame
+        self.on_answer = on_answer
+        self.measure = measure
+        self.render_times = []  # seconds per show() when measuring
+        self.answers = []  # answer text per visible button
+        bg = frame["bg"]
+
+        # QUESTION LABEL
+        self.question_label = tk.Label(
+            frame,
+            text="",
+            font=("Helvetica", 18, "bold"),
+            wraplength=750,
+            justify="center",
+            fg="black",
+            bg=bg
+        )
+        self.question_label.pack(pady=30)
+
+        # ANSWER BUTTONS (one per possible choice, hidden when a question has fewer)
+        self.buttons = []
+        for index in range(MAX_CHOICES):
+            btn = Button(
+                frame,
+                text="",
+                width=1000,
+                height=70,
+                fg="black",
+                font=("Helvetica", 16),
+                padx=20, pady=20,
+                bg=bg
+            )
+            btn.config(command=lambda i=index: self.on_answer(self.answers[i], self.buttons[i]))
+            btn.pack(pady=5, padx=20)
+            self.buttons.append(btn)
+
+        # RESULT LABEL
+        self.result_label = tk.Label(
+            frame,
+            text="Result:",
+            font=("Helvetica", 16, "bold"),
+            fg="blue",
+            bg=bg
+        )
+        self.result_label.pack(pady=30)
+
+        # NEXT BUTTON (only packed once the question has been answered)
+        self.next_button = Button(
+            frame,
+            text="Next Question",
+            width=600,
+            height=60,
+            font=("Helvetica", 14),
+            padx=10, bg=bg,
+            command=on_next
+        )
+
+    def show(self, question):
+        """
+        Puts a new question on screen by updating the existing widgets.
+        A question prepared by Question_Pipeline already has its button texts and wrapped prompt.
+        """
+        started = time.perf_counter()
+        bg = self.frame["bg"]
+        if "button_texts" not in question:
+            question = prepare_question(question)
+
+        self.question_label.config(text=question["display_prompt"])
+        self.answers = question["answers"]
+
+        for index, btn in enumerate(self.buttons):
+            if index < len(self.answers):
+                btn.config(text=question["button_texts"][index], bg=bg, state="normal")
+                if not btn.winfo_manager():
+                    btn.pack(pady=5, padx=20, before=self.result_label)
+            elif btn.winfo_manager():
+                btn.pack_forget()
+
+        self.result_label.config(text="Result:", fg="blue")
+        self.next_button.pack_forget()
+
+        if self.measure:
+            self.frame.update_idletasks()  # include geometry and redraw in the measurement
+            self.render_times.append(time.perf_counter() - started)
+
+    def disable_answers(self):
+        """
+        Disables every answer button (after an answer, or when time runs out).
+        """
+        for btn in self.buttons:
+            btn.config(state="disabled")
+
+    def show_result(self, button, correct, correct_answer):
+        """
+        Colors the clicked button, highlights the correct answer, shows the
+        result text and reveals the "Next Question" button.
+        """
+        self.disable_answers()
+        if correct:
+            button.config(bg=CORRECT_COLOR)
+            self.result_label.config(text="Correct!")
+        else:
+            button.config(bg=WRONG_COLOR)
+            self.result_label.config(text=f"Incorrect! The answer was {correct_answer}", fg=WRONG_COLOR)
+            # Pairs each button with it's corresponding answer and highlights the correct one
+            for btn, text in zip(self.buttons, self.answers):
+                if text == correct_answer:
+                    btn.config(bg=CORRECT_COLOR)
+        self.next_button.pack(pady=20)
+
+    def destroy(self):
+        """
+        Removes all of the view's widgets from the frame.
+        """
+        for widget in [self.question_label, *self.buttons, self.result_label, self.next_button]:
+            widget.destroy()
+
+
+def latency_summary(seconds):
+    """
+    Summarizes a list of render times (in seconds) as milliseconds.
+    """
+    ms = sorted(value * 1000 for value in seconds)
+    return {
+        "count": len(ms),
+        "mean_ms": statistics.fmean(ms),
+        "p50_ms": ms[len(ms) // 2],
+        "p95_ms": ms[min(len(ms) - 1, int(len(ms) * 0.95))],
+        "max_ms": ms[-1],
+    }
+
+
+def measure_render_latency(frame, questions, reuse=True):
+    """
+    Renders each question in `questions` and returns latency_summary() of the render times.
+
+    With reuse=True one QuestionView is updated for every question. With reuse=False a fresh
+    view is built and the old one destroyed for every question, like the original screen did.
+    """
+    times = []
+    view = QuestionView(frame, lambda answer, button: None, lambda: None, measure=True)
+    for question in questions:
+        if not reuse:
+            started = time.perf_counter()
+            view.destroy()
+            view = QuestionView(frame, lambda answer, button: None, lambda: None, measure=True)
+            view.show(question)
+            times.append(time.perf_counter() - started)
+        else:
+            view.show(question)
+    view.destroy()
+    return latency_summary(times if not reuse else view.render_times)
+
+
+if __name__ == "__main__":
+    from Question_Bank import load_bank
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    bank = load_bank("movies")
+    sample = [bank[index % len(bank)] for index in range(count)]
+
+    window = tk.Tk()
+    ui_frame = tk.Frame(window, bg="white", bd=5, relief="ridge")
+    ui_frame.pack()
+    for label, reuse_widgets in (("rebuild per question", False), ("reuse widgets", True)):
+        result = measure_render_latency(ui_frame, sample, reuse=reuse_widgets)
+        print(f"{label:>22}: mean {result['mean_ms']:.2f} ms, p50 {result['p50_ms']:.2f} ms, "
+              f"p95 {result['p95_ms']:.2f} ms, max {result['max_ms']:.2f} ms")
+    window.destroy()
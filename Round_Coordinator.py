@@ -0,0 +1,298 @@
+"""
+Round Coordinator for Ultimate Movie Trivia Game
+
+- Runs a head-to-head round: every player gets the same question at the same time, and the
+  fastest correct answer wins it.
+- Scoring keeps the single player rules: the fastest correct answer gets +5, every wrong answer
+  costs -1 (never below 0). Slower correct answers score nothing.
+- Answers are timestamped on the coordinator's monotonic clock, the one clock all players share.
+  A station may also report how long its player took (measured on its own monotonic clock), which
+  takes network delay out of the race; the coordinator keeps that time between the moment the
+  question was sent and the moment the answer arrived.
+- A question is resolved as soon as its result is certain: when every player has answered, or
+  `grace` seconds after the first correct answer arrived (time for answers still on the network
+  to come in; 0 on a single screen). Each answer is O(1), whatever the number of players.
+- A question nobody gets right is resolved `question_seconds` after it was asked, so a player
+  who never answers can't hold up the round; tick() checks that deadline.
+- The players share one coordinator (one screen). The `elapsed` times are there for remote
+  stations, but Trivia_Server has no head-to-head ops yet.
+- Listeners are called with "question", "result" and "round_over" events.
+
+Run `python Round_Coordinator.py --players 100 --rounds 20` for a simulated-player load test.
+"""
+
+import argparse
+import random
+import time
+
+from Game_Engine import (COUNTDOWN_SECONDS, CORRECT_POINTS, INSTRUCTIONS, PLAYING, ROUND_SECONDS, SCOREBOARD,
+                         TIMES_UP, WRONG_PENALTY, ManualClock)
+from Game_Timer import Deadline
+
+NEXT_QUESTION_SECONDS = 1.5  # time the result stays on screen before the next question
+QUESTION_SECONDS = 10  # a question nobody answered correctly is resolved after this long
+
+
+class PlayerScore:
+    """
+    One player's totals in a head-to-head round.
+    """
+
+    __slots__ = ("name", "score", "wins", "wrong")
+
+    def __init__(self, name):
+        self.name = name
+        self.score = 0
+        self.wins = 0  # questions won with the fastest correct answer
+        self.wrong = 0
+
+
+class RoundCoordinator:
+    """
+    Head-to-head round for `players` (a list of names), drawing questions from `draw_question()`.
+    """
+
+    def __init__(self, draw_question, players, clock=time.monotonic, round_seconds=ROUND_SECONDS,
+                 countdown_seconds=COUNTDOWN_SECONDS, grace=0.0, question_seconds=QUESTION_SECONDS):
+        if len(set(players)) != len(players) or not players:
+            raise ValueError("players need distinct names")
+        self.draw_question = draw_question
+        self.player_names = list(players)
+        self.clock = clock
+        self.round_seconds = round_seconds
+        self.countdown_seconds = countdown_seconds
+        self.grace = grace
+        self.question_seconds = question_seconds
+        self.listeners = []
+        self.reset()
+
+    def reset(self):
+        self.state = INSTRUCTIONS
+        self.players = {name: PlayerScore(name) for name in self.player_names}
+        self.questions_asked = 0
+        self.current_question = None
+        self.asked_at = None
+        self.question_deadline = None  # when the current question is resolved at the latest
+        self.answers = {}  # name -> (answer time, correct) for the current question
+        self.fastest = None  # (answer time, name) of the fastest correct answer so far
+        self.first_correct_arrived = None
+        self.resolved = True
+        self.last_result = None
+        self.round_deadline = None
+        self.countdown_deadline = None
+
+    def subscribe(self, listener):
+        """
+        Calls `listener(event)` for every event (a dictionary with a "type").
+        """
+        self.listeners.append(listener)
+
+    def _emit(self, event):
+        for listener in self.listeners:
+            listener(event)
+
+    def start(self):
+        if self.state != INSTRUCTIONS:
+            raise RuntimeError(f"cannot start a round from the {self.state} state")
+        self.state = PLAYING
+        self.round_deadline = Deadline(self.round_seconds, self.clock)
+
+    def next_question(self):
+        """
+        Draws the next question and sends it to every player at the same moment.
+        """
+        if self.tick() != PLAYING:
+            raise RuntimeError("the round is over")
+        if not self.resolved:
+            raise RuntimeError("the current question is not resolved yet")
+        self.current_question = self.draw_question()
+        self.questions_asked += 1
+        self.answers = {}
+        self.fastest = None
+        self.first_correct_arrived = None
+        self.resolved = False
+        self.asked_at = self.clock()
+        self.question_deadline = Deadline(self.question_seconds, self.clock)
+        self._emit({"type": "question", "number": self.questions_asked, "question": self.current_question})
+        return self.current_question
+
+    def answer(self, name, selected_answer, elapsed=None):
+        """
+        Records a player's answer to the current question. `elapsed` is the time the player took,
+        if the station measured it; otherwise the arrival time counts.
+        Returns True/False for a correct/wrong answer, or None if the answer was not accepted
+        (unknown player, second answer, question already resolved or round over).
+        """
+        if self.tick() != PLAYING or self.resolved or name not in self.players or name in self.answers:
+            return None
+        arrived = self.clock()
+        answered_at = arrived if elapsed is None else min(arrived, self.asked_at + max(0.0, elapsed))
+        correct = selected_answer == self.current_question["correct_answer"]
+        self.answers[name] = (answered_at, correct)
+        if correct:
+            if self.first_correct_arrived is None:
+                self.first_correct_arrived = arrived
+            if self.fastest is None or answered_at < self.fastest[0]:
+                self.fastest = (answered_at, name)
+        self._resolve_if_certain(arrived)
+        return correct
+
+    def _resolve_if_certain(self, now):
+        if self.resolved or self.current_question is None:
+            return
+        if len(self.answers) == len(self.players) or self.question_deadline.expired() or (
+                self.first_correct_arrived is not None and now >= self.first_correct_arrived + self.grace):
+            self.resolve()
+
+    def resolve(self):
+        """
+        Scores the current question with the answers received so far and announces the result.
+        """
+        winner = self.fastest[1] if self.fastest is not None else None
+        changes = {}
+        if winner is not None:
+            self.players[winner].score += CORRECT_POINTS
+            self.players[winner].wins += 1
+            changes[winner] = CORRECT_POINTS
+        for name, (_, correct) in self.answers.items():
+            if not correct:
+                player = self.players[name]
+                player.wrong += 1
+                changes[name] = -min(WRONG_PENALTY, player.score)
+                player.score -= min(WRONG_PENALTY, player.score)
+
+        self.resolved = True
+        self.last_result = {
+            "type": "result",
+            "number": self.questions_asked,
+            "winner": winner,
+            "winning_seconds": self.fastest[0] - self.asked_at if winner is not None else None,
+            "correct_answer": self.current_question["correct_answer"],
+            "changes": changes,
+            "scores": {name: player.score for name, player in self.players.items()},
+        }
+        self._emit(self.last_result)
+        return self.last_result
+
+    def standings(self):
+        """
+        Players by score, highest first (more won questions break ties).
+        """
+        return sorted(self.players.values(), key=lambda player: (-player.score, -player.wins))
+
+    def time_left(self):
+        if self.round_deadline is None:
+            return self.round_seconds
+        return self.round_deadline.whole_seconds_left()
+
+    def tick(self):
+        """
+        Moves the round along according to the shared clock: resolves a question whose grace
+        time or answer time ran out, and ends the round at the deadline. Returns the current state.
+        """
+        if self.state == PLAYING:
+            now = self.clock()
+            self._resolve_if_certain(now)
+            if self.round_deadline.expired():
+                if not self.resolved:
+                    self.resolve()
+                self.state = TIMES_UP
+                self.countdown_deadline = Deadline(self.countdown_seconds, self.clock)
+                self._emit({"type": "round_over",
+                            "standings": [(player.name, player.score) for player in self.standings()]})
+        if self.state == TIMES_UP and self.countdown_deadline.expired():
+            self.state = SCOREBOARD
+        return self.state
+
+
+# LOAD TEST
+
+def simulate_match(coordinator, clock, rng, accuracy=0.6, answer_seconds=(1.0, 4.0), jitter=0.0,
+                   next_seconds=NEXT_QUESTION_SECONDS):
+    """
+    Plays one head-to-head round with simulated players on a ManualClock.
+    Each player answers after a random delay and is right with probability `accuracy`; with
+    jitter, answers reach the coordinator up to `jitter` seconds late and report their own time.
+    Returns (seconds spent in answer() calls, answers, questions where the winner was not the
+    truly fastest correct player).
+    """
+    coordinator.reset()
+    coordinator.start()
+    spent = 0.0
+    answers = 0
+    unfair = 0
+    while coordinator.tick() == PLAYING:
+        question = coordinator.next_question()
+        asked_at = clock()
+        wrong = [text for text in question["choices"].values() if text != question["correct_answer"]] or [""]
+        planned = []
+        for name in coordinator.player_names:
+            delay = rng.uniform(*answer_seconds)
+            selected = question["correct_answer"] if rng.random() < accuracy else rng.choice(wrong)
+            planned.append((delay + rng.uniform(0.0, jitter), delay, name, selected))
+        planned.sort()
+        truly_fastest = next((name for _, _, name, selected in sorted(planned, key=lambda plan: plan[1])
+                              if selected == question["correct_answer"]), None)
+
+        for arrival, delay, name, selected in planned:
+            clock.now = max(clock.now, asked_at + arrival)
+            if coordinator.resolved:
+                break
+            started = time.perf_counter()
+            coordinator.answer(name, selected, delay if jitter else None)
+            spent += time.perf_counter() - started
+            answers += 1
+        if not coordinator.resolved:
+            clock.now = max(clock.now, (coordinator.first_correct_arrived or clock.now) + coordinator.grace)
+            coordinator.tick()
+        if coordinator.state == PLAYING and coordinator.last_result["winner"] != truly_fastest:
+            unfair += 1
+        clock.advance(next_seconds)
+    clock.advance(coordinator.countdown_seconds)
+    coordinator.tick()
+    return spent, answers, unfair
+
+
+def main():
+    from Question_Bank import load_bank
+    from Question_Scheduler import QuestionScheduler
+
+    parser = argparse.ArgumentParser(description="Load test head-to-head rounds with simulated players.")
+    parser.add_argument("--players", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--accuracy", type=float, default=0.6)
+    parser.add_argument("--jitter", type=float, default=0.1, help="max network delay of an answer, in seconds")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--source", default="movies")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    bank = load_bank(args.source)
+    scheduler = QuestionScheduler(len(bank), seed=args.seed)
+    clock = ManualClock()
+    coordinator = RoundCoordinator(lambda: bank[scheduler.draw()], [f"Player{n:04d}" for n in range(args.players)],
+                                   clock, grace=args.jitter)
+
+    total_spent = 0.0
+    total_answers = 0
+    total_unfair = 0
+    questions = 0
+    started = time.perf_counter()
+    for _ in range(args.rounds):
+        spent, answers, unfair = simulate_match(coordinator, clock, rng, args.accuracy, jitter=args.jitter)
+        total_spent += spent
+        total_answers += answers
+        total_unfair += unfair
+        questions += coordinator.questions_asked
+    elapsed = time.perf_counter() - started
+
+    best = coordinator.standings()[0]
+    print(f"{args.rounds} rounds x {args.players} players in {elapsed:.2f} s: {questions} questions, "
+          f"{total_answers} answers")
+    print(f"answer() mean {total_spent / max(total_answers, 1) * 1e6:.1f} us, "
+          f"{total_unfair} questions not won by the truly fastest correct player")
+    print(f"last round won by {best.name} with {best.score} points ({best.wins} questions)")
+
+
+if __name__ == "__main__":
+    main()
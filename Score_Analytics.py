@@ -0,0 +1,279 @@
+"""
+Score Analytics for Ultimate Movie Trivia Game
+
+- Reports on the full score history (scoreboard.db) and answer log (question_stats.db):
+  score percentiles, a leaderboard per day and the hardest and easiest questions.
+- Rows are read in chunks straight into NumPy column arrays (no dictionary per row), and every
+  statistic is computed with vectorized operations (sorting, bincount, unique), so the report
+  stays quick with millions of scores and answers.
+- Player names are only looked up for the rows that make it onto a leaderboard.
+- NumPy is only needed for this report, not for the game: pip install numpy
+
+Run `python Score_Analytics.py [--days 7] [--top 3] [--questions 5] [--source movies]`.
+"""
+
+import argparse
+import sqlite3
+import sys
+import time
+
+try:
+    import numpy as np
+except ImportError:  # optional: the game itself runs without it
+    np = None
+
+from Question_Stats import STATS_DB, question_id
+from Score_Store import SCOREBOARD_DB
+
+CHUNK_ROWS = 65536  # rows converted to arrays at a time
+SECONDS_PER_DAY = 86400
+PERCENTILES = (10, 25, 50, 75, 90, 99)
+MIN_ATTEMPTS = 5  # questions answered fewer times are left out of the difficulty ranking
+
+
+def require_numpy():
+    if np is None:
+        raise RuntimeError("Score_Analytics needs NumPy. Install it with: pip install numpy")
+
+
+def read_columns(connection, sql, dtype, parameters=()):
+    """
+    Runs a query and returns its rows as one structured NumPy array of `dtype`,
+    converting CHUNK_ROWS rows at a time.
+    """
+    require_numpy()
+    cursor = connection.execute(sql, parameters)
+    chunks = []
+    while True:
+        rows = cursor.fetchmany(CHUNK_ROWS)
+        if not rows:
+            break
+        chunks.append(np.array(rows, dtype=dtype))
+    return np.concatenate(chunks) if chunks else np.empty(0, dtype=dtype)
+
+
+def connect_read_only(path):
+    return sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+
+
+def load_scores(path=SCOREBOARD_DB):
+    """
+    Returns every score as columns: id, score and played_at (seconds since the epoch).
+    """
+    connection = connect_read_only(path)
+    try:
+        return read_columns(connection, "SELECT id, score, played_at FROM scores",
+                            [("id", "i8"), ("score", "i8"), ("played_at", "f8")])
+    finally:
+        connection.close()
+
+
+def load_answers(path=STATS_DB):
+    """
+    Returns every recorded answer as columns: question_id, correct, seconds and answered_at.
+    """
+    connection = connect_read_only(path)
+    try:
+        return read_columns(connection, "SELECT question_id, correct, seconds, answered_at FROM answers",
+                            [("question_id", "i8"), ("correct", "i1"), ("seconds", "f8"), ("answered_at", "f8")])
+    finally:
+        connection.close()
+
+
+def local_days(timestamps):
+    """
+    Day numbers (days since the epoch, in this machine's time zone) for an array of timestamps, the
+    same as Leaderboards.local_day: each timestamp uses the UTC offset in force at that time, so
+    scores on either side of a daylight saving change land on the right day. The offset is looked
+    up once per distinct UTC day, and per timestamp only on the days it changes.
+    """
+    timestamps = np.asarray(timestamps, dtype=np.float64)
+    utc_days, day_index = np.unique(np.floor_divide(timestamps, SECONDS_PER_DAY), return_inverse=True)
+    day_starts = (utc_days * SECONDS_PER_DAY).tolist()
+    at_start = np.array([time.localtime(start).tm_gmtoff for start in day_starts], dtype=np.float64)
+    at_end = np.array([time.localtime(start + SECONDS_PER_DAY - 1).tm_gmtoff for start in day_starts],
+                      dtype=np.float64)
+    offsets = at_start[day_index]
+    changing = np.flatnonzero((at_start != at_end)[day_index])
+    offsets[changing] = [time.localtime(timestamp).tm_gmtoff for timestamp in timestamps[changing].tolist()]
+    return np.floor_divide(timestamps + offsets, SECONDS_PER_DAY).astype(np.int64)
+
+
+def score_percentiles(scores, percentiles=PERCENTILES):
+    """
+    Returns {percentile: score} over all scores.
+    """
+    if not len(scores):
+        return {}
+    return dict(zip(percentiles, np.percentile(scores["score"], percentiles).tolist()))
+
+
+def daily_summary(scores):
+    """
+    Returns (days, games, mean score, best score), one entry per day that had games.
+    """
+    days = local_days(scores["played_at"])
+    unique_days, day_index, games = np.unique(days, return_inverse=True, return_counts=True)
+    totals = np.bincount(day_index, weights=scores["score"])
+    best = np.full(len(unique_days), np.iinfo(np.int64).min)
+    np.maximum.at(best, day_index, scores["score"])
+    return unique_days, games, totals / games, best
+
+
+def daily_leaderboards(scores, top=3, last_days=None):
+    """
+    Returns {day: [(score id, score), ...]} with each day's `top` scores, highest first
+    (earlier scores win ties), for the `last_days` most recent days (every day when None).
+    """
+    if not len(scores):
+        return {}
+    days = local_days(scores["played_at"])
+    # Sorted by day, then score descending, then id: each day's best scores start its run
+    order = np.lexsort((scores["id"], -scores["score"], days))
+    sorted_days = days[order]
+    starts = np.flatnonzero(np.r_[True, sorted_days[1:] != sorted_days[:-1]])
+    rank = np.arange(len(order)) - np.repeat(starts, np.diff(np.r_[starts, len(order)]))
+    keep = rank < top
+    if last_days is not None:
+        keep &= sorted_days >= sorted_days[starts[-last_days:][0]]
+
+    boards = {}
+    for row in order[keep]:  # only top x days rows, so a Python loop is fine here
+        boards.setdefault(int(days[row]), []).append((int(scores["id"][row]), int(scores["score"][row])))
+    return boards
+
+
+def question_difficulty(answers, min_attempts=MIN_ATTEMPTS):
+    """
+    Returns one row per question answered at least `min_attempts` times, hardest (lowest
+    correct rate) first, with fields question_id, attempts, correct_rate and mean_seconds.
+    """
+    dtype = [("question_id", "i8"), ("attempts", "i8"), ("correct_rate", "f8"), ("mean_seconds", "f8")]
+    if not len(answers):
+        return np.empty(0, dtype=dtype)
+    ids, index, attempts = np.unique(answers["question_id"], return_inverse=True, return_counts=True)
+    correct = np.bincount(index, weights=answers["correct"], minlength=len(ids))
+    seconds = np.bincount(index, weights=answers["seconds"], minlength=len(ids))
+
+    keep = attempts >= min_attempts
+    table = np.empty(int(keep.sum()), dtype=dtype)
+    table["question_id"] = ids[keep]
+    table["attempts"] = attempts[keep]
+    table["correct_rate"] = correct[keep] / attempts[keep]
+    table["mean_seconds"] = seconds[keep] / attempts[keep]
+    return table[np.lexsort((-table["attempts"], table["correct_rate"]))]
+
+
+def player_names(score_ids, path=SCOREBOARD_DB):
+    """
+    Returns {score id: player name} for the given score ids only.
+    """
+    score_ids = list(score_ids)
+    names = {}
+    connection = connect_read_only(path)
+    try:
+        for start in range(0, len(score_ids), 900):  # stay below SQLite's parameter limit
+            batch = score_ids[start:start + 900]
+            placeholders = ",".join("?" * len(batch))
+            names.update(connection.execute(f"SELECT id, name FROM scores WHERE id IN ({placeholders})", batch))
+    finally:
+        connection.close()
+    return names
+
+
+def question_prompts(source, wanted_ids):
+    """
+    Returns {question id: prompt} for the wanted question ids found in the question file `source`.
+    """
+    from Question_Bank import load_bank
+
+    wanted = set(wanted_ids)
+    prompts = {}
+    for question in load_bank(source):
+        qid = question_id(question)
+        if qid in wanted:
+            prompts[qid] = question["prompt"]
+            if len(prompts) == len(wanted):
+                break
+    return prompts
+
+
+def day_label(day):
+    return time.strftime("%Y-%m-%d", time.gmtime(day * SECONDS_PER_DAY))
+
+
+# REPORT
+
+def print_score_report(path, last_days, top):
+    started = time.perf_counter()
+    scores = load_scores(path)
+    loaded = time.perf_counter()
+    if not len(scores):
+        print("No scores yet.")
+        return
+    percentiles = score_percentiles(scores)
+    days, games, mean_scores, best_scores = daily_summary(scores)
+    boards = daily_leaderboards(scores, top, last_days)
+    computed = time.perf_counter()
+    names = player_names((score_id for board in boards.values() for score_id, _ in board), path)
+
+    print(f"{len(scores):,} scores over {len(days):,} days "
+          f"(loaded in {(loaded - started) * 1000:.0f} ms, analyzed in {(computed - loaded) * 1000:.0f} ms)")
+    print("score percentiles: " + ", ".join(f"p{point} {value:g}" for point, value in percentiles.items()))
+    print()
+    for index in range(max(0, len(days) - last_days), len(days)):
+        day = int(days[index])
+        leaders = ", ".join(f"{names.get(score_id, '?')} {score}" for score_id, score in boards.get(day, []))
+        print(f"{day_label(day)}: {games[index]:>6,} games, mean {mean_scores[index]:5.1f}, "
+              f"best {best_scores[index]:>3} | {leaders}")
+
+
+def print_question_report(path, count, source):
+    started = time.perf_counter()
+    answers = load_answers(path)
+    loaded = time.perf_counter()
+    if not len(answers):
+        print("No answers recorded yet.")
+        return
+    table = question_difficulty(answers)
+    computed = time.perf_counter()
+    print(f"{len(answers):,} answers to {len(table):,} questions with at least {MIN_ATTEMPTS} answers "
+          f"(loaded in {(loaded - started) * 1000:.0f} ms, analyzed in {(computed - loaded) * 1000:.0f} ms), "
+          f"overall {answers['correct'].mean() * 100:.1f} % correct")
+    if not len(table):
+        return
+    shown = np.concatenate((table[:count], table[-count:]))["question_id"].tolist()
+    prompts = question_prompts(source, shown) if source else {}
+    for label, rows in (("hardest", table[:count]), ("easiest", table[::-1][:count])):
+        print(f"\n{label}:")
+        for row in rows:
+            prompt = prompts.get(int(row["question_id"]), f"question {int(row['question_id'])}")
+            print(f"  {row['correct_rate'] * 100:5.1f} % of {row['attempts']:>5}, "
+                  f"{row['mean_seconds']:4.1f} s  {prompt[:80]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score and question statistics from the full history.")
+    parser.add_argument("--scores", default=SCOREBOARD_DB, help="scoreboard database")
+    parser.add_argument("--stats", default=STATS_DB, help="question statistics database")
+    parser.add_argument("--days", type=int, default=7, help="days to list, most recent last")
+    parser.add_argument("--top", type=int, default=3, help="scores per daily leaderboard")
+    parser.add_argument("--questions", type=int, default=5, help="hardest and easiest questions to list")
+    parser.add_argument("--source", default="movies", help="question file to show prompts from ('' for ids only)")
+    args = parser.parse_args()
+
+    try:
+        require_numpy()
+    except RuntimeError as error:
+        sys.exit(str(error))
+    for report, path, options in ((print_score_report, args.scores, (args.days, args.top)),
+                                  (print_question_report, args.stats, (args.questions, args.source))):
+        try:
+            report(path, *options)
+        except sqlite3.OperationalError as error:  # missing database or table
+            print(f"{path}: {error}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
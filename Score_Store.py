@@ -0,0 +1,380 @@
+"""
+Score Store for Ultimate Movie Trivia Game
+
+- Keeps every score ever played in a SQLite database (scoreboard.db) instead of rewriting scoreboard.txt.
+- Every write is a single transaction, so a crash never leaves a half written scoreboard, and
+  SQLite's file locking lets several game stations share one database without losing updates.
+- Top-N queries read the score index (highest first) instead of sorting every score.
+- The first time a database is created, the scores from the matching .txt scoreboard are imported.
+- Player names are kept in an in-memory, casefolded set for duplicate checks. It is topped up with
+  new rows when this or another station writes, instead of re-reading the scoreboard per key press.
+- Each score records the question category it was played in. The daily, weekly, per-category and
+  all time leaderboards (see Leaderboards) are built once from score counts grouped by SQLite and
+  then topped up with new rows the same way, so ranking a new score never rescans the history.
+- Scores must be whole numbers from 0 to MAX_SCORE; add() and add_many() refuse anything else with
+  a ValueError before writing, and imported scoreboards skip such lines.
+- Databases from before categories get a category column ('' for their scores) when opened.
+- The database runs in WAL mode, which needs every station on the same machine (WAL uses shared
+  memory). On a network filesystem (NFS, SMB, ...) it falls back to SQLite's rollback journal,
+  which works across machines as far as the filesystem's file locking does.
+"""
+
+import ctypes
+import os
+import sqlite3
+import threading
+import time
+
+from Leaderboards import MAX_SCORE, Leaderboards, week_start
+
+SCOREBOARD_DB = "scoreboard.db"
+BUSY_TIMEOUT = 10  # seconds to wait for another station's write to finish
+NETWORK_FILESYSTEMS = {"nfs", "nfs4", "cifs", "smb", "smbfs", "smb3", "ncpfs", "afs", "9p", "ceph",
+                       "glusterfs", "lustre", "fuse.sshfs", "davfs", "fuse.s3fs"}
+DRIVE_REMOTE = 4  # GetDriveTypeW() of a mapped network drive
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    played_at REAL NOT NULL,
+    category TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS scores_by_score ON scores (score DESC, id);
+"""
+
+# Created after the category column was added to an older database
+INDEXES = """
+CREATE INDEX IF NOT EXISTS scores_by_category ON scores (category, score DESC, id);
+CREATE INDEX IF NOT EXISTS scores_by_time ON scores (played_at);
+"""
+
+
+def check_score(score):
+    """
+    Returns `score` as an int, or raises ValueError when it isn't a whole number from 0 to MAX_SCORE.
+    """
+    if isinstance(score, float) and not score.is_integer():
+        raise ValueError(f"score {score!r} is not a whole number")
+    value = int(score)
+    if not 0 <= value <= MAX_SCORE:
+        raise ValueError(f"score {value} is outside 0..{MAX_SCORE}")
+    return value
+
+
+def read_text_scores(path):
+    """
+    Reads 'name,score' lines from a text scoreboard, skipping invalid lines.
+    Returns an empty list if the file does not exist.
+    """
+    entries = []
+    try:
+        with open(path, "r") as score_file:
+            for line in score_file:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    name, score = line.split(",", 1)
+                    entries.append({"name": name, "score": check_score(int(score))})
+                except ValueError:
+                    continue
+    except FileNotFoundError:
+        pass
+    return entries
+
+
+def on_network_filesystem(path):
+    """
+    Best guess whether `path` is on a network filesystem: the mount type from /proc/mounts on
+    Linux, the drive type on Windows. False when it can't tell.
+    """
+    directory = os.path.dirname(os.path.realpath(path))
+    if os.name == "nt":
+        if directory.startswith("\\\\"):  # \\server\share
+            return True
+        drive = os.path.splitdrive(directory)[0] + "\\"
+        return ctypes.windll.kernel32.GetDriveTypeW(drive) == DRIVE_REMOTE
+    try:
+        with open("/proc/mounts") as mounts:
+            entries = [line.split()[1:3] for line in mounts]
+    except OSError:
+        return False
+    best, fs_type = "", ""
+    for mount_point, mount_type in entries:
+        mount_point = mount_point.replace("\\040", " ")
+        inside = directory == mount_point or directory.startswith(mount_point.rstrip("/") + "/")
+        if inside and len(mount_point) >= len(best):
+            best, fs_type = mount_point, mount_type
+    return fs_type in NETWORK_FILESYSTEMS
+
+
+class ScoreStore:
+    """
+    All scores of one scoreboard database. Safe to share between threads.
+    """
+
+    def __init__(self, path=SCOREBOARD_DB, legacy_path=None):
+        self.path = path
+        is_new = not os.path.exists(path)
+        # Autocommit mode: transactions are opened explicitly with BEGIN IMMEDIATE below
+        self._connection = sqlite3.connect(path, timeout=BUSY_TIMEOUT, isolation_level=None,
+                                           check_same_thread=False)
+        self._lock = threading.Lock()
+        self._names = None  # casefolded player names, built on first name_taken()
+        self._names_max_id = 0  # highest score id already in self._names
+        self._data_version = None  # changes whenever another connection commits
+        self._boards = None  # Leaderboards, built on first use
+        self._boards_max_id = 0  # highest score id already on the boards
+        self._boards_version = None  # data_version the boards were last brought up to date at
+        with self._lock:
+            if on_network_filesystem(path):
+                self._connection.execute("PRAGMA journal_mode=DELETE")  # WAL can't work across machines
+            else:
+                self._connection.execute("PRAGMA journal_mode=WAL")
+                self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.executescript(SCHEMA)
+            self._migrate()
+
+        if is_new and legacy_path:
+            self._import(read_text_scores(legacy_path))
+
+    def _migrate(self):
+        """
+        Adds the category column to a database from before categories, then the indexes that use it.
+        Must be called with self._lock held.
+        """
+        columns = [row[1] for row in self._connection.execute("PRAGMA table_info(scores)")]
+        if "category" not in columns:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                # Checked again with the write lock held: another station may have just done it
+                columns = [row[1] for row in self._connection.execute("PRAGMA table_info(scores)")]
+                if "category" not in columns:
+                    self._connection.execute("ALTER TABLE scores ADD COLUMN category TEXT NOT NULL DEFAULT ''")
+                self._connection.execute("COMMIT")
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+        self._connection.executescript(INDEXES)
+
+    def _write(self, statements):
+        """
+        Runs (sql, parameters) pairs in one transaction. BEGIN IMMEDIATE takes the
+        database write lock up front, so two stations never interleave their writes.
+        """
+        with self._lock:
+            cursor = self._connection.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                for sql, parameters in statements:
+                    cursor.executemany(sql, parameters)
+                cursor.execute("COMMIT")
+            except BaseException:
+                cursor.execute("ROLLBACK")
+                raise
+            if self._names is not None:
+                self._refresh_names()
+            if self._boards is not None:
+                self._refresh_boards()
+
+    def _import(self, entries):
+        """
+        Adds imported scores, unless another station created and filled the database first.
+        """
+        now = time.time()
+        with self._lock:
+            cursor = self._connection.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                if cursor.execute("SELECT COUNT(*) FROM scores").fetchone()[0] == 0:
+                    cursor.executemany("INSERT INTO scores (name, score, played_at) VALUES (?, ?, ?)",
+                                       [(entry["name"], entry["score"], now) for entry in entries])
+                cursor.execute("COMMIT")
+            except BaseException:
+                cursor.execute("ROLLBACK")
+                raise
+            if self._names is not None:
+                self._refresh_names()
+
+    def add(self, name, score, played_at=None, category=""):
+        """
+        Records one score, played in the question `category` (see add_many for valid scores).
+        """
+        self.add_many([{"name": name, "score": score, "played_at": played_at, "category": category}])
+
+    def add_many(self, entries):
+        """
+        Records several scores in a single transaction. Raises ValueError, and writes nothing,
+        when a score isn't a whole number from 0 to MAX_SCORE.
+        """
+        now = time.time()
+        rows = [(entry["name"], check_score(entry["score"]), entry.get("played_at") or now,
+                 entry.get("category") or "") for entry in entries]
+        self._write([("INSERT INTO scores (name, score, played_at, category) VALUES (?, ?, ?, ?)", rows)])
+
+    def replace_all(self, entries):
+        """
+        Replaces every stored score with `entries`, atomically.
+        """
+        now = time.time()
+        rows = [(entry["name"], check_score(entry["score"]), entry.get("played_at") or now,
+                 entry.get("category") or "") for entry in entries]
+        self._names = None  # names can disappear, so rebuild the name set from scratch
+        self._boards = None  # and scores can leave the boards, so rebuild those too
+        self._write([
+            ("DELETE FROM scores", [()]),
+            ("INSERT INTO scores (name, score, played_at, category) VALUES (?, ?, ?, ?)", rows),
+        ])
+
+    def top(self, n=5):
+        """
+        Returns the n best scores, highest first (earlier scores win ties), read from the score index.
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT name, score FROM scores ORDER BY score DESC, id LIMIT ?", (n,)
+            ).fetchall()
+        return [{"name": name, "score": score} for name, score in rows]
+
+    def _refresh_names(self):
+        """
+        Adds names from rows written since the name set was last brought up to date.
+        Must be called with self._lock held.
+        """
+        if self._names is None:
+            self._names = set()
+            self._names_max_id = 0
+        # One read transaction, so both queries and data_version see the same snapshot of the database
+        # (a commit by another station right after it bumps data_version, so it is read next time)
+        self._connection.execute("BEGIN")
+        try:
+            cursor = self._connection.execute("SELECT name FROM scores WHERE id > ?", (self._names_max_id,))
+            self._names.update(name.casefold() for (name,) in cursor)
+            self._names_max_id = self._connection.execute("SELECT MAX(id) FROM scores").fetchone()[0] or 0
+            self._data_version = self._connection.execute("PRAGMA data_version").fetchone()[0]
+        finally:
+            self._connection.execute("COMMIT")
+
+    def preload_names(self):
+        """
+        Builds the name set ahead of time (for example on a worker thread at startup),
+        so the first name check doesn't have to.
+        """
+        with self._lock:
+            if self._names is None:
+                self._refresh_names()
+
+    def name_taken(self, name):
+        """
+        Checks, ignoring case, whether `name` has ever been used on this scoreboard.
+        Only reads the database when it changed since the last check (for example a
+        score saved by another station), and then only the new rows.
+        """
+        with self._lock:
+            data_version = self._connection.execute("PRAGMA data_version").fetchone()[0]
+            if self._names is None or data_version != self._data_version:
+                self._refresh_names()
+            return name.strip().casefold() in self._names
+
+    def _build_boards(self):
+        """
+        Builds the leaderboards from the database: score counts grouped by SQLite (one row per
+        score value, not per score), the best scores from the indexes, and the rows of this week.
+        Must be called with self._lock held, inside a read transaction.
+        """
+        connection = self._connection
+        boards = Leaderboards(since=week_start(time.time()))
+        keep = boards.top_keep
+        self._boards_max_id = connection.execute("SELECT MAX(id) FROM scores").fetchone()[0] or 0
+
+        for score, count in connection.execute("SELECT score, COUNT(*) FROM scores GROUP BY score"):
+            boards.all.add_count(score, count)
+        for score_id, name, score in connection.execute(
+                "SELECT id, name, score FROM scores ORDER BY score DESC, id LIMIT ?", (keep,)):
+            boards.all.offer(score_id, name, score)
+
+        for category, score, count in connection.execute(
+                "SELECT category, score, COUNT(*) FROM scores GROUP BY category, score"):
+            boards.category(category).add_count(score, count)
+        for category, board in boards.categories.items():
+            for score_id, name, score in connection.execute(
+                    "SELECT id, name, score FROM scores WHERE category = ? ORDER BY score DESC, id LIMIT ?",
+                    (category, keep)):
+                board.offer(score_id, name, score)
+
+        for score_id, name, score, played_at in connection.execute(
+                "SELECT id, name, score, played_at FROM scores WHERE played_at >= ? AND id <= ?",
+                (boards.since, self._boards_max_id)):
+            for board in boards.periods(played_at):
+                board.add(score_id, name, score)
+        self._boards = boards
+
+    def _refresh_boards(self):
+        """
+        Builds the leaderboards, or adds the rows written since they were last brought up to date.
+        Must be called with self._lock held.
+        """
+        # One read transaction, so every query and data_version see the same snapshot of the database
+        self._connection.execute("BEGIN")
+        try:
+            if self._boards is None:
+                self._build_boards()
+            else:
+                cursor = self._connection.execute(
+                    "SELECT id, name, score, played_at, category FROM scores WHERE id > ? ORDER BY id",
+                    (self._boards_max_id,))
+                for score_id, name, score, played_at, category in cursor:
+                    self._boards.add(score_id, name, score, played_at, category)
+                    self._boards_max_id = score_id
+            self._boards_version = self._connection.execute("PRAGMA data_version").fetchone()[0]
+        finally:
+            self._connection.execute("COMMIT")
+
+    def preload_boards(self):
+        """
+        Builds the leaderboards ahead of time (for example on a worker thread at startup),
+        so the first scoreboard doesn't have to.
+        """
+        with self._lock:
+            if self._boards is None:
+                self._refresh_boards()
+
+    def standings(self, score, category="", played_at=None, n=5):
+        """
+        Returns the day, week, category and all time boards for a score played at `played_at`
+        (now by default) in `category`: {view: {"top": n best, "rank": rank of `score`, "total": scores}}.
+        Only reads the rows other stations added since the last call.
+        """
+        with self._lock:
+            data_version = self._connection.execute("PRAGMA data_version").fetchone()[0]
+            if self._boards is None or data_version != self._boards_version:
+                self._refresh_boards()
+            return self._boards.standings(score, category, played_at, n)
+
+    def count(self):
+        """
+        Returns how many scores are stored.
+        """
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def open_store(path=SCOREBOARD_DB):
+    """
+    Returns the shared ScoreStore for `path`, opening it on first use.
+    A new database imports the scores of the .txt scoreboard with the same name.
+    """
+    with _stores_lock:
+        if path not in _stores:
+            _stores[path] = ScoreStore(path, legacy_path=os.path.splitext(path)[0] + ".txt")
+        return _stores[path]
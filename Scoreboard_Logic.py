@@ -4,56 +4,72 @@ January 17, 2026
 
 Scoreboard Logic for Ultimate Movie Trivia Game
 
-- Manages reading and writing player scores to a text file.
+- Manages reading and writing player scores (stored in scoreboard.db, see Score_Store).
 - Keeps a list of scores as dictionaries with 'name' and 'score'.
 - Supports loading scores, saving scores, and updating the top 5 scores.
+- Every score is kept; the top 5 are read from the score index.
+- Daily, weekly, per-category and all time leaderboards, with the player's rank on each.
+- Checks whether a player name was already used, against every score ever saved.
 """
 
+from Instrumentation import traced
+from Score_Store import SCOREBOARD_DB, open_store
 
-def load_scores():
+
+def load_scores(path=SCOREBOARD_DB):
+    """
+    Reads the top 5 scores from the scoreboard and returns them as a list of dictionaries.
+    Each dictionary has keys 'name' and 'score'. The first time the scoreboard database is
+    created, the scores in 'scoreboard.txt' are imported into it.
+    """
+    return open_store(path).top(5)
+
+
+def save_scores(scores, path=SCOREBOARD_DB):
+    """
+    Replaces the stored scores with the given list of score dictionaries.
+    The scoreboard is replaced in a single transaction, so it is never half written.
+    """
+    open_store(path).replace_all(scores)
+
+
+@traced("update_scores")
+def update_scores(name, score, path=SCOREBOARD_DB, category=""):
+    """
+    Adds a new score for the given player name (played in the question `category`) to the scoreboard.
+    Returns the updated top 5 scores list.
+    """
+    store = open_store(path)
+    store.add(name, score, category=category)
+    return store.top(5)
+
+
+@traced("leaderboards")
+def leaderboards(score, category="", path=SCOREBOARD_DB):
     """
-    Reads scores from 'scoreboard.txt' and returns them as a list of dictionaries.
-    Each dictionary has keys 'name' and 'score'. Skips invalid lines or if the file
-    does not exist.
+    Returns today's, this week's, the category's and the all time leaderboard for a score that was
+    just saved, as {view: {"top": top 5 list, "rank": the score's rank, "total": scores on the board}}.
     """
-    scores_list = []  # use a separate list
-    try:
-        with open("scoreboard.txt", "r") as score_file:
-            for line in score_file:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    name, score = line.split(",", 1)
-                    scores_list.append({"name": name, "score": int(score)})
-                except ValueError:
-                    continue
-    except FileNotFoundError:
-        pass
-    return scores_list
+    return open_store(path).standings(score, category)
 
 
-def save_scores(scores):
+def name_taken(name, path=SCOREBOARD_DB):
     """
-    Writes the given list of score dictionaries to 'scoreboard.txt'.
-    Each line in the file is formatted as: name,score
+    Returns True if the name (ignoring case and surrounding spaces) is already on the scoreboard.
+    Uses the store's cached name set, so it does not re-read the scoreboard on every call.
     """
-    with open("scoreboard.txt", "w") as score_file:  # Write permission
-        for entry in scores:
-            score_file.write(f"{entry['name']},{entry['score']}\n")
+    return open_store(path).name_taken(name)
 
 
-def update_scores(name, score):
+def preload_names(path=SCOREBOARD_DB):
     """
-    Adds a new score for the given player name and keeps only the top 5 scores.
-    Updates the scoreboard file and returns the updated top scores list.
+    Builds the cached name set used by name_taken(). Safe to call from a worker thread.
     """
-    scores = load_scores()
-    scores.append({"name": name, "score": score})
+    open_store(path).preload_names()
+
 
-    # Sort descending by score
-    scores.sort(key=lambda x: x["score"], reverse=True)
-    # Keep only top 5
-    scores = scores[:5]
-    save_scores(scores)
-    return scores
+def preload_leaderboards(path=SCOREBOARD_DB):
+    """
+    Builds the leaderboards used by leaderboards(). Safe to call from a worker thread.
+    """
+    open_store(path).preload_boards()
@@ -0,0 +1,94 @@
+"""
+Headless Round Simulator for Ultimate Movie Trivia Game
+
+- Plays full rounds against the TriviaEngine with a ManualClock, so no display is needed
+  and a 60 second round takes a fraction of a millisecond.
+- Simulated players answer after a random delay and are right with a given probability.
+- Can submit every final score to a scoreboard database, for load testing the scoreboard.
+
+Usage:
+    python Simulate_Rounds.py --rounds 10000 --accuracy 0.6
+    python Simulate_Rounds.py --rounds 1000 --scoreboard /tmp/scoreboard.db
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from Game_Engine import PLAYING, ManualClock, TriviaEngine
+from Question_Bank import load_bank
+from Question_Scheduler import QuestionScheduler
+
+
+def simulate_round(engine, clock, rng, player_name="Simulated", accuracy=0.6,
+                   answer_seconds=(1.0, 4.0), next_seconds=0.5):
+    """
+    Plays one round from the instructions screen to the scoreboard and returns the final score.
+
+    - accuracy: chance that the simulated player picks the correct answer.
+    - answer_seconds: (min, max) time spent reading a question before answering.
+    - next_seconds: time spent on the feedback before pressing "Next Question".
+    """
+    engine.reset()
+    engine.start(player_name)
+    engine.next_question()
+    while True:
+        clock.advance(rng.uniform(*answer_seconds))
+        if engine.tick() != PLAYING:
+            break
+
+        question = engine.current_question
+        if rng.random() < accuracy:
+            engine.answer(question["correct_answer"])
+        else:
+            wrong = [text for text in question["choices"].values() if text != question["correct_answer"]]
+            engine.answer(rng.choice(wrong) if wrong else "")
+
+        clock.advance(next_seconds)
+        if engine.tick() != PLAYING:
+            break
+        engine.next_question()
+
+    # Let the "Time's Up" countdown run out
+    clock.advance(engine.countdown_seconds)
+    engine.tick()
+    return engine.score
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate trivia rounds without a display.")
+    parser.add_argument("--rounds", type=int, default=1000)
+    parser.add_argument("--accuracy", type=float, default=0.6, help="chance of a correct answer")
+    parser.add_argument("--seed", type=int, default=None, help="make the simulation reproducible")
+    parser.add_argument("--source", default="movies", help="question file")
+    parser.add_argument("--scoreboard", help="submit every score to this scoreboard database")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    bank = load_bank(args.source)
+    scheduler = QuestionScheduler(len(bank), seed=args.seed)
+    clock = ManualClock()
+    engine = TriviaEngine(lambda: bank[scheduler.draw()], clock)
+
+    if args.scoreboard:
+        from Scoreboard_Logic import update_scores
+
+    scores = []
+    questions = 0
+    started = time.perf_counter()
+    for round_number in range(args.rounds):
+        player = f"Player{round_number:06d}"
+        scores.append(simulate_round(engine, clock, rng, player, args.accuracy))
+        questions += engine.questions_asked
+        if args.scoreboard:
+            update_scores(player, engine.score, args.scoreboard)
+    elapsed = time.perf_counter() - started
+
+    print(f"{args.rounds} rounds in {elapsed:.3f} s ({args.rounds / elapsed:,.0f} rounds/s)")
+    print(f"{questions / args.rounds:.1f} questions per round, "
+          f"mean score {statistics.fmean(scores):.1f}, best {max(scores)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Startup Report for Ultimate Movie Trivia Game
+
+- Records how long the game takes to become usable: importing the game modules, the first
+  interactive frame (the instructions screen), and when the questions and the background are ready.
+- Modules that are only needed after the instructions screen (tkmacosx, the question bank, the
+  question screen) are imported with timed_import() on a worker thread, so their cost is reported too.
+- Every step is compared with a budget, so a slow new import or loader is noticed.
+- `python Startup_Report.py` imports the game in a fresh interpreter with `-X importtime`
+  and lists the slowest modules.
+"""
+
+import importlib
+import sys
+import threading
+import time
+
+# Milliseconds since launch by which each step should be done
+BUDGETS_MS = {
+    "imports": 100,  # game modules imported at launch
+    "first_frame": 500,  # instructions screen drawn and usable
+    "questions_ready": 1500,  # the Start button can be pressed
+    "background_ready": 2000,  # background image shown
+}
+
+
+class StartupReport:
+    """
+    Times since `started` (a time.perf_counter() value) at which each startup step finished,
+    plus how long each deferred import took. Steps can be marked from any thread.
+    """
+
+    def __init__(self, started):
+        self.started = started
+        self.marks = {}  # step -> ms since launch
+        self.imports = {}  # module -> ms spent importing it
+        self._lock = threading.Lock()
+
+    def mark(self, step):
+        """
+        Records that `step` finished now. Only the first mark of a step counts.
+        """
+        elapsed = (time.perf_counter() - self.started) * 1000
+        with self._lock:
+            self.marks.setdefault(step, elapsed)
+        return self.marks[step]
+
+    def timed_import(self, module_name):
+        """
+        Imports `module_name` (if it isn't already) and records how long that took.
+        """
+        started = time.perf_counter()
+        module = importlib.import_module(module_name)
+        with self._lock:
+            self.imports.setdefault(module_name, (time.perf_counter() - started) * 1000)
+        return module
+
+    def over_budget(self):
+        """
+        Returns the steps that finished later than their budget.
+        """
+        return [step for step, ms in self.marks.items() if ms > BUDGETS_MS.get(step, float("inf"))]
+
+    def print_report(self, file=sys.stderr):
+        print("Startup (ms since launch)", file=file)
+        for step, ms in sorted(self.marks.items(), key=lambda item: item[1]):
+            budget = BUDGETS_MS.get(step)
+            status = "" if budget is None else f"budget {budget:>5}  {'OK' if ms <= budget else 'OVER BUDGET'}"
+            print(f"  {step:<22}{ms:>8.0f}  {status}", file=file)
+        if self.imports:
+            print("Deferred imports (ms, on a worker thread)", file=file)
+            for module_name, ms in sorted(self.imports.items(), key=lambda item: -item[1]):
+                print(f"  {module_name:<22}{ms:>8.1f}", file=file)
+
+
+# IMPORT TIME OF A FRESH INTERPRETER
+
+def import_times(module_name="TriviaGame"):
+    """
+    Imports `module_name` in a new interpreter with `-X importtime` and returns
+    [(module, self ms, cumulative ms)], slowest cumulative first.
+    """
+    import subprocess  # only needed for this report, not at game startup
+
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module_name}"],
+                            capture_output=True, text=True, check=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us) / 1000, int(cumulative_us) / 1000))
+    rows.sort(key=lambda row: -row[2])
+    return rows
+
+
+if __name__ == "__main__":
+    target = sys.argv[1] if len(sys.argv) > 1 else "TriviaGame"
+    rows = import_times(target)
+    total = next((cumulative for name, _, cumulative in rows if name == target), 0.0)
+    status = "OK" if total <= BUDGETS_MS["imports"] else "OVER BUDGET"
+    print(f"import {target}: {total:.1f} ms (budget {BUDGETS_MS['imports']} ms, {status})")
+    print(f"{'module':<40}{'self ms':>10}{'total ms':>10}")
+    for name, self_ms, cumulative_ms in rows[:20]:
+        print(f"{name:<40}{self_ms:>10.1f}{cumulative_ms:>10.1f}")
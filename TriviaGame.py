@@ -11,17 +11,73 @@ This game features:
 - Scoring: +5 points for correct, -1 point for incorrect
 - 60-second timer to complete as many questions as possible
 - Tracks score in real time and shows the Top 5 leaderboard
+- Today's, this week's, category and all time leaderboards, with the player's rank on each
 - Highlights correct/incorrect answers and provides feedback
 - After the game, shows final scoreboard with options to replay or exit
 """
 
+import time
+
+LAUNCH_TIME = time.perf_counter()  # taken before the other imports, so the startup report includes them
+
+import os
+import queue
+import sys
+import threading
 import tkinter as tk
-from tkmacosx import Button
-import random
-from Reading_Trivia_File import load_trivia
-from Scoreboard_Logic import update_scores, save_scores
-from Scoreboard_Logic import load_scores
-from PIL import Image, ImageTk
+import traceback
+from tkinter import font as tkfont
+from Game_Engine import PLAYING, TriviaEngine, name_problem
+from Game_Timer import GameTimer
+from Trivia_Client import DEFAULT_PORT, LocalBackend, ServerBackend, parse_address
+from Background_Cache import PLACEHOLDER_COLOR, BackgroundLoader
+from Event_Journal import JOURNAL_PATH, EventJournal
+from Startup_Report import BUDGETS_MS, StartupReport
+import Instrumentation
+from Instrumentation import traced
+
+IMPORTS_DONE = time.perf_counter()
+
+# Saves where the player is in the shuffled question order, so replays don't start over
+SCHEDULER_STATE = "scheduler_state.json"
+
+# Wait for a pause in typing this long before validating the player name
+NAME_CHECK_DELAY_MS = 250
+
+# How often the instructions screen checks whether the name check on the worker thread has answered
+NAME_POLL_MS = 30
+
+# Time from launch until the instructions screen is on screen and usable
+FIRST_FRAME_BUDGET_MS = BUDGETS_MS["first_frame"]
+
+# Only needed once the player presses Start, so they are imported on the loader thread
+DEFERRED_IMPORTS = ("tkmacosx", "Question_View", "Question_Pipeline", "Question_Bank", "Question_Scheduler",
+                    "Question_Index", "Question_Stats", "Question_Reload", "Trivia_Categories", "Bank_Export")
+
+# How often the instructions screen checks whether the questions finished loading
+LOADER_POLL_MS = 30
+
+# How often the game checks for a question bank reloaded after the question file was edited
+RELOAD_POLL_MS = 500
+
+# How often the scoreboard checks whether the writer thread has saved the player's score
+JOURNAL_POLL_MS = 20
+
+# Leaderboards shown after a round, left to right (the category board is titled with the category)
+LEADERBOARD_TITLES = {"day": "Today", "week": "This Week", "category": None, "all": "All Time"}
+
+
+def round_category(source, theme=None):
+    """
+    The category a round's score is ranked in: the name of the question source
+    (file, category directory or export), followed by the filters of a themed round.
+    """
+    category = os.path.splitext(os.path.basename(os.path.normpath(source)))[0]
+    if theme:
+        filters = [f"{key} {value}" for key, value in theme.items() if value and key != "keywords"]
+        filters += [f"keyword {keyword}" for keyword in theme.get("keywords") or ()]
+        category += f" ({', '.join(filters)})"
+    return category
 
 
 class TriviaGame:
@@ -33,13 +89,58 @@ class TriviaGame:
     - displaying the final scoreboard
     """
 
-    def __init__(self, master):
+    def __init__(self, master, question_source="movies", fast_start=True, startup_report=False, theme=None,
+                 adaptive=False, server=None, hot_reload=True):
+        self.launch_time = LAUNCH_TIME
+        self.startup = StartupReport(LAUNCH_TIME)
+        self.startup.marks["imports"] = (IMPORTS_DONE - LAUNCH_TIME) * 1000
+        self.print_startup_report = startup_report
         self.master = master
         self.master.title("Trivia Game")
         self.master.attributes("-fullscreen", True)
-        self.player_name = ""
-        self.quiz = load_trivia()
-        self.current_score = 0
+        self.engine = TriviaEngine(lambda: self.pipeline.take())  # scoring, timing and question flow
+
+        # Fast start: the instructions screen comes up first and the questions load behind it.
+        # Otherwise everything is loaded before the first frame, as before.
+        self.questions_ready = False
+        self.load_error = None
+        self.theme = theme  # Question_Index filters for a themed round, e.g. {"decade": 1990}
+        self.adaptive = adaptive  # pick questions to match the player's accuracy (see Question_Stats)
+        self.hot_reload = hot_reload  # pick up edits to the question file while running (see Question_Reload)
+        self.watcher = None
+        self.category = round_category(question_source, theme)  # the category leaderboard scores go on
+
+        # Scoreboard and name checks come from this machine, or from a Trivia_Server at server=(host, port)
+        self.backend = LocalBackend() if server is None else ServerBackend(*server, LocalBackend())
+        if fast_start:
+            self.question_loader = threading.Thread(
+                target=self.load_questions_in_background, args=(question_source,),
+                name="question-loader", daemon=True
+            )
+            self.question_loader.start()
+        else:
+            for module_name in DEFERRED_IMPORTS:
+                self.startup.timed_import(module_name)
+            self.load_questions(question_source)
+            self.questions_ready = True
+            self.startup.mark("questions_ready")
+
+        # Answers, scores and the question order are written by the journal's writer thread, which
+        # also records every answer in the question statistics. Scores and answers it has not saved
+        # yet (after a crash) are saved again when it starts.
+        self.stats = None  # the question statistics recorder, opened by the writer thread (see record_answers)
+        self.journal = EventJournal(JOURNAL_PATH, appliers={
+            "score": self.save_score,
+            "scheduler": self.save_scheduler_state,
+        }, batch_appliers={"answer": self.record_answers}).start()
+
+        # Name checks can wait on the server, so they run on a worker thread (see check_name_entry)
+        self.name_results = queue.Queue()  # (check number, name, taken or the error)
+        self.name_check_seq = 0  # number of the latest name check
+        self.valid_name = None  # the name the latest finished check accepted
+
+        # Load the names used on the scoreboard and its leaderboards while the player reads the instructions
+        threading.Thread(target=self.backend.preload_names, name="name-preload", daemon=True).start()
 
         # Set background inside the class
         self.set_background("movie.jpg")
@@ -50,28 +151,242 @@ class TriviaGame:
 
         # Show instructions and initializes game
         self.show_instructions()
+        if not self.questions_ready:
+            self.master.after(LOADER_POLL_MS, self.poll_question_loader)
+
+        # Runs once the first frame has been drawn and the event loop is free for input
+        self.master.after_idle(self.report_first_frame)
+        self.master.after(RELOAD_POLL_MS, self.poll_question_reload)
+
+    def load_questions_in_background(self, source):
+        """
+        Runs on the loader thread: imports the modules the game screen needs and loads
+        the questions. Nothing here touches Tkinter widgets.
+        """
+        try:
+            for module_name in DEFERRED_IMPORTS:
+                self.startup.timed_import(module_name)
+            self.load_questions(source)
+        except Exception as error:  # whatever went wrong is shown on the loading screen, not lost with the thread
+            if not isinstance(error, (ImportError, OSError, ValueError)):
+                traceback.print_exc()  # a bug rather than a bad question file: keep the details on the console
+            self.load_error = error
+
+    def poll_question_loader(self):
+        """
+        Checks (on the Tkinter thread) whether the questions finished loading. Once they have,
+        the Start button replaces the loading message and the name entered so far is validated.
+        """
+        if self.question_loader.is_alive():
+            self.master.after(LOADER_POLL_MS, self.poll_question_loader)
+            return
+        if self.load_error is not None:
+            self.loading_label.config(text=f"Could not load questions: {self.load_error}")
+            return
+        self.questions_ready = True
+        self.startup.mark("questions_ready")
+        self.maybe_report_startup()
+        self.add_start_button()
+        self.revalidate_start()
+
+    def revalidate_start(self):
+        """
+        Validates the name typed while the questions were loading, now that there is a Start button.
+        """
+        if self.name_entry.get().strip():
+            self.check_name_entry()
+
+    def load_questions(self, source):
+        """
+        Sets up where questions are drawn from.
+
+        - A single question file is compiled into a memory-mapped bank (self.quiz) and
+          drawn through a scheduler, so no question repeats until the whole bank was shown.
+        - For a themed round (self.theme), only the questions the bank's index finds for the
+          theme are drawn; that scheduler is not saved, so the normal order is kept.
+        - In adaptive mode, questions are drawn from the difficulty bucket that matches the
+          player's accuracy so far, using the answer statistics of earlier rounds.
+        - Unless hot_reload is off, a plain single file is watched while the game runs, and
+          edits to it are compiled into a new bank (see poll_question_reload).
+        - A directory exported by Bank_Export is read from its memory-mapped columns, drawn
+          through the scheduler like a bank.
+        - A directory of category files is streamed through a bounded window of
+          parsed questions, sampled across all categories.
+
+        Either way, the question pipeline prepares the next few questions ahead of time.
+        """
+        from Bank_Export import ColumnarBank, is_export
+        from Question_Bank import load_bank
+        from Question_Index import load_index
+        from Question_Pipeline import PREFETCH_DEPTH, QuestionPipeline
+        from Question_Reload import QuestionWatcher
+        from Question_Scheduler import QuestionScheduler
+        from Question_Stats import adaptive_selector, load_stats, running_accuracy
+        from Trivia_Categories import CategoryLibrary, QuestionStream
+
+        watch = False  # only a plain compiled bank is watched for edits
+        if os.path.isdir(source):
+            if self.theme or self.adaptive:
+                raise ValueError("themed and adaptive rounds need a single question file")
+            if is_export(source):
+                self.quiz = ColumnarBank(source)  # memory-mapped columns written by Bank_Export
+                self.scheduler = QuestionScheduler.load(SCHEDULER_STATE, len(self.quiz))
+                self.draw_question = self.draw_scheduled
+            else:
+                self.quiz = QuestionStream(CategoryLibrary(source))
+                self.scheduler = None
+                self.draw_question = self.quiz.draw
+        elif self.theme or self.adaptive:
+            self.quiz = load_bank(source)
+            matches = load_index(self.quiz).search(**self.theme) if self.theme else range(len(self.quiz))
+            if not matches:
+                raise ValueError("no questions match the chosen theme")
+            self.scheduler = None
+            if self.adaptive:
+                selector = adaptive_selector((self.quiz[index] for index in matches), load_stats())
+
+                def pick():
+                    return selector.draw(running_accuracy(self.engine.correct_answers, self.engine.questions_asked))
+            else:
+                pick = QuestionScheduler(len(matches)).draw
+            self.draw_question = lambda: self.quiz[matches[pick()]]
+        else:
+            self.quiz = load_bank(source)  # compiled, memory-mapped question bank
+            self.scheduler = QuestionScheduler.load(SCHEDULER_STATE, len(self.quiz))
+            self.draw_question = self.draw_scheduled
+            watch = self.hot_reload
+        # With a server, plain rounds take questions from it (and from the local source when offline)
+        self.backend.set_question_source(self.draw_question)
+        draw = self.draw_question if self.theme or self.adaptive else self.backend.draw_question
+
+        # Adaptive picks depend on the latest answers, so they are drawn when shown, not ahead
+        self.pipeline = QuestionPipeline(draw, depth=0 if self.adaptive else PREFETCH_DEPTH).start()
+        if watch:
+            # Small fixes are patched into the bank in use, between two draws
+            self.watcher = QuestionWatcher(source, self.quiz, lock=self.pipeline.lock).start()
+
+    def draw_scheduled(self):
+        """
+        Draws the scheduler's next question. It is marked, so the saved question order can
+        give it back if it was prefetched but never shown (see scheduler_state).
+        """
+        question = self.quiz[self.scheduler.draw()]
+        question["scheduled"] = True
+        return question
 
+    def scheduler_state(self):
+        """
+        The scheduler state to save: questions the pipeline drew ahead but didn't show are
+        left out, so the next session shows them instead of skipping them.
+        """
+        with self.pipeline.lock:  # the prefetch thread draws from the scheduler too
+            unshown = sum(1 for question in self.pipeline.unshown() if question.get("scheduled"))
+            return self.scheduler.state(rewind=unshown)
+
+    def save_score(self, event):
+        """
+        Journal applier (runs on the writer thread): saves a score and returns its leaderboards.
+        """
+        category = event.get("category", "")
+        self.backend.update_scores(event["name"], event["score"], category)
+        return self.backend.leaderboards(event["score"], category)
+
+    def save_scheduler_state(self, event):
+        """
+        Journal applier (runs on the writer thread): saves the question order for the next round.
+        """
+        from Question_Scheduler import save_state
+
+        save_state(event["state"], SCHEDULER_STATE)
+
+    def record_answers(self, events):
+        """
+        Journal batch applier (runs on the writer thread): adds answers to the question statistics.
+        """
+        if self.stats is None:
+            from Question_Stats import StatsRecorder
+
+            self.stats = StatsRecorder()
+        self.stats.apply(events)
+
+    def poll_question_reload(self):
+        """
+        Swaps in the question bank the watcher rebuilt after the question file was edited.
+        The swap happens under the pipeline lock, so it falls between two draws; questions
+        already prepared by the pipeline are still shown.
+        """
+        reloaded = self.watcher.take() if self.watcher is not None else None
+        if reloaded is not None:
+            from Question_Scheduler import QuestionScheduler
+
+            bank, reparsed = reloaded
+            with self.pipeline.lock:
+                old_bank, self.quiz = self.quiz, bank
+                if bank.source_sha256 != old_bank.source_sha256:
+                    # The scheduler's order is for the old questions (their positions may have moved
+                    # even when the count didn't), so start a new order. Questions the pipeline drew
+                    # from the old order aren't part of the new one, so saving it must not rewind for them.
+                    self.scheduler = QuestionScheduler(len(bank))
+                    for question in self.pipeline.unshown():
+                        question.pop("scheduled", None)
+                old_bank.close()
+            Instrumentation.count("questions.reloaded")
+            print(f"Reloaded {len(bank)} questions ({reparsed} changed)", file=sys.stderr)
+        self.master.after(RELOAD_POLL_MS, self.poll_question_reload)
+
+    @traced("set_background")
     def set_background(self, image_path):
         """
         Sets a background image for the game window.
-        The image is resized to fill the entire screen and attached to a Label
-        that sits behind all other widgets.
+        A plain placeholder background is shown right away while the image, resized to fill
+        the entire screen, is prepared on a worker thread (or read from the cache of
+        pre-scaled backgrounds). The Label sits behind all other widgets.
         """
         self.master.update_idletasks()  # Ensures window and widget sizes are updated before using them
-        self.bg_image = Image.open(image_path)
 
-        # Resize to window size
-        self.bg_image = self.bg_image.resize(
-            (self.master.winfo_screenwidth(), self.master.winfo_screenheight())
-        )
+        # Placeholder until the scaled image is ready
+        self.bg_label = tk.Label(self.master, bg=PLACEHOLDER_COLOR)
+        self.bg_label.place(x=0, y=0, relwidth=1, relheight=1)
 
+        screen_size = (self.master.winfo_screenwidth(), self.master.winfo_screenheight())
+        self.bg_loader = BackgroundLoader(self.master, image_path, screen_size, self.show_background)
+        self.bg_loader.start()
+
+    @traced("show_background")
+    def show_background(self, cached_path):
+        """
+        Puts the pre-scaled background image (a PPM file Tkinter reads directly) on the background label.
+        """
         # Convert the image to a Tkinter-compatible image
-        self.bg_photo = ImageTk.PhotoImage(self.bg_image)
-        self.bg_label = tk.Label(self.master, image=self.bg_photo)
-        self.bg_label.place(x=0, y=0, relwidth=1, relheight=1)
+        self.bg_photo = tk.PhotoImage(file=cached_path)
+        self.bg_label.config(image=self.bg_photo)
 
         # Keep a reference of the image
         self.bg_label.image = self.bg_photo
+        self.startup.mark("background_ready")
+        self.maybe_report_startup()
+
+    def report_first_frame(self):
+        """
+        Records the time from launch to the first interactive frame and warns if it is over budget.
+        """
+        self.first_frame_ms = self.startup.mark("first_frame")
+        Instrumentation.record("first_frame", self.first_frame_ms)
+        status = "OK" if self.first_frame_ms <= FIRST_FRAME_BUDGET_MS else "OVER BUDGET"
+        print(f"Time to first interactive frame: {self.first_frame_ms:.0f} ms "
+              f"(budget {FIRST_FRAME_BUDGET_MS} ms, {status})", file=sys.stderr)
+        self.maybe_report_startup()
+
+    def maybe_report_startup(self):
+        """
+        Prints the startup report (when asked for) once the first frame, the questions
+        and the background are all ready.
+        """
+        if not self.print_startup_report:
+            return
+        if all(step in self.startup.marks for step in ("first_frame", "questions_ready", "background_ready")):
+            self.print_startup_report = False  # only once
+            self.startup.print_report()
 
     def show_instructions(self):
         """
@@ -83,6 +398,7 @@ class TriviaGame:
         # Use this to clear any existing widgets in the ui_frame
         for widget in self.ui_frame.winfo_children():
             widget.destroy()
+        self.engine.reset()
 
         # TITLE LABEL
         title_label = tk.Label(
@@ -131,6 +447,34 @@ class TriviaGame:
         )
         self.name_warning.pack(pady=(0, 20))
 
+        # LOADING LABEL (SHOWN WHERE THE START BUTTON GOES UNTIL THE QUESTIONS ARE READY)
+        self.loading_label = tk.Label(
+            self.ui_frame,
+            text="Loading questions...",
+            font=("Helvetica", 14, "italic"),
+            fg="gray",
+            bg=self.ui_frame["bg"]
+        )
+        self.start_button = None
+        if self.questions_ready:
+            self.add_start_button()
+        else:
+            self.loading_label.pack(pady=40)
+
+        # Run check_name_entry once the user pauses typing in the name entry box
+        self.name_check_id = None
+        self.valid_name = None
+        self.name_entry.bind("<KeyRelease>", self.schedule_name_check)
+
+    def add_start_button(self):
+        """
+        Adds the Start button to the instructions screen (disabled until the name is valid).
+        tkmacosx is imported here rather than at launch; by now the loader thread has imported it.
+        """
+        from tkmacosx import Button
+
+        self.loading_label.destroy()
+
         # START BUTTON (INITIALLY DISABLED)
         self.start_button = Button(
             self.ui_frame,
@@ -147,37 +491,81 @@ class TriviaGame:
         )
         self.start_button.pack(pady=40)
 
-        # Run check_name_entry every time the user types or releases a key in the name entry box
-        self.name_entry.bind("<KeyRelease>", self.check_name_entry)
+    def schedule_name_check(self, event=None):
+        """
+        Debounces name validation: every key release pushes the check back, so it
+        runs once, NAME_CHECK_DELAY_MS after the player stops typing.
+        """
+        if self.name_check_id is not None:
+            self.master.after_cancel(self.name_check_id)
+        self.name_check_id = self.master.after(NAME_CHECK_DELAY_MS, self.check_name_entry)
 
     def check_name_entry(self, event=None):
         """
         Checks the player's name entry for validity.
 
         - Ensures the name is at least 5 characters and no more than 15.
-        - Checks that the name isn't already in the scoreboard.
-        - Displays a warning if invalid and disables the Start button.
-        - Enables the Start button if the name is valid.
+        - Checks that the name isn't already in the scoreboard. That check can wait on the
+          server, so it runs on a worker thread and show_name_check() gets its answer.
+        - The Start button stays disabled until the check has accepted the name.
         """
+        self.name_check_id = None
         name = self.name_entry.get().strip()  # removes a space from the beginning or end of the entry
-        scores_list = load_scores()  # loads the existing entries from the scoreboard
+        self.valid_name = None
+        self.name_check_seq += 1
+        if self.start_button is not None:
+            self.start_button.config(state="disabled")
 
-        # Check to see if the name is unique
-        name_taken = any(entry['name'].lower() == name.lower() for entry in scores_list)
+        # Validate name length here, uniqueness on the worker thread
+        warning = name_problem(name)
+        if warning:
+            self.name_warning.config(text=warning)
+            return
+        threading.Thread(target=self.look_up_name, args=(self.name_check_seq, name),
+                         name="name-check", daemon=True).start()
+        self.master.after(NAME_POLL_MS, self.poll_name_check, self.name_check_seq)
 
-        # Validate name length and uniqueness (enables start button once all conditions are met)
-        if len(name) < 5:
-            self.name_warning.config(text="Name must be at least 5 characters.")
-            self.start_button.config(state="disabled")
-        elif len(name) > 15:
-            self.name_warning.config(text="Name cannot exceed 15 characters.")
-            self.start_button.config(state="disabled")
-        elif name_taken:
-            self.name_warning.config(text="This name already exists. Choose another.")
-            self.start_button.config(state="disabled")
+    def look_up_name(self, seq, name):
+        """
+        Runs on a worker thread: asks the backend whether the name is taken.
+        """
+        try:
+            taken = self.backend.name_taken(name)
+        except Exception as error:  # shown as the name warning
+            taken = error
+        self.name_results.put((seq, name, taken))
+
+    def poll_name_check(self, seq):
+        """
+        Waits (on the Tkinter thread) for the answer of name check `seq`. Answers to older
+        checks are thrown away; a newer check polls for its own answer.
+        """
+        if seq != self.name_check_seq:
+            return
+        while True:
+            try:
+                answered_seq, name, taken = self.name_results.get_nowait()
+            except queue.Empty:
+                break
+            if answered_seq == seq:
+                self.show_name_check(name, taken)
+                return
+        self.master.after(NAME_POLL_MS, self.poll_name_check, seq)
+
+    def show_name_check(self, name, taken):
+        """
+        Shows the result of the uniqueness check and enables the Start button if the name is valid.
+        """
+        if not self.name_warning.winfo_exists():  # the instructions screen is gone
+            return
+        if isinstance(taken, Exception):
+            warning = f"Could not check the name: {taken}"
         else:
-            self.name_warning.config(text="")  # clear the warning label
-            self.start_button.config(state="normal")
+            warning = name_problem(name, taken)
+        self.name_warning.config(text=warning)
+        self.valid_name = None if warning else name
+        if self.start_button is not None:  # otherwise questions still loading
+            self.start_button.config(state="disabled" if warning else "normal")
 
     def start_game(self):
         """
@@ -186,167 +574,131 @@ class TriviaGame:
         and ends the game when time runs out, disabling unanswered buttons.
         """
 
+        # Check again if Start was clicked before a pending debounced check ran or the name
+        # was changed after the last check; Start is enabled again once the check passes
+        if self.name_check_id is not None or self.valid_name != self.name_entry.get().strip():
+            if self.name_check_id is not None:
+                self.master.after_cancel(self.name_check_id)
+            self.check_name_entry()
+            return
+
         # If for some reason validation doesn't work, username will be "Unknown Player"
-        self.player_name = self.name_entry.get().strip()
-        if not self.player_name:
-            self.player_name = "Unknown Player"
+        self.engine.start(self.name_entry.get())
+        Instrumentation.begin_round(player=self.engine.player_name)
+
+        # Clear the instructions
+        for widget in self.ui_frame.winfo_children():
+            widget.destroy()
 
         # SCORE LABEL
         self.score_label = tk.Label(self.ui_frame,
-                                    text=f"Score: {self.current_score}",
+                                    text=f"Score: {self.engine.score}",
                                     font=("Helvetica", 16, "bold"),
                                     fg="green", bg=self.ui_frame["bg"])
         self.score_label.pack(pady=10)
 
         # TIMER LABEL
-        self.time_left = 60  # seconds
         self.timer_label = tk.Label(
             self.ui_frame,
-            text=f"Time Left: {self.time_left} s",
+            text=f"Time Left: {self.engine.time_left()} s",
             font=("Helvetica", 16, "bold"),
             fg="red", bg=self.ui_frame["bg"]
         )
         self.timer_label.pack(pady=10)
 
-        def update_timer():
+        def update_timer(seconds_left):
+            """
+            Updates the timer label with the whole seconds the round has left.
+            Called by the round timer each time the displayed second changes.
+            """
+            self.timer_label.config(text=f"Time Left: {seconds_left} s")
+
+        def end_round():
             """
-            Decreases the game timer by one second every second, updates the timer label,
-            and checks if time has run out. If time reaches zero, disables any unanswered
+            Called once the round deadline passes: disables any unanswered
             answer buttons and calls the times_up() function to end the round.
             """
-            if self.time_left > 0:
-                self.time_left -= 1
-                self.timer_label.config(text=f"Time Left: {self.time_left} s")
-                self.master.after(1000, update_timer)  # Recursively calls itself
-            else:
-                # Time's up: disable buttons if they haven't clicked
-                for b in self.answer_buttons:
-                    if b['state'] == "normal":
-                        b.config(state="disabled")
-                self.times_up()
-
-        # Start the timer countdown
-        update_timer()
+            self.engine.tick()
+            self.question_view.disable_answers()
+            self.times_up()
+
+        # Show the first question and start the timer countdown
+        self.question_gaps = []  # seconds from each "Next Question" press to the next question on screen
+        self.question_view = None
         self.get_question()
+        self.round_timer = GameTimer(self.master, self.engine.round_deadline, update_timer, end_round,
+                                     name="round_timer")
+        self.round_timer.start()
 
+    @traced("get_question")
     def get_question(self):
         """
         Loads and displays a new trivia question on the game screen.
-        Clears previous question widgets while keeping the timer and score visible.
-
-        - Picks a random question from the quiz list.
-        - Displays the question prompt in a label.
-        - Creates buttons for each possible answer.
-        - Handles clicks on answer buttons:
-            * Correct answers add 5 points and turn the button green.
-            * Incorrect answers subtract 1 point, turn the clicked button red,
-              and highlight the correct answer in green.
-        - Displays a "Result" label to show whether the player's choice was correct.
-        - Provides a "Next Question" button to load the next question.
+        The question widgets are created once per round (see QuestionView) and only
+        updated here, while the timer and score stay visible.
+
+        - Takes the next question from the question pipeline, which already picked it
+          (no repeats until all were shown) and prepared its text while the player read the feedback.
+        - Displays the question prompt and one button for each possible answer.
+        - Resets the "Result" label and hides the "Next Question" button until an answer is picked.
+        - Measures the gap from "Next Question" until the new question is drawn.
         """
+        started = time.perf_counter()
+        # Pick the next question (nothing to do once the round is over)
+        if self.engine.tick() != PLAYING:
+            return
+        question = self.engine.next_question()
+
+        # QUESTION VIEW (built on the first question of the round, reused afterwards)
+        first_question = self.question_view is None
+        if first_question:
+            from Question_View import QuestionView  # imported by the loader thread at startup
+            self.question_view = QuestionView(self.ui_frame, self.handle_click, self.get_question)
+            # Prompts are wrapped ahead of time with the question label's own font
+            self.prompt_font = tkfont.Font(font=self.question_view.question_label.cget("font"))
+            self.pipeline.measure = self.prompt_font.measure
+        self.question_view.show(question)
+        self.question_shown_at = time.perf_counter()
+        if not first_question:
+            # Idle callbacks run after Tk has redrawn the updated widgets
+            self.master.after_idle(self.record_question_gap, started)
+
+    def record_question_gap(self, started):
+        """
+        Records the time from a "Next Question" press until the next question was on screen.
+        """
+        gap = time.perf_counter() - started
+        self.question_gaps.append(gap)
+        Instrumentation.record("question_gap", gap * 1000)
 
-        # Clear previous widgets except the score and time label
-        for widget in self.ui_frame.winfo_children():
-            if widget != self.timer_label and widget != self.score_label and widget != self.bg_label:  # keep the timer
-                widget.destroy()
-
-        # Pick a random question
-        self.current_question = random.choice(self.quiz)
-
-        # QUESTION LABEL
-        self.question_label = tk.Label(
-            self.ui_frame,
-            text=self.current_question["prompt"],
-            font=("Helvetica", 18, "bold"),
-            wraplength=750,
-            justify="center",
-            fg="black",
-            bg=self.ui_frame["bg"]
-        )
-        self.question_label.pack(pady=30)
-
-        # Gets potential answers and the correct answer
-        num_choices = self.current_question["choices"]
-        correct_answer = self.current_question["correct_answer"]
-
-        # List for each potential answer button
-        self.answer_buttons = []
-
-        # Create buttons and pass the button object and answer correctly
-        for letter, answer_text in num_choices.items():
-            btn = Button(
-                self.ui_frame,
-                text=f"{letter}: {answer_text}",
-                width=1000,
-                height=70,
-                fg="black",
-                font=("Helvetica", 16),
-                padx=20, pady=20,
-                bg=self.ui_frame["bg"]
-            )
-            btn.pack(pady=5, padx=20)
-
-            # Capture both button and answer_text in lambda
-            btn.config(command=lambda b=btn, a=answer_text: handle_click(a, b))
-
-            self.answer_buttons.append(btn)
-
-        # RESULT LABEL
-        self.result_label = tk.Label(
-            self.ui_frame,
-            text="Result:",
-            font=("Helvetica", 16, "bold"),
-            fg="blue",
-            bg=self.ui_frame["bg"]
-        )
-        self.result_label.pack(pady=30)
+    @traced("handle_click")
+    def handle_click(self, selected_answer, button):
+        """
+        Handles the user's answer selection.
 
-        def handle_click(selected_answer, button):
-            """
-            Handles the user's answer selection.
+        Disables all answer buttons once one is clicked, checks if the selected answer
+        is correct, updates the score accordingly (+5 for correct, -1 for incorrect),
+        changes button colors to indicate correct (green) or incorrect (red) answers,
+        updates the result label to show feedback, and shows the "Next Question" button
+        to proceed to the next trivia question.
+        """
+        if self.engine.tick() != PLAYING:
+            return
+        correct = self.engine.answer(selected_answer)
+        answer_seconds = time.perf_counter() - self.question_shown_at
+        from Question_Stats import answer_event  # imported by the loader thread at startup
 
-            Disables all answer buttons once one is clicked, checks if the selected answer
-            is correct, updates the score accordingly (+5 for correct, -1 for incorrect),
-            changes button colors to indicate correct (green) or incorrect (red) answers,
-            updates the result label to show feedback, and creates a "Next Question" button
-            to proceed to the next trivia question.
-            """
+        self.journal.append("answer", **answer_event(self.engine.current_question, correct, answer_seconds,
+                                                     self.engine.player_name, selected_answer))
+        Instrumentation.record("answer_latency", answer_seconds * 1000)
+        Instrumentation.count("answers.correct" if correct else "answers.wrong")
+        self.score_label.config(text=f"Score: {self.engine.score}")
 
-            # Disable all buttons once they select one
-            for b in self.answer_buttons:
-                b.config(state="disabled")
+        # Correct/Incorrect coloring and label updating
+        self.question_view.show_result(button, correct, self.engine.current_question["correct_answer"])
 
-            # Correct/Incorrect coloring and label updating
-            if selected_answer == correct_answer:
-                self.current_score += 5
-                self.score_label.config(text=f"Score: {self.current_score}")
-                self.result_label.config(text="Correct!", bg=self.ui_frame["bg"])
-                button.config(bg="#4CAF50")  # Green for correct
-            else:
-                # Red for wrong
-                button.config(bg="#F44336")
-                if self.current_score > 0:
-                    self.current_score -= 1
-                    self.score_label.config(text=f"Score: {self.current_score}")
-                    self.result_label.config(text=f"Incorrect! The answer was {correct_answer}", fg="#F44336",
-                                             bg=self.ui_frame["bg"])
-                # Pairs each button with it's corresponding answer
-                for b, text in zip(self.answer_buttons, num_choices.values()):
-                    # Highlights the correct answer in green
-                    if text == correct_answer:
-                        b.config(bg="#4CAF50")
-
-            # NEXT BUTTON
-            next_btn = Button(
-                self.ui_frame,
-                text="Next Question",
-                width=600,
-                height=60,
-                font=("Helvetica", 14),
-                padx=10, bg=self.ui_frame["bg"]
-            )
-            next_btn.pack(pady=20)
-            next_btn.config(command=self.get_question)  # Generate new question when they click next
+        # While the player reads the feedback, wrap the prompts of the upcoming questions
+        self.master.after_idle(self.pipeline.wrap_ready)
 
     def times_up(self):
         """
@@ -358,6 +710,7 @@ class TriviaGame:
         # Clear question and answers
         for widget in self.ui_frame.winfo_children():
             widget.destroy()
+        self.question_view = None
 
         # COUNTDOWN LABEL
         countdown_label = tk.Label(
@@ -371,25 +724,34 @@ class TriviaGame:
         countdown_label.pack(pady=(20, 10))
 
         # Countdown function
-        def countdown(n):
+        def countdown(seconds_left):
             """
-            Recursively updates the countdown label each second, decreasing `n` by 1.
-            When `n` reaches 0, it calls `display_score_board()` to show the final scores.
-            Uses `self.master.after(1000, ...)` to schedule the next update after 1 second.
+            Updates the countdown label each time the displayed second changes.
+            When the countdown deadline passes, the timer calls `display_score_board()`
+            to show the final scores.
             """
-            if n > 0:
-                countdown_label.config(text=f"Time's Up! Showing scoreboard in {n}...")
-                self.master.after(1000, countdown, n - 1)
-            else:
-                self.display_score_board()
+            countdown_label.config(text=f"Time's Up! Showing scoreboard in {seconds_left}...")
+
+        # Start the 3 second countdown
+        self.countdown_timer = GameTimer(self.master, self.engine.countdown_deadline, countdown,
+                                         self.display_score_board, name="countdown_timer")
+        self.countdown_timer.start()
 
-        # Start countdown from 3
-        countdown(3)
+    def when_applied(self, seq, callback):
+        """
+        Calls callback(result) on the Tkinter thread once the journal has applied event `seq`.
+        """
+        done, result = self.journal.take_result(seq)
+        if done:
+            callback(result)
+        else:
+            self.master.after(JOURNAL_POLL_MS, self.when_applied, seq, callback)
 
     def display_score_board(self):
         """
         Displays the scoreboard after the game ends. Clears the previous widgets, shows the
-        player's score, checks if they made the top 5, displays the top scores, and adds a
+        player's score, checks if they made the top 5, displays today's, this week's, the
+        category's and the all time top scores with the player's rank on each, and adds a
         'Back to Start' button to return to the instructions. Applies consistent styling
         with colors, fonts, and spacing for clarity.
         """
@@ -408,14 +770,22 @@ class TriviaGame:
         )
         title.pack(pady=(10, 20))
 
-        # Update scores and load the top scores
-        update_scores(self.player_name, self.current_score)
-        scores_list = load_scores()  # already sorted top 5
+        # The journal's writer thread saves the score (to the server when there is one) and
+        # the question order; the leaderboards are filled in once the score is saved
+        score_seq = self.journal.append("score", name=self.engine.player_name, score=self.engine.score,
+                                        category=self.category)
+        if self.scheduler is not None:  # next round continues the question order
+            self.journal.append("scheduler", state=self.scheduler_state())
+        gaps = sorted(self.question_gaps)
+        gap_p50_ms = round(Instrumentation.percentile(gaps, 0.5) * 1000, 3) if gaps else None
+        Instrumentation.end_round(score=self.engine.score, questions=self.engine.questions_asked,
+                                  max_timer_lag_ms=round(self.round_timer.max_lag() * 1000, 3),
+                                  question_gap_p50_ms=gap_p50_ms)
 
         # PLAYER SCORE LABEL
         player_score = tk.Label(
             self.ui_frame,
-            text=f'Your Score: {self.player_name} - {self.current_score}',
+            text=f'Your Score: {self.engine.player_name} - {self.engine.score}',
             font=("Helvetica", 24, "bold"),
             fg="#1976D2",  # nice blue
             bg=self.ui_frame["bg"],
@@ -423,17 +793,10 @@ class TriviaGame:
         )
         player_score.pack(pady=(0, 15))
 
-        # Check if player made the top scores
-        made_top = any(
-            entry['name'] == self.player_name and entry['score'] == self.current_score for entry in scores_list
-        )
-
-        message_text = "You made the Top 5!" if made_top else "You did not make the Top 5."
-
         # MADE IT? MESSAGE LABEL
         top_msg = tk.Label(
             self.ui_frame,
-            text=message_text,
+            text="Saving your score...",
             font=("Helvetica", 20, "italic"),
             fg="#E65100",  # deep orange
             bg=self.ui_frame["bg"],
@@ -441,18 +804,67 @@ class TriviaGame:
         )
         top_msg.pack(pady=(0, 50))
 
-        # Show top scores
-        for entry in scores_list:
-            # MAKE A LABEL FOR EAH TOP SCORE
-            score_label = tk.Label(
-                self.ui_frame,
-                text=f"{entry['name']} - {entry['score']}",
-                font=("Helvetica", 18),
-                fg="#424242",
-                bg=self.ui_frame["bg"],
-                pady=5
+        # TOP SCORES FRAME (FILLED IN ONCE THE SCORE IS SAVED)
+        scores_frame = tk.Frame(self.ui_frame, bg=self.ui_frame["bg"])
+        scores_frame.pack()
+
+        def show_top_scores(boards):
+            """
+            Shows whether the player made the all time Top 5, then one column per leaderboard
+            with its Top 5 and the player's rank on it.
+            """
+            if not top_msg.winfo_exists():  # the player already left the scoreboard
+                return
+            if isinstance(boards, Exception):
+                top_msg.config(text="The scoreboard can't be reached right now.")
+                return
+
+            # Check if player made the top scores
+            made_top = any(
+                entry['name'] == self.engine.player_name and entry['score'] == self.engine.score
+                for entry in boards["all"]["top"]
             )
-            score_label.pack()
+            top_msg.config(text="You made the Top 5!" if made_top else "You did not make the Top 5.")
+
+            # Show each leaderboard in its own column
+            for column, (view, title) in enumerate(LEADERBOARD_TITLES.items()):
+                board = boards[view]
+
+                # LEADERBOARD TITLE LABEL
+                board_title = tk.Label(
+                    scores_frame,
+                    text=title or self.category,
+                    font=("Helvetica", 18, "bold"),
+                    fg="#212121",
+                    bg=self.ui_frame["bg"],
+                    padx=20
+                )
+                board_title.grid(row=0, column=column)
+
+                # PLAYER RANK LABEL
+                rank_label = tk.Label(
+                    scores_frame,
+                    text=f"You: #{board['rank']:,} of {board['total']:,}",
+                    font=("Helvetica", 14, "italic"),
+                    fg="#1976D2",
+                    bg=self.ui_frame["bg"],
+                    pady=5
+                )
+                rank_label.grid(row=1, column=column)
+
+                for row, entry in enumerate(board["top"], start=2):
+                    # MAKE A LABEL FOR EACH TOP SCORE
+                    score_label = tk.Label(
+                        scores_frame,
+                        text=f"{entry['name']} - {entry['score']}",
+                        font=("Helvetica", 16),
+                        fg="#424242",
+                        bg=self.ui_frame["bg"],
+                        pady=3
+                    )
+                    score_label.grid(row=row, column=column)
+
+        self.when_applied(score_seq, show_top_scores)
 
         # BACK BUTTON
         back_btn = tk.Button(
@@ -487,8 +899,34 @@ class TriviaGame:
 Starts the Trivia Game application by creating the main Tkinter window,
 initializing the TriviaGame class with that window, and starting the
 Tkinter event loop so the GUI runs and responds to user interactions.
+An optional argument picks the question file or a directory of category files.
 """
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Ultimate Movie Trivia Game")
+    parser.add_argument("source", nargs="?", default="movies", help="question file or directory of category files")
+    parser.add_argument("--no-fast-start", dest="fast_start", action="store_false",
+                        help="load everything before showing the instructions")
+    parser.add_argument("--startup-report", action="store_true",
+                        help="print import and time-to-interactive times against their budgets")
+    themes = parser.add_argument_group("themed round (only questions matching all filters)")
+    themes.add_argument("--keyword", action="append", default=[], help="word the question must contain")
+    themes.add_argument("--year", type=int, help="year the question is about")
+    themes.add_argument("--decade", type=int, help="first year of a decade, e.g. 1990")
+    themes.add_argument("--answer", help="correct answer title")
+    parser.add_argument("--server", metavar="HOST[:PORT]",
+                        help="use the questions and global scoreboard of a Trivia_Server (local files when offline)")
+    parser.add_argument("--adaptive", action="store_true",
+                        help="match question difficulty to the player's accuracy during the round")
+    parser.add_argument("--no-hot-reload", dest="hot_reload", action="store_false",
+                        help="don't pick up edits to the question file while the game runs")
+    args = parser.parse_args()
+    theme = {"keywords": args.keyword, "year": args.year, "decade": args.decade, "answer": args.answer}
+
     window = tk.Tk()
-    game = TriviaGame(window)
+    game = TriviaGame(window, args.source, fast_start=args.fast_start, startup_report=args.startup_report,
+                      theme=theme if any(theme.values()) else None, adaptive=args.adaptive,
+                      server=parse_address(args.server, DEFAULT_PORT) if args.server else None,
+                      hot_reload=args.hot_reload)
     window.mainloop()
@@ -0,0 +1,197 @@
+"""
+Multi-Category Question Loader for Ultimate Movie Trivia Game
+
+- Treats a directory of OpenTriviaQA category files (same '#Q' format as "movies") as one question pool.
+- Each category gets an index of the byte offsets where its questions start. The index is built the first
+  time that category is used, so picking one category never scans the others.
+- Questions are parsed lazily, one record at a time, straight from the memory-mapped file.
+- QuestionStream reservoir-samples questions across the chosen categories and only keeps a bounded
+  window of parsed questions in memory.
+"""
+
+import math
+import mmap
+import os
+import random
+import re
+from array import array
+from itertools import chain, islice
+
+from Reading_Trivia_File import parse_trivia
+
+# Files that live next to the category files but are not categories themselves: compiled banks and
+# indexes, Ingest_Trivia's cleaned copies and reports, exports, journals and databases
+DERIVED_SUFFIXES = (".bank", ".tmp", ".idx", ".json", ".jsonl", ".clean", ".errors.txt", ".cols", ".uploading",
+                    ".db", ".db-wal", ".db-shm", ".db-journal")
+SNIFF_BYTES = 4096  # a category file's first question starts within this many bytes
+
+QUESTION_START = re.compile(rb"^#Q", re.MULTILINE)
+
+
+def reservoir_sample(items, k, rng=random):
+    """
+    Picks k items uniformly at random from an iterable of unknown length in a single pass,
+    holding only k items at a time (Algorithm L, which skips ahead instead of rolling for every item).
+    Returns fewer than k items if the iterable is shorter than k.
+    """
+    iterator = iter(items)
+    reservoir = list(islice(iterator, k))
+    if len(reservoir) < k or k == 0:
+        return reservoir
+
+    # 1 - random() is in (0, 1], so log() never sees a zero
+    weight = math.exp(math.log(1.0 - rng.random()) / k)
+    while True:
+        skip = math.floor(math.log(1.0 - rng.random()) / math.log(1.0 - weight)) if weight < 1.0 else 0
+        chosen = next(islice(iterator, skip, skip + 1), None)
+        if chosen is None:
+            return reservoir
+        reservoir[rng.randrange(k)] = chosen
+        weight *= math.exp(math.log(1.0 - rng.random()) / k)
+
+
+def is_category_file(path):
+    """
+    Whether a file looks like a category file: its first line with text is a '#Q' question
+    (scoreboards, logs and other files that end up in the directory don't).
+    """
+    try:
+        with open(path, "rb") as file:
+            head = file.read(SNIFF_BYTES)
+    except OSError:
+        return False
+    return head.lstrip(b"\xef\xbb\xbf \t\r\n").startswith(b"#Q")
+
+
+class CategoryLibrary:
+    """
+    A directory of trivia category files, indexed and parsed on demand.
+
+    Only the per-category offset index (8 bytes per question) is kept for a category
+    once it has been used; question text is parsed from the mapped file when read.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._maps = {}  # category -> mmap of its file
+        self._offsets = {}  # category -> array of question start offsets
+
+    def categories(self):
+        """
+        Returns the sorted names of the category files in the directory.
+        """
+        names = []
+        for entry in os.scandir(self.directory):
+            if (entry.is_file() and not entry.name.startswith(".") and not entry.name.endswith(DERIVED_SUFFIXES)
+                    and is_category_file(entry.path)):
+                names.append(entry.name)
+        return sorted(names)
+
+    def _map(self, category):
+        """
+        Memory-maps a category file the first time it is needed (an empty file can't be mapped,
+        so it stands in as empty bytes).
+        """
+        if category not in self._maps:
+            with open(os.path.join(self.directory, category), "rb") as file:
+                if os.fstat(file.fileno()).st_size == 0:
+                    self._maps[category] = b""
+                else:
+                    self._maps[category] = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._maps[category]
+
+    def offsets(self, category):
+        """
+        Returns the byte offsets of every '#Q' line in one category, scanning only that file.
+        """
+        if category not in self._offsets:
+            data = self._map(category)
+            self._offsets[category] = array("Q", (match.start() for match in QUESTION_START.finditer(data)))
+        return self._offsets[category]
+
+    def count(self, category):
+        """
+        Returns the number of questions in a category.
+        """
+        return len(self.offsets(category))
+
+    def read_question(self, category, offset):
+        """
+        Parses the single question that starts at `offset` in a category file.
+        """
+        data = self._map(category)
+        end = data.find(b"\n#Q", offset + 1)
+        record = data[offset:end + 1 if end != -1 else len(data)]
+        return next(parse_trivia(record.decode("utf-8", "replace").splitlines()))
+
+    def iter_questions(self, category):
+        """
+        Yields every question of a category in file order, parsing as it goes.
+        """
+        with open(os.path.join(self.directory, category), "r", encoding="utf-8", errors="replace") as file:
+            yield from parse_trivia(file)
+
+    def iter_refs(self, categories=None):
+        """
+        Lazily yields (category, offset) references for the given categories (all by default).
+        A category is only indexed when the generator reaches it.
+        """
+        for category in categories or self.categories():
+            yield from ((category, offset) for offset in self.offsets(category))
+
+    def sample(self, k, categories=None, rng=random):
+        """
+        Reservoir-samples k questions across the given categories and parses only those k.
+        """
+        refs = reservoir_sample(self.iter_refs(categories), k, rng)
+        return [self.read_question(category, offset) for category, offset in refs]
+
+    def close(self):
+        """
+        Unmaps every category file that was opened.
+        """
+        for data in self._maps.values():
+            if isinstance(data, mmap.mmap):
+                data.close()
+        self._maps.clear()
+        self._offsets.clear()
+
+
+class QuestionStream:
+    """
+    Draws questions from a CategoryLibrary while keeping at most `window` parsed
+    questions in memory. When the window runs dry it is refilled with a fresh
+    reservoir sample across the chosen categories.
+    """
+
+    def __init__(self, library, categories=None, window=50, rng=None):
+        self.library = library
+        self.categories = list(categories) if categories else library.categories()
+        self.window = window
+        self.rng = rng or random.Random()
+        self._pending = []
+
+    def draw(self):
+        """
+        Returns the next question, refilling the window if needed.
+        """
+        if not self._pending:
+            self._pending = self.library.sample(self.window, self.categories, self.rng)
+            self.rng.shuffle(self._pending)
+            if not self._pending:
+                raise LookupError("no questions found in the selected categories")
+        return self._pending.pop()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return self.draw()
+
+
+def iter_all_questions(directory, categories=None):
+    """
+    Generator over every question of the given categories, one file at a time.
+    """
+    library = CategoryLibrary(directory)
+    return chain.from_iterable(library.iter_questions(category) for category in categories or library.categories())
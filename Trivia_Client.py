@@ -0,0 +1,274 @@
+"""
+Trivia Client for Ultimate Movie Trivia Game
+
+- Backends for what TriviaGame needs from outside the window: questions, the scoreboard and the
+  name check. LocalBackend uses this machine's files (the original behaviour); ServerBackend talks
+  to a Trivia_Server over one reused connection.
+- ServerBackend falls back to the local files whenever the server can't be reached, and stays
+  offline for a while before trying again, so a missing server never freezes the game for long.
+- Every request carries a key that is unique to this station. A request that is sent again after
+  a lost reply keeps its key, and the server answers it from its record of recent keys instead of
+  running it twice, so a score is never stored twice because a reply was slow.
+- Scores saved while offline are kept in pending_scores.jsonl and uploaded in chunks of
+  UPLOAD_CHUNK once the server is back. The backlog being uploaded is moved aside first; each chunk
+  keys its request by its contents until the server confirms it, and a chunk the server rejects is
+  moved to pending_scores.rejected.jsonl. A failed upload never holds up the game's own requests.
+- Questions are fetched in batches and handed out one at a time.
+"""
+
+import collections
+import hashlib
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+
+from Scoreboard_Logic import (leaderboards, load_scores, name_taken, preload_leaderboards, preload_names,
+                              update_scores)
+
+DEFAULT_PORT = 8765
+CONNECT_TIMEOUT = 0.5  # seconds; the name check and scoreboard wait at most this long for the server
+REPLY_TIMEOUT = 2.0
+RETRY_SECONDS = 30  # after a failure, use the local files this long before trying the server again
+QUESTION_BATCH = 20
+PENDING_SCORES = "pending_scores.jsonl"
+UPLOADING_SUFFIX = ".uploading"  # the pending batch on its way to the server
+REJECTED_SCORES = "pending_scores.rejected.jsonl"
+UPLOAD_CHUNK = 200  # offline scores per upload request (each line stays far below the server's limit)
+
+
+class ServerError(ValueError):
+    """
+    The server received a request and refused it (the reply had "ok": false).
+    """
+
+
+class LocalBackend:
+    """
+    Questions from the local question source and the scoreboard database on this machine.
+    """
+
+    def __init__(self):
+        self._draw_question = None
+
+    def set_question_source(self, draw_question):
+        self._draw_question = draw_question
+
+    def draw_question(self):
+        return self._draw_question()
+
+    def update_scores(self, name, score, category=""):
+        return update_scores(name, score, category=category)
+
+    def load_scores(self):
+        return load_scores()
+
+    def leaderboards(self, score, category=""):
+        return leaderboards(score, category)
+
+    def name_taken(self, name):
+        return name_taken(name)
+
+    def preload_names(self):
+        preload_names()
+        preload_leaderboards()
+
+
+class ServerConnection:
+    """
+    One persistent connection to a Trivia_Server. request() is thread-safe and reconnects
+    once if the connection was dropped. Raises OSError when the server can't be reached
+    and ServerError when it refused the request.
+    """
+
+    def __init__(self, host, port):
+        self.address = (host, port)
+        self._socket = None
+        self._file = None
+        self._next_id = 0
+        self._station = uuid.uuid4().hex  # request keys of this station start with it
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        self._socket = socket.create_connection(self.address, timeout=CONNECT_TIMEOUT)
+        self._socket.settimeout(REPLY_TIMEOUT)
+        self._socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._file = self._socket.makefile("rwb")
+
+    def close(self):
+        if self._socket is not None:
+            self._file.close()
+            self._socket.close()
+            self._socket = self._file = None
+
+    def request(self, op, request_key=None, **fields):
+        """
+        Sends a request and returns the reply. When the connection drops or the reply times out,
+        the request is sent once more with the same key, which the server answers without
+        running it again if it got the first one. `request_key` defaults to a new unique key.
+        """
+        with self._lock:
+            self._next_id += 1
+            request_id = self._next_id
+            request_key = request_key or f"{self._station}:{request_id}"
+            # The id goes first, so the server can answer even a request line too long for it to read
+            line = json.dumps(dict(id=request_id, key=request_key, op=op, **fields), separators=(",", ":")) + "\n"
+            for attempt in range(2):
+                try:
+                    if self._socket is None:
+                        self._connect()
+                    self._file.write(line.encode("utf-8"))
+                    self._file.flush()
+                    reply = self._file.readline()
+                    if not reply:
+                        raise ConnectionError("server closed the connection")
+                    response = json.loads(reply)
+                    if response.get("id") != request_id:
+                        raise ConnectionError("reply to another request")
+                    break
+                except (OSError, ValueError):
+                    self.close()  # a late reply must not be read as the reply to the next request
+                    if attempt:
+                        raise
+        if not response.get("ok"):
+            raise ServerError(response.get("error", "request failed"))
+        return response
+
+
+class ServerBackend:
+    """
+    Questions and the global scoreboard from a Trivia_Server at `host`:`port`, with the
+    local files (`local`, a LocalBackend) as the fallback while the server is unreachable.
+    """
+
+    def __init__(self, host, port, local, pending_path=PENDING_SCORES):
+        self.connection = ServerConnection(host, port)
+        self.local = local
+        self.pending_path = pending_path
+        self.offline_until = 0.0
+        self.upload_after = 0.0  # after a failed upload, the next one waits until then
+        self._questions = collections.deque()
+        self._pending_lock = threading.Lock()
+
+    def set_question_source(self, draw_question):
+        """
+        Sets where questions come from while the server is unreachable.
+        """
+        self.local.set_question_source(draw_question)
+
+    def online(self):
+        return time.monotonic() >= self.offline_until
+
+    def _request(self, op, **fields):
+        """
+        Sends a request, or returns None (and goes offline for RETRY_SECONDS) if the server can't be reached.
+        Uploads scores that were saved while offline first; if that fails, the request is sent anyway
+        and the upload waits RETRY_SECONDS before it is tried again.
+        """
+        if not self.online():
+            return None
+        if time.monotonic() >= self.upload_after:
+            try:
+                self._upload_pending()
+            except (OSError, ValueError):
+                self.upload_after = time.monotonic() + RETRY_SECONDS
+        try:
+            return self.connection.request(op, **fields)
+        except (OSError, ValueError):
+            self.offline_until = time.monotonic() + RETRY_SECONDS
+            return None
+
+    def draw_question(self):
+        if not self._questions:
+            response = self._request("questions", count=QUESTION_BATCH)
+            if response is None:
+                return self.local.draw_question()
+            self._questions.extend(response["questions"])
+        return self._questions.popleft()
+
+    def update_scores(self, name, score, category=""):
+        response = self._request("score", name=name, score=score, category=category)
+        if response is not None:
+            return response["top"]
+        # Offline: save on this machine and upload later
+        with self._pending_lock:
+            with open(self.pending_path, "a") as pending:
+                pending.write(json.dumps({"name": name, "score": score, "played_at": time.time(),
+                                          "category": category}) + "\n")
+        return self.local.update_scores(name, score, category)
+
+    def load_scores(self):
+        response = self._request("top", count=5)
+        return response["top"] if response is not None else self.local.load_scores()
+
+    def leaderboards(self, score, category=""):
+        response = self._request("leaderboards", score=score, category=category)
+        return response["boards"] if response is not None else self.local.leaderboards(score, category)
+
+    def name_taken(self, name):
+        response = self._request("name_taken", name=name)
+        return response["taken"] if response is not None else self.local.name_taken(name)
+
+    def preload_names(self):
+        self.local.preload_names()
+
+    def _reject(self, lines):
+        """
+        Moves score lines that can't be uploaded to pending_scores.rejected.jsonl, for a look later.
+        """
+        with open(os.path.join(os.path.dirname(self.pending_path), REJECTED_SCORES), "ab") as file:
+            file.write(b"".join(line + b"\n" for line in lines))
+
+    def _upload_pending(self):
+        """
+        Sends scores saved while offline to the server, UPLOAD_CHUNK at a time, then forgets them.
+
+        The backlog is moved to pending_scores.jsonl.uploading first, so scores saved meanwhile
+        don't change it. Each chunk's key is taken from its contents: if the reply is lost, the next
+        attempt sends the same chunk with the same key and the server doesn't store it twice. After
+        each chunk the file is cut down to what is left. Raises OSError when the server can't be
+        reached (the rest is kept for the next attempt).
+        """
+        uploading_path = self.pending_path + UPLOADING_SUFFIX
+        with self._pending_lock:
+            if not os.path.exists(uploading_path):
+                if not os.path.exists(self.pending_path):
+                    return
+                os.replace(self.pending_path, uploading_path)
+            with open(uploading_path, "rb") as uploading:
+                lines = [line for line in uploading.read().splitlines() if line.strip()]
+            while lines:
+                chunk, lines = lines[:UPLOAD_CHUNK], lines[UPLOAD_CHUNK:]
+                entries, rejected = [], []
+                for line in chunk:
+                    try:
+                        entry = json.loads(line)
+                        entries.append({"name": str(entry["name"]), "score": int(entry["score"]),
+                                        "played_at": entry.get("played_at"),
+                                        "category": str(entry.get("category", ""))})
+                    except (ValueError, TypeError, KeyError):
+                        if line.endswith(b"}"):
+                            rejected.append(line)  # not a line cut short by a crash: keep it for a look
+                if entries:
+                    key = "pending:" + hashlib.sha256(b"\n".join(chunk)).hexdigest()
+                    try:
+                        self.connection.request("scores", request_key=key, entries=entries)
+                    except ServerError:  # the server refused the chunk; sending it again won't help
+                        rejected = chunk
+                if rejected:
+                    self._reject(rejected)
+                temp_path = uploading_path + ".tmp"
+                with open(temp_path, "wb") as rest:
+                    rest.write(b"".join(line + b"\n" for line in lines))
+                os.replace(temp_path, uploading_path)
+            os.remove(uploading_path)
+
+
+def parse_address(text, default_port):
+    """
+    Splits 'host:port' (or just 'host') into (host, port).
+    """
+    host, _, port = text.rpartition(":") if ":" in text else (text, "", "")
+    return host, int(port) if port else default_port
@@ -0,0 +1,318 @@
+"""
+Trivia Server for Ultimate Movie Trivia Game
+
+- One asyncio server owns the question bank and the global scoreboard, so every station (kiosk)
+  shows the same Top 5 and player names are unique across all of them.
+- Protocol: one JSON object per line over TCP, in both directions. Each request carries an "id"
+  and an "op"; the reply has the same "id" and "ok" (plus "error" when ok is false).
+  A station keeps one connection open for the whole session and may send several requests
+  without waiting for the replies.
+
+    {"id": 1, "op": "questions", "count": 20}          -> {"id": 1, "ok": true, "questions": [...]}
+    {"id": 2, "op": "score", "name": "Molly", "score": 35, "category": "movies"}  -> {"id": 2, "ok": true, "top": [...]}
+    {"id": 3, "op": "scores", "entries": [{"name": ..., "score": ..., "category": ...}, ...]}
+    {"id": 4, "op": "top", "count": 5}                  -> {"id": 4, "ok": true, "top": [...]}
+    {"id": 5, "op": "name_taken", "name": "Molly"}      -> {"id": 5, "ok": true, "taken": true}
+    {"id": 6, "op": "leaderboards", "score": 35, "category": "movies"}
+                                                        -> {"id": 6, "ok": true, "boards": {"day": ..., ...}}
+
+- Scores from all stations are collected for a few milliseconds and written in one transaction.
+- A request line may be at most MAX_LINE_BYTES long, and a "scores" request may carry at most
+  MAX_SCORE_ENTRIES scores. A longer line is skipped and answered with an error (for the "id" at
+  its start, if any), and the connection stays open.
+- Scores must be whole numbers from 0 to MAX_SCORE (see Score_Store.check_score); a request with
+  any other score is refused and nothing of it is stored.
+- Requests carry a station-unique "key". The replies to the last RECENT_KEYS keys are remembered, so
+  a request a station sends again after losing the reply gets the same reply and is not run twice.
+- Questions are drawn from one shared scheduler, so no station repeats a question another already got
+  until the whole bank was shown.
+
+Usage:
+    python Trivia_Server.py --port 8765 --source movies --scoreboard scoreboard.db
+    python Trivia_Server.py --load-test 300      # 300 simulated stations against a temporary server
+"""
+
+import argparse
+import asyncio
+import collections
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+
+from Instrumentation import percentile
+from Question_Bank import load_bank
+from Question_Scheduler import QuestionScheduler
+from Score_Store import SCOREBOARD_DB, check_score, open_store
+from Trivia_Client import DEFAULT_PORT
+
+MAX_QUESTION_BATCH = 100
+SCORE_BATCH_SIZE = 256  # scores written per transaction at most
+SCORE_BATCH_DELAY = 0.02  # seconds a score waits for others to share its transaction
+TOP_COUNT = 5
+RECENT_KEYS = 10000  # request keys whose replies are remembered for stations that retry
+MAX_LINE_BYTES = 1024 * 1024  # longest request line a station may send
+MAX_SCORE_ENTRIES = 1000  # most scores in one "scores" request
+LEADING_ID = re.compile(rb'^\s*\{\s*"id"\s*:\s*(-?\d+)')  # stations send the id first
+
+
+def encode(message):
+    return (json.dumps(message, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+async def read_request(reader):
+    """
+    Reads one request line. Returns (line, False), or (the start of the line, True) when the line
+    is longer than the reader's limit: the rest of it is read and thrown away. (b"", False) at the end.
+    """
+    head = None
+    while True:
+        try:
+            line = await reader.readuntil(b"\n")
+        except asyncio.IncompleteReadError as error:  # connection closed
+            return (error.partial, False) if head is None else (head, True)
+        except asyncio.LimitOverrunError as error:
+            # Nothing was taken from the buffer: drop what was searched (up to the newline, if found)
+            chunk = await reader.readexactly(error.consumed)
+            head = chunk[:256] if head is None else head
+            continue
+        return (line, False) if head is None else (head, True)
+
+
+class ScoreBatcher:
+    """
+    Collects score submissions from every connection and writes them together.
+    Each submitter gets the Top 5 as it is after its batch was written.
+    """
+
+    def __init__(self, store, batch_size=SCORE_BATCH_SIZE, delay=SCORE_BATCH_DELAY):
+        self.store = store
+        self.batch_size = batch_size
+        self.delay = delay
+        self._pending = []  # (entries, future)
+        self._pending_count = 0
+        self._flush_handle = None
+
+    async def submit(self, entries):
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((entries, future))
+        self._pending_count += len(entries)
+        if self._pending_count >= self.batch_size:
+            self._start_flush()
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(self.delay, self._start_flush)
+        return await future
+
+    def _start_flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending, self._pending_count = self._pending, [], 0
+        if batch:
+            asyncio.get_running_loop().create_task(self._flush(batch))
+
+    async def _flush(self, batch):
+        entries = [entry for submitted, _ in batch for entry in submitted]
+        try:
+            # SQLite calls block, so they run on a worker thread while the server keeps serving
+            await asyncio.to_thread(self.store.add_many, entries)
+            top = await asyncio.to_thread(self.store.top, TOP_COUNT)
+        except Exception as error:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+            return
+        for _, future in batch:
+            if not future.done():
+                future.set_result(top)
+
+
+class TriviaServer:
+    """
+    Serves questions from `source` and the scoreboard at `scoreboard_path` to every station.
+    """
+
+    def __init__(self, source="movies", scoreboard_path=SCOREBOARD_DB):
+        self.bank = load_bank(source)
+        self.scheduler = QuestionScheduler(len(self.bank))
+        self.store = open_store(scoreboard_path)
+        self.batcher = ScoreBatcher(self.store)
+        self.connections = 0
+        self.requests = 0
+        self._recent = collections.OrderedDict()  # request key -> task running or done with its reply
+        self._server = None
+
+    async def start(self, host="127.0.0.1", port=DEFAULT_PORT):
+        self._server = await asyncio.start_server(self.handle_station, host, port, limit=MAX_LINE_BYTES)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        async with self._server:
+            await self._server.serve_forever()
+
+    def close(self):
+        if self._server is not None:
+            self._server.close()
+
+    async def handle_station(self, reader, writer):
+        """
+        Serves one station's connection until it closes. Requests are handled concurrently,
+        so a slow score write does not hold up that station's question fetches.
+        """
+        self.connections += 1
+        tasks = set()
+        try:
+            while True:
+                line, too_long = await read_request(reader)
+                if not line:
+                    break
+                if too_long:
+                    match = LEADING_ID.match(line)
+                    writer.write(encode({"id": int(match.group(1)) if match else None, "ok": False,
+                                         "error": f"request longer than {MAX_LINE_BYTES} bytes"}))
+                    await writer.drain()
+                    continue
+                task = asyncio.create_task(self.reply(line, writer))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        except ConnectionError:
+            pass
+        finally:
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+            self.connections -= 1
+            writer.close()
+
+    async def reply(self, line, writer):
+        self.requests += 1
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get("id")
+            response = dict(await self.dispatch_once(request))
+            response.update(id=request_id, ok=True)
+        except Exception as error:  # reported to the station, the connection stays open
+            response = {"id": request_id, "ok": False, "error": str(error) or type(error).__name__}
+        writer.write(encode(response))
+        await writer.drain()
+
+    async def dispatch_once(self, request):
+        """
+        Runs a request, unless a request with the same key ran (or is running) already:
+        then its reply is returned again. A request that failed can be retried.
+        """
+        key = request.get("key")
+        if key is None:
+            return await self.dispatch(request)
+        task = self._recent.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self.dispatch(request))
+            self._recent[key] = task
+            if len(self._recent) > RECENT_KEYS:
+                self._recent.popitem(last=False)
+        try:
+            return await asyncio.shield(task)
+        except Exception:
+            if self._recent.get(key) is task:
+                del self._recent[key]
+            raise
+
+    async def dispatch(self, request):
+        op = request.get("op")
+        if op == "questions":
+            count = max(1, min(int(request.get("count", 1)), MAX_QUESTION_BATCH))
+            return {"questions": [self.bank[self.scheduler.draw()] for _ in range(count)]}
+        if op == "score":
+            # Checked here, so a bad score fails its own request and not the batch it would share
+            return {"top": await self.batcher.submit([{"name": str(request["name"]),
+                                                       "score": check_score(request["score"]),
+                                                       "category": str(request.get("category", ""))}])}
+        if op == "scores":
+            if len(request["entries"]) > MAX_SCORE_ENTRIES:
+                raise ValueError(f"more than {MAX_SCORE_ENTRIES} scores in one request")
+            entries = [{"name": str(entry["name"]), "score": check_score(entry["score"]),
+                        "played_at": entry.get("played_at"), "category": str(entry.get("category", ""))}
+                       for entry in request["entries"]]
+            return {"top": await self.batcher.submit(entries)}
+        if op == "leaderboards":
+            return {"boards": await asyncio.to_thread(self.store.standings, int(request["score"]),
+                                                      str(request.get("category", "")))}
+        if op == "top":
+            count = max(1, min(int(request.get("count", TOP_COUNT)), 100))
+            return {"top": await asyncio.to_thread(self.store.top, count)}
+        if op == "name_taken":
+            return {"taken": await asyncio.to_thread(self.store.name_taken, str(request["name"]))}
+        raise ValueError(f"unknown op {op!r}")
+
+
+# LOAD TEST
+
+async def simulated_station(port, station, rounds, latencies):
+    """
+    One station: a single reused connection, fetching question batches and submitting scores.
+    """
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    for round_number in range(rounds):
+        for request in ({"op": "name_taken", "name": f"Station{station}"},
+                        {"op": "questions", "count": 20},
+                        {"op": "score", "name": f"Station{station}", "score": (station * 7 + round_number) % 120}):
+            started = time.perf_counter()
+            writer.write(encode(dict(request, id=round_number)))
+            await writer.drain()
+            response = json.loads(await reader.readline())
+            if not response["ok"]:
+                raise RuntimeError(response["error"])
+            latencies.append(time.perf_counter() - started)
+    writer.close()
+    await writer.wait_closed()
+
+
+async def load_test(stations, rounds, source):
+    with tempfile.TemporaryDirectory() as directory:
+        server = TriviaServer(source, os.path.join(directory, "scoreboard.db"))
+        port = await server.start(port=0)
+        latencies = []
+        started = time.perf_counter()
+        await asyncio.gather(*(simulated_station(port, station, rounds, latencies) for station in range(stations)))
+        elapsed = time.perf_counter() - started
+        server.close()
+        stored = server.store.count()
+        server.store.close()
+
+    latencies.sort()
+    print(f"{stations} stations x {rounds} rounds: {len(latencies)} requests in {elapsed:.2f} s "
+          f"({len(latencies) / elapsed:,.0f} requests/s), {stored} scores stored")
+    print(f"latency p50 {percentile(latencies, 0.50) * 1000:.1f} ms, p95 {percentile(latencies, 0.95) * 1000:.1f} ms, "
+          f"p99 {percentile(latencies, 0.99) * 1000:.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve questions and the global scoreboard to game stations.")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--source", default="movies", help="question file")
+    parser.add_argument("--scoreboard", default=SCOREBOARD_DB, help="scoreboard database")
+    parser.add_argument("--load-test", type=int, metavar="STATIONS", help="run a load test with this many stations")
+    parser.add_argument("--rounds", type=int, default=5, help="rounds per station in the load test")
+    args = parser.parse_args()
+
+    if args.load_test:
+        asyncio.run(load_test(args.load_test, args.rounds, args.source))
+        return
+
+    async def serve():
+        server = TriviaServer(args.source, args.scoreboard)
+        port = await server.start(args.host, args.port)
+        print(f"Serving {len(server.bank)} questions on {args.host}:{port}", file=sys.stderr)
+        await server.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Benchmark: daily, weekly, category and all time leaderboards over a large score history.
+
+Compares recomputing every board and the player's ranks with SQL queries after each round
+with the store's incrementally maintained leaderboards (see Leaderboards).
+
+Usage:
+    python benchmarks/bench_leaderboards.py [history_size]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Leaderboards import local_day, week_start  # noqa: E402
+from Score_Store import ScoreStore  # noqa: E402
+
+CATEGORIES = ("movies", "tv", "music", "books", "games", "sports", "science", "history")
+HISTORY_DAYS = 365
+CHUNK = 500_000  # scores inserted per transaction while filling the history
+
+
+def requery_boards(store, score, category, now):
+    """
+    The boards without incremental state: every round, query each board's Top 5 and count
+    the higher scores for the player's rank.
+    """
+    day_start = (local_day(now) * 86400) - time.localtime(now).tm_gmtoff
+    connection = store._connection
+    boards = {}
+    for view, where, parameters in (("day", "played_at >= ?", (day_start,)),
+                                    ("week", "played_at >= ?", (week_start(now),)),
+                                    ("category", "category = ?", (category,)),
+                                    ("all", "1", ())):
+        top = connection.execute(f"SELECT name, score FROM scores WHERE {where} ORDER BY score DESC, id LIMIT 5",
+                                 parameters).fetchall()
+        higher, total = connection.execute(
+            f"SELECT SUM(score > ?), COUNT(*) FROM scores WHERE {where}", (score,) + parameters).fetchone()
+        boards[view] = {"top": top, "rank": (higher or 0) + 1, "total": total}
+    return boards
+
+
+def main():
+    history_size = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    rng = random.Random(1)
+    now = time.time()
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = ScoreStore(os.path.join(directory, "scoreboard.db"))
+        started = time.perf_counter()
+        for first in range(0, history_size, CHUNK):
+            store.add_many({"name": f"Player{index:08d}", "score": rng.randint(0, 120),
+                            "played_at": now - rng.random() * HISTORY_DAYS * 86400,
+                            "category": CATEGORIES[index % len(CATEGORIES)]}
+                           for index in range(first, min(first + CHUNK, history_size)))
+        fill_s = time.perf_counter() - started
+
+        # OLD: query every board and rank again after each round
+        rounds = 5
+        started = time.perf_counter()
+        for index in range(rounds):
+            store.add(f"Old{index}", rng.randint(0, 120), category="movies")
+            requery_boards(store, 60, "movies", time.time())
+        requery_ms = (time.perf_counter() - started) * 1000 / rounds
+
+        # NEW: the first call builds the boards from grouped counts, later rounds update them
+        started = time.perf_counter()
+        store.preload_boards()
+        build_ms = (time.perf_counter() - started) * 1000
+
+        rounds = 1000
+        started = time.perf_counter()
+        for index in range(rounds):
+            score = rng.randint(0, 120)
+            store.add(f"New{index}", score, category=CATEGORIES[index % len(CATEGORIES)])
+            store.standings(score, CATEGORIES[index % len(CATEGORIES)])
+        round_ms = (time.perf_counter() - started) * 1000 / rounds
+
+        started = time.perf_counter()
+        lookups = 100_000
+        for index in range(lookups):
+            store._boards.standings(index % 121, "movies", now)
+        lookup_us = (time.perf_counter() - started) * 1_000_000 / lookups
+
+        # The boards must match the queries
+        check = requery_boards(store, 60, "movies", time.time())
+        boards = store.standings(60, "movies")
+        same = all(boards[view]["rank"] == check[view]["rank"] and boards[view]["total"] == check[view]["total"]
+                   and [(entry["name"], entry["score"]) for entry in boards[view]["top"]] == check[view]["top"]
+                   for view in check)
+        days, weeks = len(store._boards.days), len(store._boards.weeks)
+        store.close()
+
+    print(f"history: {history_size:,} scores over {HISTORY_DAYS} days, {len(CATEGORIES)} categories "
+          f"(filled in {fill_s:.0f} s)")
+    print(f"requery 4 boards + ranks per round:   {requery_ms:10.2f} ms")
+    print(f"incremental boards, first build:      {build_ms:10.2f} ms")
+    print(f"incremental boards, save + standings: {round_ms:10.2f} ms")
+    print(f"incremental boards, standings only:   {lookup_us:10.2f} us")
+    print(f"boards match the queries: {same} ({days} day and {weeks} week boards kept)")
+
+
+if __name__ == "__main__":
+    main()
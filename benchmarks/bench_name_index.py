@@ -0,0 +1,63 @@
+"""
+Benchmark: player name validation against a large score history.
+
+Compares the old check (re-read every score, then a case-folded linear scan on each key press)
+with the store's cached casefolded name set.
+
+Usage:
+    python benchmarks/bench_name_index.py [history_size]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Score_Store import ScoreStore  # noqa: E402
+
+
+def main():
+    history_size = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    lookups = ["Player0000042", "player0999999", "SomeNewName", "MOVIEGEEK"]
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = ScoreStore(os.path.join(directory, "scoreboard.db"))
+        store.add_many({"name": f"Player{i:07d}", "score": i % 100} for i in range(history_size))
+
+        # OLD: read every score and scan the list for each key press
+        started = time.perf_counter()
+        for name in lookups:
+            rows = store._connection.execute("SELECT name, score FROM scores").fetchall()
+            scores_list = [{"name": row_name, "score": score} for row_name, score in rows]
+            any(entry["name"].lower() == name.lower() for entry in scores_list)
+        scan_ms = (time.perf_counter() - started) * 1000 / len(lookups)
+
+        # NEW: first check builds the name set, later checks are set lookups
+        started = time.perf_counter()
+        store.name_taken(lookups[0])
+        build_ms = (time.perf_counter() - started) * 1000
+
+        started = time.perf_counter()
+        repeats = 10_000
+        for index in range(repeats):
+            store.name_taken(lookups[index % len(lookups)])
+        lookup_us = (time.perf_counter() - started) * 1_000_000 / repeats
+
+        # A score saved by this station tops up the set instead of rebuilding it
+        started = time.perf_counter()
+        store.add("BrandNewPlayer", 10)
+        store.name_taken("brandnewplayer")
+        update_ms = (time.perf_counter() - started) * 1000
+        store.close()
+
+    print(f"history: {history_size:,} names")
+    print(f"full re-read + linear scan per check: {scan_ms:10.2f} ms")
+    print(f"cached name set, first build:         {build_ms:10.2f} ms")
+    print(f"cached name set, per check:           {lookup_us:10.2f} us")
+    print(f"save a score, then check:             {update_ms:10.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
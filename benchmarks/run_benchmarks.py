@@ -0,0 +1,339 @@
+"""
+Benchmark suite for the game's hot paths, run headless.
+
+- Generates synthetic question banks (in the "movies" '#Q' format) and score histories
+  (in the "scoreboard.txt" name,score format) from 1k up to 1M entries.
+- Times question parsing, bank compiling and lazy reads, question selection, round scoring
+  and the scoreboard (including the leaderboards), and records each case's peak memory with tracemalloc.
+- Compares the results with the stored baseline (benchmarks/baseline.json, committed from a
+  reference run) and exits with status 1 when a case got slower or bigger than the allowed
+  threshold, or with status 2 when there is no baseline to compare with.
+
+Usage:
+    python benchmarks/run_benchmarks.py                      # all sizes, compare with baseline
+    python benchmarks/run_benchmarks.py --quick              # 1k and 10k only
+    python benchmarks/run_benchmarks.py --update-baseline    # store these results as the baseline
+    python benchmarks/run_benchmarks.py --only scoreboard --threshold 0.25
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Game_Engine import ManualClock, TriviaEngine  # noqa: E402
+from Question_Bank import QuestionBank, compile_bank  # noqa: E402
+from Question_Scheduler import QuestionScheduler  # noqa: E402
+from Question_Stats import AdaptiveSelector  # noqa: E402
+from Question_Store import load_store  # noqa: E402
+from Reading_Trivia_File import load_trivia  # noqa: E402
+from Score_Store import ScoreStore  # noqa: E402
+from Scoreboard_Logic import update_scores  # noqa: E402
+from Simulate_Rounds import simulate_round  # noqa: E402
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+SIZES = [1_000, 10_000, 100_000, 1_000_000]
+QUICK_SIZES = [1_000, 10_000]
+THRESHOLD = 0.5  # allowed slowdown / memory growth over the baseline (0.5 = 50 %)
+
+WORDS = ("love", "time", "movie", "night", "hero", "city", "dream", "star", "ghost", "secret",
+         "summer", "king", "river", "heart", "war", "game", "road", "light", "shadow", "house")
+TITLES = ("Dracula", "Ever After", "When Harry Met Sally", "Moulin Rouge", "Notting Hill",
+          "Casablanca", "Hope Floats", "Some Like It Hot", "A Knights Tale", "Youve Got Mail")
+
+
+# SYNTHETIC DATA
+
+def write_question_file(path, count, seed=1):
+    """
+    Writes `count` random questions in the '#Q' format. About one in twenty prompts
+    wraps onto a second line, like the real "movies" file.
+    """
+    rng = random.Random(seed)
+    with open(path, "w") as file:
+        for _ in range(count):
+            prompt = " ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 20)))
+            year = rng.randint(1930, 2015)
+            choices = rng.sample(TITLES, 4)
+            if rng.random() < 0.05:
+                file.write(f"#Q {prompt}\n({year})\n")
+            else:
+                file.write(f"#Q {prompt} ({year})\n")
+            file.write(f"^ {rng.choice(choices)}\n")
+            for letter, title in zip("ABCD", choices):
+                file.write(f"{letter} {title}\n")
+            file.write("\n")
+
+
+def write_score_file(path, count, seed=1):
+    """
+    Writes `count` random 'name,score' lines.
+    """
+    rng = random.Random(seed)
+    with open(path, "w") as file:
+        for index in range(count):
+            file.write(f"Player{index:07d},{rng.randint(0, 120)}\n")
+
+
+class Workspace:
+    """
+    Temporary directory that generates each synthetic file once and reuses it.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._files = {}
+
+    def path(self, name):
+        return os.path.join(self.directory, name)
+
+    def questions(self, count):
+        key = ("questions", count)
+        if key not in self._files:
+            self._files[key] = self.path(f"questions_{count}")
+            write_question_file(self._files[key], count)
+        return self._files[key]
+
+    def bank(self, count):
+        key = ("bank", count)
+        if key not in self._files:
+            self._files[key] = self.path(f"questions_{count}.bank")
+            compile_bank(self.questions(count), self._files[key])
+        return self._files[key]
+
+    def scores(self, count):
+        key = ("scores", count)
+        if key not in self._files:
+            self._files[key] = self.path(f"scores_{count}.txt")
+            write_score_file(self._files[key], count)
+        return self._files[key]
+
+    def score_db(self, count):
+        key = ("score_db", count)
+        if key not in self._files:
+            self._files[key] = self.path(f"scores_{count}.db")
+            ScoreStore(self._files[key], legacy_path=self.scores(count)).close()
+        return self._files[key]
+
+
+# BENCHMARK CASES
+# Each case takes (workspace, size) and returns the function to time; setup is not timed.
+
+CASES = {}
+
+
+def case(name):
+    def register(setup):
+        CASES[name] = setup
+        return setup
+    return register
+
+
+@case("parse.load_trivia")
+def bench_load_trivia(workspace, size):
+    path = workspace.questions(size)
+    return lambda: load_trivia(path)
+
+
+@case("store.load")
+def bench_load_store(workspace, size):
+    path = workspace.questions(size)
+    return lambda: load_store([path])
+
+
+@case("bank.compile")
+def bench_compile(workspace, size):
+    path = workspace.questions(size)
+    output = workspace.path(f"compile_{size}.bank")
+    return lambda: compile_bank(path, output)
+
+
+@case("bank.open_and_read_1k")
+def bench_bank_reads(workspace, size):
+    path = workspace.bank(size)
+    rng = random.Random(size)
+    indexes = [rng.randrange(size) for _ in range(1000)]
+
+    def run():
+        bank = QuestionBank(path)
+        for index in indexes:
+            bank[index]
+        bank.close()
+    return run
+
+
+@case("select.uniform_10k_draws")
+def bench_select_uniform(workspace, size):
+    def run():
+        scheduler = QuestionScheduler(size, seed=1)
+        for _ in range(10_000):
+            scheduler.draw()
+    return run
+
+
+@case("select.weighted_10k_draws")
+def bench_select_weighted(workspace, size):
+    def run():
+        scheduler = QuestionScheduler(size, seed=1, favor_unseen=True)
+        for _ in range(10_000):
+            scheduler.draw()
+    return run
+
+
+@case("select.adaptive_10k_draws")
+def bench_select_adaptive(workspace, size):
+    rng = random.Random(size)
+    selector = AdaptiveSelector([rng.random() for _ in range(size)], seed=1)
+
+    def run():
+        for draw in range(10_000):
+            selector.draw(draw % 10 / 10)
+    return run
+
+
+@case("scoring.100_rounds")
+def bench_rounds(workspace, size):
+    bank = QuestionBank(workspace.bank(size))
+    scheduler = QuestionScheduler(size, seed=1)
+    clock = ManualClock()
+    engine = TriviaEngine(lambda: bank[scheduler.draw()], clock)
+    rng = random.Random(1)
+
+    def run():
+        for _ in range(100):
+            simulate_round(engine, clock, rng)
+    return run
+
+
+@case("scoreboard.import_history")
+def bench_score_import(workspace, size):
+    legacy = workspace.scores(size)
+    runs = iter(range(1_000_000))
+
+    def run():
+        ScoreStore(workspace.path(f"import_{size}_{next(runs)}.db"), legacy_path=legacy).close()
+    return run
+
+
+@case("scoreboard.100_updates")
+def bench_score_updates(workspace, size):
+    path = workspace.score_db(size)
+    rng = random.Random(1)
+
+    def run():
+        for index in range(100):
+            update_scores(f"Bench{index:05d}", rng.randint(0, 120), path)
+    return run
+
+
+@case("scoreboard.100_standings")
+def bench_score_standings(workspace, size):
+    store = ScoreStore(workspace.score_db(size))
+    store.preload_boards()
+    rng = random.Random(1)
+
+    def run():
+        for index in range(100):
+            score = rng.randint(0, 120)
+            store.add(f"Bench{index:05d}", score, category="movies")
+            store.standings(score, "movies")
+    return run
+
+
+# RUNNING AND COMPARING
+
+def measure(function, repeat):
+    """
+    Returns (best wall time in seconds, peak traced memory in KB) for `function`.
+    Timing runs without tracemalloc, which would slow it down; one extra run measures memory.
+    Small cases get an untimed warm-up run first (imports, OS file cache).
+    """
+    if repeat > 1:
+        function()
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - started)
+
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak / 1024
+
+
+def compare(result, baseline, threshold):
+    """
+    Returns a list of regressions of one result against its baseline entry.
+    """
+    problems = []
+    if baseline is None:
+        return problems
+    # Ignore timing noise below 2 ms
+    if result["seconds"] > max(baseline["seconds"] * (1 + threshold), baseline["seconds"] + 0.002):
+        problems.append(f"time {result['seconds'] / baseline['seconds']:.2f}x baseline")
+    # Ignore memory noise below 64 KB
+    if result["peak_kb"] > max(baseline["peak_kb"] * (1 + threshold), baseline["peak_kb"] + 64):
+        problems.append(f"memory {result['peak_kb'] / max(baseline['peak_kb'], 1):.2f}x baseline")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the headless benchmark suite.")
+    parser.add_argument("--quick", action="store_true", help=f"only sizes {QUICK_SIZES}")
+    parser.add_argument("--sizes", help="comma separated sizes, e.g. 1000,100000")
+    parser.add_argument("--only", help="only run cases whose name starts with this")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case (best is kept)")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="allowed regression, 0.5 = 50%%")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true", help="save these results as the baseline")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",")] if args.sizes else (QUICK_SIZES if args.quick else SIZES)
+    try:
+        with open(args.baseline, "r") as file:
+            baseline = json.load(file)
+    except FileNotFoundError:
+        if not args.update_baseline:
+            print(f"No baseline at {args.baseline}; create one with --update-baseline", file=sys.stderr)
+            sys.exit(2)
+        baseline = {}
+
+    results = {}
+    regressions = 0
+    print(f"{'case':<32}{'size':>10}{'seconds':>12}{'peak KB':>12}  status")
+    with tempfile.TemporaryDirectory() as directory:
+        workspace = Workspace(directory)
+        for name, setup in CASES.items():
+            if args.only and not name.startswith(args.only):
+                continue
+            for size in sizes:
+                key = f"{name}[{size}]"
+                # Big inputs are slow to run; one timed run is enough to catch a regression
+                seconds, peak_kb = measure(setup(workspace, size), args.repeat if size < 100_000 else 1)
+                results[key] = {"seconds": seconds, "peak_kb": peak_kb}
+
+                problems = compare(results[key], baseline.get(key), args.threshold)
+                regressions += bool(problems)
+                status = "; ".join(problems) if problems else ("ok" if key in baseline else "new")
+                print(f"{name:<32}{size:>10,}{seconds:>12.4f}{peak_kb:>12,.0f}  {status}")
+
+    if args.update_baseline:
+        baseline.update(results)
+        with open(args.baseline, "w") as file:
+            json.dump(baseline, file, indent=2, sort_keys=True)
+        print(f"Baseline saved to {args.baseline}")
+    elif regressions:
+        print(f"{regressions} case(s) over the {args.threshold:.0%} threshold")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()